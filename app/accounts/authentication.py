@@ -0,0 +1,32 @@
+import time
+
+from django.core.cache import cache
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import user_cache_key
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that trusts the signed claims of a valid token and caches the user for the
+    lifetime of the token, so authenticated requests do not load the user from the database. The
+    cached user is invalidated in the cache shared by every process when the user is saved or
+    deleted, e.g. deactivated, so users must not be changed with queryset updates.
+    """
+
+    def get_user(self, validated_token):
+        timeout = validated_token.get('exp', 0) - int(time.time())
+
+        if timeout <= 0:
+            return super().get_user(validated_token)
+
+        key = user_cache_key(validated_token.get(api_settings.USER_ID_CLAIM))
+        user = cache.get(key)
+
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(key, user, timeout)
+
+        return user
@@ -0,0 +1,35 @@
+import uuid
+
+from django.core.cache import cache
+
+PERMISSIONS_VERSION_KEY = 'permissions:version'
+PERMISSIONS_CACHE_TIMEOUT = 60 * 60
+
+
+def get_permissions_version():
+    """
+    Return the version of the cached user permissions. Versions are random so a version lost from
+    the cache is never reused.
+    """
+    version = cache.get(PERMISSIONS_VERSION_KEY)
+
+    if version is None:
+        cache.add(PERMISSIONS_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(PERMISSIONS_VERSION_KEY)
+
+    return version
+
+
+def invalidate_permissions():
+    """
+    Invalidate the cached permissions of all users, e.g. on publish or a group membership change.
+    """
+    cache.set(PERMISSIONS_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def permissions_cache_key(user_id, release_version):
+    return f'permissions:{get_permissions_version()}:{release_version}:{user_id}'
+
+
+def user_cache_key(user_id):
+    return f'auth:user:{user_id}'
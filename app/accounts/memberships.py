@@ -0,0 +1,69 @@
+"""
+Set based changes to group membership, for provisioning many users and groups at once (e.g. from
+a directory sync). The current memberships are diffed with the given ids and applied with a bulk
+insert and a single delete, whatever the number of memberships.
+"""
+from django.db import transaction
+
+from .cache import invalidate_permissions
+from .models import User
+
+Membership = User.groups.through
+
+
+class MembershipChange:
+    ADD = 'add'
+    REMOVE = 'remove'
+    SET = 'set'  # replace the memberships with the given ids
+
+
+def _change_memberships(field, object_id, related_field, related_ids, change):
+    memberships = Membership.objects.filter(**{field: object_id})
+    related_ids = set(related_ids)
+    to_remove = set()
+
+    if change == MembershipChange.SET:
+        current_ids = set(memberships.values_list(related_field, flat=True))
+        to_remove = current_ids - related_ids
+    else:
+        current_ids = set(
+            memberships.filter(**{f'{related_field}__in': related_ids}).values_list(
+                related_field, flat=True
+            )
+        )
+
+    if change == MembershipChange.REMOVE:
+        to_add = set()
+        to_remove = current_ids
+    else:
+        to_add = related_ids - current_ids
+
+    with transaction.atomic():
+        Membership.objects.bulk_create(
+            [Membership(**{field: object_id, related_field: x}) for x in to_add],
+            ignore_conflicts=True,
+            batch_size=1000,
+        )
+
+        if to_remove:
+            memberships.filter(**{f'{related_field}__in': to_remove}).delete()
+
+    # Bulk changes do not send m2m_changed, so the cached permissions are invalidated here.
+    if to_add or to_remove:
+        transaction.on_commit(invalidate_permissions)
+
+    return {'added': len(to_add), 'removed': len(to_remove)}
+
+
+def change_group_users(group, user_ids, change):
+    """
+    Add, remove or set the users of a group. Returns the number of memberships added and removed.
+    """
+    return _change_memberships('group_id', group.id, 'user_id', user_ids, change)
+
+
+def change_user_groups(user, group_ids, change):
+    """
+    Add, remove or set the groups of a user. Returns the number of memberships added and removed.
+    """
+    return _change_memberships('user_id', user.id, 'group_id', group_ids, change)
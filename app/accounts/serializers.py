@@ -21,3 +21,31 @@ class PermissionSerializer(serializers.ModelSerializer):
     class Meta:
         model = Permission
         fields = ['id', 'name', 'content_type']
+
+
+class UserIdsSerializer(serializers.Serializer):
+    user_ids = serializers.ListField(child=serializers.UUIDField())
+
+    def validate_user_ids(self, user_ids):
+        missing = set(user_ids) - set(
+            User.objects.filter(id__in=user_ids).values_list('id', flat=True)
+        )
+
+        if missing:
+            raise serializers.ValidationError(f'Users not found: {sorted(map(str, missing))}.')
+
+        return user_ids
+
+
+class GroupIdsSerializer(serializers.Serializer):
+    group_ids = serializers.ListField(child=serializers.IntegerField())
+
+    def validate_group_ids(self, group_ids):
+        missing = set(group_ids) - set(
+            Group.objects.filter(id__in=group_ids).values_list('id', flat=True)
+        )
+
+        if missing:
+            raise serializers.ValidationError(f'Groups not found: {sorted(missing)}.')
+
+        return group_ids
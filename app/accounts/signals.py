@@ -0,0 +1,28 @@
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_permissions, user_cache_key
+from .models import User
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def group_membership_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        transaction.on_commit(invalidate_permissions)
+
+
+@receiver(post_delete, sender=Group)
+def group_deleted(sender, **kwargs):
+    transaction.on_commit(invalidate_permissions)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    key = user_cache_key(instance.id)
+    cache.delete(key)
+    # Another process may cache the user as it was before the change commits.
+    transaction.on_commit(lambda: cache.delete(key))
@@ -0,0 +1,69 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.authentication import CachedJWTAuthentication
+from accounts.models import User
+from .test_cache import SHARED_CACHES
+
+
+class CachedJWTAuthenticationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('jane@example.com', 'password')
+        self.authentication = CachedJWTAuthentication()
+
+    def authenticate(self):
+        token = AccessToken.for_user(self.user)
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+        return self.authentication.authenticate(request)[0]
+
+    def test_user_cached(self):
+        self.assertEqual(self.user, self.authenticate())
+
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(self.user, self.authenticate())
+
+        self.assertEqual(0, len(context.captured_queries))
+
+    def test_cache_invalidated_on_save(self):
+        self.authenticate()
+
+        self.user.first_name = 'Jane'
+        self.user.save()
+
+        self.assertEqual('Jane', self.authenticate().first_name)
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class SharedCachedJWTAuthenticationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('createcachetable', verbosity=0)
+
+    def setUp(self):
+        self.user = User.objects.create_user('jane@example.com', 'password')
+        self.authorization = f'Bearer {AccessToken.for_user(self.user)}'
+
+    def test_deactivated_in_another_process(self):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=self.authorization)
+        self.assertEqual(self.user, CachedJWTAuthentication().authenticate(request)[0])
+
+        # The user is deactivated by another process, which has its own connection to the cache.
+        with mock.patch('accounts.signals.cache', caches.create_connection('default')):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.user.is_active = False
+                self.user.save()
+
+        response = APIClient().get(
+            '/internal-api/application/data/author/', HTTP_AUTHORIZATION=self.authorization
+        )
+
+        self.assertEqual(401, response.status_code)
@@ -0,0 +1,40 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from accounts.cache import invalidate_permissions, permissions_cache_key
+
+# The database cache stands in for Redis as a cache shared by every process.
+SHARED_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'test_cache',
+    },
+}
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class SharedCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('createcachetable', verbosity=0)
+
+    def setUp(self):
+        # The cache as seen by another process.
+        self.other_cache = caches.create_connection('default')
+
+    def get_other(self, user_id, release_version):
+        with mock.patch('accounts.cache.cache', self.other_cache):
+            return self.other_cache.get(permissions_cache_key(user_id, release_version))
+
+    def test_invalidate_permissions(self):
+        with mock.patch('accounts.cache.cache', self.other_cache):
+            self.other_cache.set(permissions_cache_key(1, '1'), frozenset([('id', 'View')]))
+
+        self.assertEqual(frozenset([('id', 'View')]), self.get_other(1, '1'))
+
+        invalidate_permissions()
+
+        self.assertIsNone(self.get_other(1, '1'))
@@ -0,0 +1,159 @@
+"""
+Async variants of the read endpoints of the application API, for the ASGI app. A request waiting
+on the database does not hold a worker thread, so a single worker can serve many concurrent slow
+queries.
+
+Django 4.0 has no async ORM, so the queries of a request run in one call to the thread pool (see
+database_sync_to_async), while authentication and the layout are served from the async cache.
+Only JWT authentication is supported.
+"""
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, transaction
+from django.http import JsonResponse
+from django.views import View
+
+from asgiref.sync import sync_to_async
+from rest_framework.exceptions import NotAuthenticated, PermissionDenied
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from accounts.authentication import CachedJWTAuthentication
+from accounts.cache import user_cache_key
+from .mixins import DynamicModelMixin, QueryMixin, ReleaseMixin
+from .permissions import ModelPermission
+from .views import DataAPIView, get_layout
+
+LAYOUT_CACHE_TIMEOUT = 60 * 60
+
+
+def database_sync_to_async(func):
+    """
+    Run a function that queries the database in the thread pool rather than the request thread,
+    closing stale connections around it as Django does around a request.
+    """
+
+    def inner(*args, **kwargs):
+        close_old_connections()
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(inner, thread_sensitive=False)
+
+
+def layout_cache_key(release_id):
+    return f'layout:{release_id}'
+
+
+class AsyncAPIView(QueryMixin, ReleaseMixin, View):
+    """
+    Base view of the async endpoints. Handlers are coroutines returning the response data, the
+    errors of the REST framework are handled as by an APIView.
+    """
+
+    http_method_names = ['get']
+    format_kwarg = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        """
+        Return the view as a coroutine function, which Django 4.0 class-based views are not. The
+        view is not wrapped in a transaction, which cannot span the threads running its queries.
+        """
+
+        async def view(request, *args, **kwargs):
+            self = cls(**initkwargs)
+            self.setup(request, *args, **kwargs)
+            return await self.dispatch(request, *args, **kwargs)
+
+        view.view_class = cls
+        view.view_initkwargs = initkwargs
+
+        return transaction.non_atomic_requests(view)
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.request = Request(request, parsers=[], authenticators=[])
+
+        try:
+            self.request.user = await self.authenticate(request)
+
+            if request.method.lower() not in self.http_method_names:
+                return JsonResponse({'detail': 'Method not allowed.'}, status=405)
+
+            data = await getattr(self, request.method.lower())(request, *args, **kwargs)
+        except Exception as exc:
+            response = exception_handler(exc, {'view': self, 'request': self.request})
+
+            if response is None:
+                raise
+
+            return JsonResponse(response.data, status=response.status_code, safe=False)
+
+        return JsonResponse(data, encoder=DjangoJSONEncoder, safe=False)
+
+    async def authenticate(self, request):
+        """
+        Return the user of the request's access token, loading it from the cache when possible.
+        """
+        authentication = CachedJWTAuthentication()
+        header = authentication.get_header(request)
+        raw_token = authentication.get_raw_token(header) if header else None
+
+        if raw_token is None:
+            return api_settings.UNAUTHENTICATED_USER()
+
+        validated_token = authentication.get_validated_token(raw_token)
+        user = await cache.aget(user_cache_key(validated_token.get(jwt_settings.USER_ID_CLAIM)))
+
+        if user is None:
+            user = await database_sync_to_async(authentication.get_user)(validated_token)
+
+        return user
+
+
+class AsyncLayoutView(AsyncAPIView):
+    """
+    Async variant of LayoutAPIView. The layout of a release does not change once published, so it
+    is cached per release.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        release = await database_sync_to_async(lambda: self.release)()
+        key = layout_cache_key(release.id)
+        layout = await cache.aget(key)
+
+        if layout is None:
+            layout = await database_sync_to_async(get_layout)(release)
+            await cache.aset(key, layout, LAYOUT_CACHE_TIMEOUT)
+
+        return layout
+
+
+class AsyncDataView(DynamicModelMixin, AsyncAPIView):
+    """
+    Async variant of the list and detail endpoints of DataAPIView.
+    """
+
+    permission_classes = [ModelPermission]
+
+    list = DataAPIView.list
+    detail = DataAPIView.detail
+
+    async def get(self, request, *args, **kwargs):
+        return await database_sync_to_async(self.read)()
+
+    def read(self):
+        for permission in self.permission_classes:
+            if not permission().has_permission(self.request, self):
+                if not self.request.user.is_authenticated:
+                    raise NotAuthenticated()
+
+                raise PermissionDenied()
+
+        response = self.detail() if self.object_id else self.list()
+        return response.data
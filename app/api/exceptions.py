@@ -0,0 +1,12 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class ReleaseConflict(APIException):
+    """
+    Raised when a change or publish is made against a release that is no longer current.
+    """
+
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'The release has changed, reload and try again.'
+    default_code = 'release_conflict'
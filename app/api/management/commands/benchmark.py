@@ -0,0 +1,106 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signals import request_finished, request_started
+from django.db import connection
+from django.test import override_settings
+from django.urls import Resolver404, resolve
+
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.models import User
+
+# (label, CONN_MAX_AGE, DB_PREPARED_STATEMENTS)
+CONFIGURATIONS = [
+    ('new connection per request', 0, False),
+    ('persistent connection', 60, False),
+    ('persistent connection, prepared statements', 60, True),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the latency of listing the rows of a model through the data API, with and '
+        'without persistent connections and prepared statements.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', type=str, help='Name of the model to list')
+        parser.add_argument('--requests', type=int, default=200, help='Requests to time')
+        parser.add_argument(
+            '--warmup', type=int, default=10, help='Untimed requests to make first'
+        )
+        parser.add_argument('--page-size', type=int, default=100, help='Rows per page')
+
+    def handle(self, *args, **options):
+        path = f'/internal-api/application/data/{options["model"]}/'
+
+        try:
+            match = resolve(path)
+        except Resolver404:
+            raise CommandError(f'{path} is not a data API path')
+
+        if options['requests'] < 2:
+            raise CommandError('At least two requests are needed for percentiles')
+
+        # An unsaved superuser has every model permission without writing to the database.
+        user = User(email='benchmark@example.com', is_superuser=True, is_active=True)
+        factory = APIRequestFactory()
+        conn_max_age = connection.settings_dict['CONN_MAX_AGE']
+        baseline = None
+
+        try:
+            for label, max_age, prepared in CONFIGURATIONS:
+                connection.close()
+                connection.settings_dict['CONN_MAX_AGE'] = max_age
+
+                with override_settings(DB_PREPARED_STATEMENTS=prepared):
+                    for _ in range(options['warmup']):
+                        self.request(factory, match, path, user, options['page_size'])
+
+                    timings = [
+                        self.request(factory, match, path, user, options['page_size'])
+                        for _ in range(options['requests'])
+                    ]
+
+                percentiles = statistics.quantiles(timings, n=100)
+                p50, p99 = percentiles[49], percentiles[98]
+                line = f'{label:<45} p50 {p50:8.2f} ms  p99 {p99:8.2f} ms'
+
+                if baseline:
+                    line += (
+                        f'  ({(p50 / baseline[0] - 1) * 100:+.0f}% / '
+                        f'{(p99 / baseline[1] - 1) * 100:+.0f}%)'
+                    )
+                else:
+                    baseline = (p50, p99)
+
+                self.stdout.write(line)
+        finally:
+            connection.close()
+            connection.settings_dict['CONN_MAX_AGE'] = conn_max_age
+
+    def request(self, factory, match, path, user, page_size):
+        """
+        Make a request through the view, with the request signals that open and close connections,
+        returning its latency in milliseconds.
+        """
+        request = factory.get(path, {'page_size': page_size})
+        # The request does not go through the middleware, which sets the user for read_replica.
+        request.user = user
+        force_authenticate(request, user)
+
+        start = time.perf_counter()
+        request_started.send(sender=self.__class__)
+
+        try:
+            response = match.func(request, *match.args, **match.kwargs)
+            response.render()
+        finally:
+            request_finished.send(sender=self.__class__)
+
+        if response.status_code != 200:
+            raise CommandError(f'{path} returned {response.status_code}')
+
+        return (time.perf_counter() - start) * 1000
@@ -1,12 +1,20 @@
-from typing import Optional
+from typing import List, Optional
 
+from django.shortcuts import get_object_or_404
 from django.utils.functional import cached_property
 
-from rest_framework import status
+from rest_framework import serializers, status
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 
-from syntax.models import Release, ReleaseChange
+from db.models import ModelSchema
+from syntax.exceptions import StaleReleaseError
+from syntax.models import Release, ReleaseChange, ReleaseSyntax
 from syntax.serializers import ReleaseSerializer
+from .exceptions import ReleaseConflict
+
+# Query params that control the response rather than filter the data.
+RESERVED_QUERY_PARAMS = {'page_name', 'page_num', 'page_size', 'release_version'}
 
 
 class QueryMixin:
@@ -26,14 +34,15 @@ class QueryMixin:
     @property
     def query_params(self):
         """
-        Return a dict of query params passed.
+        Return a dict of query params passed, excluding the reserved params.
         """
         params = dict(self.request.query_params)  # type: ignore
 
-        for key, param in params.items():
-            params[key] = list(param)[0]
-
-        return params
+        return {
+            key: list(param)[0]
+            for key, param in params.items()
+            if key not in RESERVED_QUERY_PARAMS
+        }
 
 
 class ReleaseMixin:
@@ -72,11 +81,111 @@ class ReleaseMixin:
             model_type=model_type or self.model_name,
             syntax_json=syntax_json or self.request.data,
         )
-        release_change.save(object_id=object_id or self.object_id)
+        try:
+            release_change.save(object_id=object_id or self.object_id)
+        except StaleReleaseError as err:
+            raise ReleaseConflict(str(err)) from err
 
         return release_change.syntax_json['id']
 
 
+class DynamicModelMixin:
+    """
+    Resolves the dynamic model given in the URL and the page being rendered, once per request, and
+    provides the queryset and serializer for the model.
+    """
+
+    @cached_property
+    def model_schema(self) -> ModelSchema:
+        model_name = self.kwargs.get('model')  # type: ignore
+        model_schema = ModelSchema.objects.filter(name__iexact=model_name).first()
+
+        if model_schema is None:
+            raise NotFound(f'Model {model_name} not found.')
+
+        return model_schema
+
+    @cached_property
+    def model(self):
+        return self.model_schema.as_model()
+
+    @property
+    def page_name(self) -> Optional[str]:
+        page_name = self.kwargs.get('page_name')  # type: ignore
+        return page_name or self.request.query_params.get('page_name')  # type: ignore
+
+    @cached_property
+    def page(self) -> ReleaseSyntax:
+        """
+        Return the syntax of the page being rendered from the release.
+        """
+        page = ReleaseSyntax.get_page(
+            self.release, str(self.model_schema.id), self.page_name  # type: ignore
+        )
+
+        if page is None:
+            raise NotFound(f'Page {self.page_name} not found.')
+
+        return page
+
+    @cached_property
+    def page_fields(self) -> Optional[List[str]]:
+        """
+        Return the model fields required by the page, so only those are loaded. None is returned
+        when all fields are required.
+        """
+        if not self.page_name:
+            return None
+
+        page_object_fields = self.page.syntax_json.get('page_object_fields')
+
+        if page_object_fields is None:
+            return None
+
+        model_fields = {x.name for x in self.model._meta.concrete_fields}
+
+        return ['id'] + [x for x in page_object_fields if x in model_fields and x != 'id']
+
+    def get_queryset(self):
+        queryset = self.model.objects.all()
+
+        if params := self.query_params:  # type: ignore
+            queryset = queryset.filter(**params)
+
+        queryset = self.order_queryset(queryset)
+
+        return queryset
+
+    def order_queryset(self, queryset):
+        return queryset.order_by('-created_at')
+
+    def get_object(self, fields=None):
+        queryset = self.get_queryset()
+
+        if fields is not None:
+            queryset = queryset.only(*fields)
+
+        return get_object_or_404(queryset, id=self.object_id)  # type: ignore
+
+    def get_serializer(self, *args, fields=None, **kwargs):
+        serializer_class = self.generic_serializer(fields)
+        kwargs.setdefault(
+            'context',
+            {'request': self.request, 'format': self.format_kwarg, 'view': self},  # type: ignore
+        )
+        return serializer_class(*args, **kwargs)
+
+    def generic_serializer(self, fields=None):
+        model_fields = fields or '__all__'
+
+        class GenericSerializer(serializers.ModelSerializer):
+            class Meta:
+                model = self.model
+                fields = model_fields
+
+        return GenericSerializer
+
+
 class HTTPMixin:
     def get(self, request, *args, **kwargs):
         if self.object_id:  # type: ignore
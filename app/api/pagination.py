@@ -1,8 +1,39 @@
 from rest_framework.pagination import PageNumberPagination
 
+from db.prepared import PreparedQuerySet
+
 
 class DataPagination(PageNumberPagination):
+    """
+    Pagination of the rows of dynamic models. The count and page queries are run as prepared
+    statements where supported (see db.prepared).
+    """
+
     page_size = 100
     page_size_query_param = 'page_size'
     page_query_param = 'page_num'
     max_page_size = 200
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if PreparedQuerySet.supports(queryset):
+            queryset = PreparedQuerySet(queryset)
+
+        return super().paginate_queryset(queryset, request, view=view)
+
+
+class ReleasePagination(PageNumberPagination):
+    """
+    Pagination of the release tree. The tree is only paginated when a page is requested, so the
+    whole tree is returned by default.
+    """
+
+    page_size = 200
+    page_size_query_param = 'page_size'
+    page_query_param = 'page_num'
+    max_page_size = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.page_query_param not in request.query_params:
+            return None
+
+        return super().paginate_queryset(queryset, request, view=view)
@@ -0,0 +1,57 @@
+from django.core.cache import cache
+
+from rest_framework.permissions import BasePermission
+
+from accounts.cache import PERMISSIONS_CACHE_TIMEOUT, permissions_cache_key
+from syntax.models import PermissionIndex, Release
+
+
+def get_effective_permissions(user, release=None):
+    """
+    Return the set of (modelschema id, permission name) pairs given to a user in a release,
+    defaulting to the current release. The set is cached per release until a release is published
+    or restored, or group membership changes, so checking it does not query the permission index.
+    """
+    if release is None:
+        release = Release.get_current_release()
+
+    key = permissions_cache_key(user.id, release.release_version)
+    permissions = cache.get(key)
+
+    if permissions is None:
+        permissions = PermissionIndex.get_user_permissions(release, user)
+        cache.set(key, permissions, PERMISSIONS_CACHE_TIMEOUT)
+
+    return permissions
+
+
+class ModelPermission(BasePermission):
+    """
+    Allows access to the data of a dynamic model to users given the model's permission for the
+    request method: View to read, Edit to create or update and Delete to delete. Superusers have
+    every permission. The permissions are those of the release of the view.
+    """
+
+    METHOD_PERMISSIONS = {
+        'GET': 'View',
+        'HEAD': 'View',
+        'OPTIONS': 'View',
+        'POST': 'Edit',
+        'PUT': 'Edit',
+        'PATCH': 'Edit',
+        'DELETE': 'Delete',
+    }
+
+    def has_permission(self, request, view):
+        user = request.user
+
+        if not user or not user.is_authenticated:
+            return False
+
+        if user.is_superuser:
+            return True
+
+        permission_name = self.METHOD_PERMISSIONS.get(request.method)
+        model_id = str(view.model_schema.id)
+
+        return (model_id, permission_name) in get_effective_permissions(user, view.release)
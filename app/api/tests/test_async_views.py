@@ -0,0 +1,92 @@
+import uuid
+
+from django.core.cache import cache
+from django.test import AsyncClient, TransactionTestCase
+
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from db.models import ModelSchema
+from db.tests.utils import clear_dynamic_models
+from syntax.models import Release, ReleaseChange, ReleaseChangeType
+from ..async_views import layout_cache_key
+
+LAYOUT_URL = '/internal-api/application/async/layout/'
+DATA_URL = '/internal-api/application/async/data/author/'
+
+
+class AsyncViewsTest(TransactionTestCase):
+    """
+    The async views query the database from the thread pool, so the test data must be committed.
+    """
+
+    def setUp(self):
+        release = Release.objects.create(release_version='0', release_notes='')
+        ReleaseChange.objects.create(
+            parent_release=release,
+            change_type=ReleaseChangeType.CREATE,
+            model_type='modelschema',
+            syntax_json={
+                'model_name': 'Author',
+                'fields': [{'field_name': 'name', 'field_type': 'text', 'required': True}],
+            },
+        )
+        self.release = Release.objects.create(
+            parent=release, release_version='1', release_notes=''
+        )
+
+        self.author = ModelSchema.objects.get(name='Author').as_model().objects.create(name='Jane')
+
+        user = User.objects.create_user('alice@example.com', 'password')
+        self.user_token = AccessToken.for_user(user)
+        admin = User.objects.create_superuser('admin@example.com', 'password')
+        self.admin_token = AccessToken.for_user(admin)
+        self.client = AsyncClient()
+
+    def tearDown(self):
+        for model_schema in ModelSchema.objects.all():
+            model_schema.delete()
+
+        clear_dynamic_models()
+
+    def get(self, url, token=None):
+        return self.client.get(url, authorization=f'Bearer {token or self.admin_token}')
+
+    async def test_layout(self):
+        response = await self.get(LAYOUT_URL)
+
+        self.assertEqual(200, response.status_code)
+        self.assertListEqual(['Author'], [x['model_name'] for x in response.json()['models']])
+        self.assertEqual(response.json(), await cache.aget(layout_cache_key(self.release.id)))
+
+    async def test_list(self):
+        response = await self.get(DATA_URL)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(1, response.json()['count'])
+        self.assertEqual('Jane', response.json()['results'][0]['name'])
+
+    async def test_detail(self):
+        response = await self.get(f'{DATA_URL}{self.author.id}/')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(str(self.author.id), response.json()['id'])
+        self.assertEqual('Jane', response.json()['name'])
+
+        response = await self.get(f'{DATA_URL}{uuid.uuid4()}/')
+
+        self.assertEqual(404, response.status_code)
+
+    async def test_permissions(self):
+        response = await self.client.get(DATA_URL)
+
+        self.assertEqual(401, response.status_code)
+
+        response = await self.get(DATA_URL, self.user_token)
+
+        self.assertEqual(403, response.status_code)
+
+    async def test_method_not_allowed(self):
+        response = await self.client.post(DATA_URL)
+
+        self.assertEqual(405, response.status_code)
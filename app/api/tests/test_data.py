@@ -0,0 +1,248 @@
+from unittest import mock
+
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from api.permissions import ModelPermission
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from db.models import ModelSchema
+from db.tests.utils import clear_dynamic_models
+from syntax.models import Release, ReleaseChange, ReleaseChangeType
+
+DATA_URL = '/internal-api/application/data/author/'
+
+
+def text_field(field_name):
+    return {'field_name': field_name, 'field_type': 'text', 'required': True}
+
+
+class AuthorTestCase(TestCase):
+    # Layout of the edit page, or None to keep the default one.
+    edit_layout = [{'component': 'header', 'config': {'title': 'Edit {{ name }}'}}]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_superuser('admin@example.com', 'password')
+        )
+        release = Release.objects.create(release_version='0', release_notes='')
+
+        ReleaseChange.objects.create(
+            parent_release=release,
+            change_type=ReleaseChangeType.CREATE,
+            model_type='modelschema',
+            syntax_json={
+                'model_name': 'Author',
+                'fields': [text_field('name'), text_field('biography'), text_field('notes')],
+            },
+        )
+        if self.edit_layout is not None:
+            edit_page = release.release_changes.get(
+                model_type='page', syntax_json__page_name='edit'
+            )
+            ReleaseChange(
+                parent_release=release,
+                change_type=ReleaseChangeType.UPDATE,
+                model_type='page',
+                syntax_json={'page_name': 'edit', 'layout': self.edit_layout},
+            ).save(object_id=edit_page.syntax_json['id'])
+
+        Release.objects.create(parent=release, release_version='1', release_notes='')
+
+        self.model = ModelSchema.objects.get(name='Author').as_model()
+        self.author = self.model.objects.create(name='Jane', biography='...', notes='...')
+
+    def tearDown(self):
+        clear_dynamic_models()
+
+
+class DataAPIViewPageFieldsTest(AuthorTestCase):
+    def test_page_object_fields_stored(self):
+        page = Release.get_current_release().syntax.get(
+            model_type='page', blob__syntax_json__page_name='edit'
+        )
+
+        self.assertListEqual(['name'], page.syntax_json['page_object_fields'])
+
+    def test_detail_page_fields(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f'{DATA_URL}{self.author.id}/', {'page_name': 'edit'})
+
+        self.assertEqual(200, response.status_code)
+        self.assertDictEqual({'id': str(self.author.id), 'name': 'Jane'}, response.data)
+
+        query = [x['sql'] for x in context.captured_queries if 'db_author' in x['sql']][0]
+        self.assertNotIn('biography', query)
+
+    def test_detail_all_fields(self):
+        response = self.client.get(f'{DATA_URL}{self.author.id}/')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('...', response.data['biography'])
+
+    def test_detail_unknown_page(self):
+        response = self.client.get(f'{DATA_URL}{self.author.id}/', {'page_name': 'unknown'})
+
+        self.assertEqual(404, response.status_code)
+
+    def test_list_reserved_params(self):
+        response = self.client.get(DATA_URL, {'page_num': 1, 'page_size': 10})
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(1, response.data['count'])
+
+
+class PageAPIViewTest(AuthorTestCase):
+    RENDER_URL = '/internal-api/application/render/author/'
+
+    def test_render_edit_page(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f'{self.RENDER_URL}edit/{self.author.id}/')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('1', response.data['release']['release_version'])
+        self.assertEqual('edit', response.data['page']['page_name'])
+        self.assertDictEqual({'id': str(self.author.id), 'name': 'Jane'}, response.data['data'])
+
+        # The release and model are resolved once for the page and its data.
+        queries = [x['sql'] for x in context.captured_queries]
+        self.assertEqual(1, len([x for x in queries if 'FROM "syntax_release"' in x]))
+        self.assertEqual(1, len([x for x in queries if 'FROM "db_modelschema"' in x]))
+
+    def test_render_list_page(self):
+        response = self.client.get(f'{self.RENDER_URL}list/')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('list', response.data['page']['page_name'])
+        self.assertEqual(1, response.data['data']['count'])
+        self.assertEqual('Jane', response.data['data']['results'][0]['name'])
+
+    def test_render_create_page(self):
+        response = self.client.get(f'{self.RENDER_URL}create/')
+
+        self.assertEqual(200, response.status_code)
+        self.assertIsNone(response.data['data'])
+
+    def test_render_unknown(self):
+        self.assertEqual(404, self.client.get(f'{self.RENDER_URL}unknown/').status_code)
+        self.assertEqual(
+            404, self.client.get('/internal-api/application/render/unknown/list/').status_code
+        )
+
+
+class DefaultEditPageTest(AuthorTestCase):
+    edit_layout = None
+
+    def test_page_object_fields_stored(self):
+        page = Release.get_current_release().syntax.get(
+            model_type='page', blob__syntax_json__page_name='edit'
+        )
+
+        # The default edit page has a form of every field.
+        self.assertIsNone(page.syntax_json['page_object_fields'])
+
+    def test_detail_page_fields(self):
+        response = self.client.get(f'{DATA_URL}{self.author.id}/', {'page_name': 'edit'})
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('Jane', response.data['name'])
+        self.assertEqual('...', response.data['biography'])
+        self.assertEqual('...', response.data['notes'])
+
+    def test_render_edit_page(self):
+        response = self.client.get(f'{PageAPIViewTest.RENDER_URL}edit/{self.author.id}/')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('Jane', response.data['data']['name'])
+        self.assertEqual('...', response.data['data']['biography'])
+        self.assertEqual('...', response.data['data']['notes'])
+
+
+class ModelPermissionTest(AuthorTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('jane@example.com', 'password')
+        self.group = Group.objects.create(name='Editors')
+        self.client.force_authenticate(self.user)
+
+    def grant(self, permission_name, users=(), groups=(), release_version=None):
+        release = Release.get_current_release()
+        permission = release.syntax.get(
+            model_type='permission', blob__syntax_json__permission_name=permission_name
+        )
+
+        ReleaseChange(
+            parent_release=release,
+            change_type=ReleaseChangeType.UPDATE,
+            model_type='permission',
+            syntax_json={
+                **permission.syntax_json,
+                'users': [str(x.id) for x in users],
+                'groups': [x.id for x in groups],
+            },
+        ).save(object_id=permission.object_id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Release.objects.create(
+                parent=release,
+                release_version=release_version or permission_name,
+                release_notes='',
+            )
+
+    def test_permissions(self):
+        self.assertEqual(403, self.client.get(DATA_URL).status_code)
+
+        self.grant('View', users=[self.user])
+
+        self.assertEqual(200, self.client.get(DATA_URL).status_code)
+        self.assertEqual(403, self.client.delete(f'{DATA_URL}{self.author.id}/').status_code)
+
+        self.grant('Delete', groups=[self.group])
+        self.assertEqual(403, self.client.delete(f'{DATA_URL}{self.author.id}/').status_code)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.user_set.add(self.user)
+
+        self.assertEqual(200, self.client.delete(f'{DATA_URL}{self.author.id}/').status_code)
+
+    def test_permissions_cached(self):
+        self.grant('View', users=[self.user])
+        self.client.get(DATA_URL)
+
+        # The release and model are those already resolved by the view.
+        request = mock.Mock(user=self.user, method='GET')
+        view = mock.Mock(
+            release=Release.get_current_release(),
+            model_schema=ModelSchema.objects.get(name='Author'),
+        )
+
+        with self.assertNumQueries(0):
+            self.assertTrue(ModelPermission().has_permission(request, view))
+
+    def test_permissions_of_release_version(self):
+        self.grant('View', users=[self.user])
+        self.grant('View', release_version='Revoked')
+
+        self.assertEqual(403, self.client.get(DATA_URL).status_code)
+        self.assertEqual(200, self.client.get(DATA_URL, {'release_version': 'View'}).status_code)
+
+    def test_permissions_cached_per_release(self):
+        self.grant('View', users=[self.user])
+
+        self.assertEqual(200, self.client.get(DATA_URL).status_code)
+
+        # The permissions of a new release are not those cached for the previous release, even
+        # before the invalidation of the cached permissions.
+        with mock.patch('syntax.models.invalidate_permissions'):
+            self.grant('View', release_version='Revoked')
+
+        self.assertEqual(403, self.client.get(DATA_URL).status_code)
+
+    def test_unauthenticated(self):
+        self.client.force_authenticate(None)
+
+        self.assertEqual(401, self.client.get(DATA_URL).status_code)
@@ -0,0 +1,206 @@
+import uuid
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APIClient
+
+from syntax.models import Release, ReleaseChange, ReleaseChangeType, ReleaseSyntax
+
+BATCH_URL = '/internal-api/developer/batch/'
+
+
+def create_function(function_name):
+    return {
+        'change_type': ReleaseChangeType.CREATE,
+        'model_type': 'function',
+        'syntax_json': {'function_name': function_name},
+    }
+
+
+class DeveloperBatchAPIViewTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.release = Release.objects.create(release_version='0', release_notes='')
+        self.functions = [
+            ReleaseSyntax.objects.create(
+                release=self.release,
+                model_type='function',
+                syntax_json={'id': str(uuid.uuid4()), 'function_name': function_name},
+            ).object_id
+            for function_name in ['Send Email', 'Export as CSV']
+        ]
+
+    def test_batch(self):
+        response = self.client.post(
+            BATCH_URL,
+            [
+                {
+                    'change_type': ReleaseChangeType.CREATE,
+                    'model_type': 'modelschema',
+                    'syntax_json': {'model_name': 'Book', 'fields': []},
+                },
+                create_function('Archive'),
+                {
+                    'change_type': ReleaseChangeType.UPDATE,
+                    'model_type': 'function',
+                    'object_id': self.functions[0],
+                    'syntax_json': {'function_name': 'Send Emails'},
+                },
+                {
+                    'change_type': ReleaseChangeType.DELETE,
+                    'model_type': 'function',
+                    'object_id': self.functions[1],
+                },
+            ],
+            format='json',
+        )
+
+        self.assertEqual(200, response.status_code)
+        data = response.data['data']
+        self.assertListEqual(
+            ['create', 'create', 'update', 'delete'], [x['change_type'] for x in data]
+        )
+        self.assertListEqual(self.functions, [x['id'] for x in data[2:]])
+
+        # The model, its 4 default pages and 3 permissions, and the 3 function changes.
+        self.assertEqual(11, response.data['release_change_count'])
+        self.assertEqual(
+            7, ReleaseChange.objects.filter(syntax_json__modelschema_id=data[0]['id']).count()
+        )
+        self.assertEqual(
+            'Send Emails',
+            ReleaseChange.objects.get(object_id=self.functions[0]).syntax_json['function_name'],
+        )
+
+    def test_batch_updates_existing_changes(self):
+        response = self.client.post(BATCH_URL, [create_function('Archive')], format='json')
+        object_id = response.data['data'][0]['id']
+
+        response = self.client.post(
+            BATCH_URL,
+            [
+                {
+                    'change_type': ReleaseChangeType.UPDATE,
+                    'model_type': 'function',
+                    'object_id': object_id,
+                    'syntax_json': {'function_name': 'Archive All'},
+                },
+            ],
+            format='json',
+        )
+
+        self.assertEqual(ReleaseChangeType.CREATE, response.data['data'][0]['change_type'])
+        self.assertEqual(1, ReleaseChange.objects.count())
+
+        response = self.client.post(
+            BATCH_URL,
+            [
+                {
+                    'change_type': ReleaseChangeType.DELETE,
+                    'model_type': 'function',
+                    'object_id': object_id,
+                },
+            ],
+            format='json',
+        )
+
+        self.assertListEqual([None], response.data['data'])
+        self.assertEqual(0, ReleaseChange.objects.count())
+
+    def test_batch_query_count(self):
+        def count_queries(size):
+            changes = [create_function(f'Function {i}') for i in range(size)]
+            changes.append(
+                {
+                    'change_type': ReleaseChangeType.UPDATE,
+                    'model_type': 'function',
+                    'object_id': self.functions[0],
+                    'syntax_json': {'function_name': f'Function {size}'},
+                }
+            )
+
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(BATCH_URL, changes, format='json')
+
+            self.assertEqual(200, response.status_code)
+            return len(context.captured_queries)
+
+        self.assertEqual(count_queries(5), count_queries(100))
+
+    def test_batch_invalid(self):
+        response = self.client.post(
+            BATCH_URL,
+            [
+                create_function('Archive'),
+                {'change_type': ReleaseChangeType.CREATE, 'model_type': 'function'},
+                {
+                    'change_type': ReleaseChangeType.UPDATE,
+                    'model_type': 'page',
+                    'syntax_json': {'page_name': 'list', 'layout': []},
+                },
+            ],
+            format='json',
+        )
+
+        self.assertEqual(400, response.status_code)
+        self.assertDictEqual({}, response.data[0])
+        self.assertIn('syntax_json', response.data[1])
+        self.assertIn('object_id', response.data[2])
+        self.assertEqual(0, ReleaseChange.objects.count())
+
+
+class DeveloperComponentAPIViewTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.release = Release.objects.create(release_version='0', release_notes='')
+        self.page_id = str(uuid.uuid4())
+        ReleaseSyntax.objects.create(
+            release=self.release,
+            model_type='page',
+            syntax_json={
+                'id': self.page_id,
+                'page_name': 'edit',
+                'layout': [
+                    {
+                        'id': 'column',
+                        'component': 'column',
+                        'config': {
+                            'components': [{'id': 'form', 'component': 'form', 'config': {}}]
+                        },
+                    }
+                ],
+            },
+        )
+
+    def url(self, page_id, component_id):
+        return f'/internal-api/developer/page/{page_id}/component/{component_id}/'
+
+    def test_patch_component(self):
+        # The component is found with the index stored with the released page.
+        with mock.patch('syntax.models.build_component_index') as build_component_index:
+            response = self.client.patch(
+                self.url(self.page_id, 'form'), {'config': {'title': 'Edit'}}, format='json'
+            )
+
+        build_component_index.assert_not_called()
+        self.assertEqual(200, response.status_code)
+        self.assertDictEqual({'title': 'Edit'}, response.data['data']['config'])
+        self.assertEqual(1, response.data['release_change_count'])
+
+        page = self.release.release_changes.get(object_id=self.page_id).syntax_json
+        self.assertEqual('Edit', page['layout'][0]['config']['components'][0]['config']['title'])
+
+    def test_patch_missing(self):
+        response = self.client.patch(
+            self.url(self.page_id, 'missing'), {'config': {}}, format='json'
+        )
+        self.assertEqual(404, response.status_code)
+
+        response = self.client.patch(self.url(uuid.uuid4(), 'form'), {'config': {}}, format='json')
+        self.assertEqual(404, response.status_code)
+
+        response = self.client.patch(self.url(self.page_id, 'form'), {}, format='json')
+        self.assertEqual(400, response.status_code)
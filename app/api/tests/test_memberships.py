@@ -0,0 +1,84 @@
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APIClient
+
+from accounts.models import User
+
+USER_URL = '/internal-api/developer/user/'
+GROUP_URL = '/internal-api/developer/group/'
+
+
+class MembershipTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.users = [
+            User.objects.create_user(f'user{i}@example.com', 'password') for i in range(4)
+        ]
+        self.groups = [Group.objects.create(name=f'Group {i}') for i in range(3)]
+
+    def post(self, url, data):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, data, format='json')
+
+        self.assertEqual(200, response.status_code)
+        return response.data
+
+    def group_user_ids(self, group):
+        return set(group.user_set.values_list('id', flat=True))
+
+    def test_group_users(self):
+        group = self.groups[0]
+        url = f'{GROUP_URL}{group.id}/'
+        ids = [str(x.id) for x in self.users]
+
+        self.assertDictEqual(
+            {'added': 3, 'removed': 0}, self.post(f'{url}add-users/', {'user_ids': ids[:3]})
+        )
+        self.assertDictEqual(
+            {'added': 1, 'removed': 0}, self.post(f'{url}add-users/', {'user_ids': ids})
+        )
+        self.assertDictEqual(
+            {'added': 0, 'removed': 2}, self.post(f'{url}remove-users/', {'user_ids': ids[:2]})
+        )
+        self.assertSetEqual({x.id for x in self.users[2:]}, self.group_user_ids(group))
+
+        self.assertDictEqual(
+            {'added': 2, 'removed': 1},
+            self.post(f'{url}set-users/', {'user_ids': ids[:2] + ids[3:]}),
+        )
+        self.assertSetEqual(
+            {self.users[0].id, self.users[1].id, self.users[3].id}, self.group_user_ids(group)
+        )
+
+    def test_user_groups(self):
+        user = self.users[0]
+        url = f'{USER_URL}{user.id}/'
+
+        self.post(f'{url}add-groups/', {'group_ids': [x.id for x in self.groups]})
+        self.post(f'{url}set-groups/', {'group_ids': [self.groups[1].id]})
+
+        self.assertListEqual([self.groups[1].id], [x.id for x in user.groups.all()])
+
+    def test_query_count(self):
+        def count_queries(users):
+            url = f'{GROUP_URL}{self.groups[0].id}/set-users/'
+
+            with CaptureQueriesContext(connection) as context:
+                self.post(url, {'user_ids': [str(x.id) for x in users]})
+
+            return len(context.captured_queries)
+
+        # Each call adds and removes memberships.
+        count_queries(self.users[:1])
+        self.assertEqual(count_queries(self.users[1:2]), count_queries(self.users[2:]))
+
+    def test_unknown_ids(self):
+        response = self.client.post(
+            f'{USER_URL}{self.users[0].id}/add-groups/', {'group_ids': [0]}, format='json'
+        )
+
+        self.assertEqual(400, response.status_code)
+        self.assertFalse(self.users[0].groups.exists())
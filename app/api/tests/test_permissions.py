@@ -0,0 +1,121 @@
+from django.contrib.auth.models import Group
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from db.tests.utils import clear_dynamic_models
+from syntax.models import PermissionIndex, Release, ReleaseChange, ReleaseChangeType
+
+USER_URL = '/internal-api/developer/user/'
+GROUP_URL = '/internal-api/developer/group/'
+
+
+class PermissionsTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        release = Release.objects.create(release_version='0', release_notes='')
+
+        ReleaseChange.objects.create(
+            parent_release=release,
+            change_type=ReleaseChangeType.CREATE,
+            model_type='modelschema',
+            syntax_json={'model_name': 'Author', 'fields': []},
+        )
+        self.release = Release.objects.create(
+            parent=release, release_version='1', release_notes=''
+        )
+        self.permissions = {
+            x['permission_name']: x['id']
+            for x in self.release.get_syntax_definitions('permission')
+        }
+
+        self.alice = User.objects.create_user('alice@example.com', 'password')
+        self.bob = User.objects.create_user('bob@example.com', 'password')
+        self.editors = Group.objects.create(name='Editors')
+        self.editors.user_set.add(self.bob)
+
+    def tearDown(self):
+        clear_dynamic_models()
+
+    def get_permission_names(self, url):
+        response = self.client.get(f'{url}permissions/')
+
+        self.assertEqual(200, response.status_code)
+        return sorted(x['permission_name'] for x in response.data)
+
+    def test_permissions(self):
+        alice_url = f'{USER_URL}{self.alice.id}/'
+        bob_url = f'{USER_URL}{self.bob.id}/'
+        editors_url = f'{GROUP_URL}{self.editors.id}/'
+
+        self.assertListEqual([], self.get_permission_names(alice_url))
+
+        self.client.post(
+            f'{editors_url}add-permission/', {'permission_id': self.permissions['Edit']}
+        )
+        self.client.post(
+            f'{alice_url}add-permission/', {'permission_id': self.permissions['View']}
+        )
+
+        self.assertListEqual(['Edit'], self.get_permission_names(editors_url))
+        self.assertListEqual(['Edit'], self.get_permission_names(bob_url))
+        self.assertListEqual(['View'], self.get_permission_names(alice_url))
+
+        # Pending changes are only indexed as staged rows until they are published.
+        self.assertFalse(PermissionIndex.lookup(self.release, include_changes=False).exists())
+
+        release = Release.objects.create(
+            parent=self.release, release_version='2', release_notes=''
+        )
+
+        self.assertEqual(2, PermissionIndex.lookup(release, include_changes=False).count())
+        self.assertFalse(PermissionIndex.objects.filter(staged=True).exists())
+
+        self.client.post(
+            f'{editors_url}remove-permission/', {'permission_id': self.permissions['Edit']}
+        )
+        self.client.post(
+            f'{alice_url}remove-permission/', {'permission_id': self.permissions['View']}
+        )
+
+        self.assertListEqual([], self.get_permission_names(bob_url))
+        self.assertListEqual([], self.get_permission_names(alice_url))
+        self.assertListEqual(
+            [self.permissions['View']],
+            [
+                x['permission_id']
+                for x in PermissionIndex.get_permission_ids(
+                    release, user=self.alice, include_changes=False
+                )
+            ],
+        )
+
+    def test_discarded_modelschema(self):
+        modelschema = ReleaseChange.objects.create(
+            parent_release=self.release,
+            change_type=ReleaseChangeType.CREATE,
+            model_type='modelschema',
+            syntax_json={'model_name': 'Book', 'fields': []},
+        )
+        permission = self.release.release_changes.get(
+            model_type='permission', syntax_json__permission_name='View'
+        )
+        permission.syntax_json['groups'].append(self.editors.id)
+        ReleaseChange(
+            parent_release=self.release,
+            change_type=ReleaseChangeType.UPDATE,
+            model_type='permission',
+            syntax_json=permission.syntax_json,
+        ).save(object_id=permission.object_id)
+
+        self.assertEqual(1, PermissionIndex.objects.filter(staged=True).count())
+
+        ReleaseChange(
+            parent_release=self.release,
+            change_type=ReleaseChangeType.DELETE,
+            model_type='modelschema',
+            syntax_json={},
+        ).save(object_id=modelschema.object_id)
+
+        self.assertFalse(PermissionIndex.objects.filter(staged=True).exists())
@@ -0,0 +1,118 @@
+import json
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APIClient
+
+from syntax.models import Release, ReleaseChange, ReleaseChangeType
+
+RELEASES_URL = '/internal-api/developer/releases/'
+
+
+def create_release_chain(length):
+    releases = [Release.objects.create(release_version='0', release_notes='')]
+
+    for i in range(1, length):
+        releases.append(
+            Release.objects.create(parent=releases[-1], release_version=str(i), release_notes='')
+        )
+
+    return releases
+
+
+class ReleaseViewSetListTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.releases = create_release_chain(6)
+
+        for i in range(3):
+            ReleaseChange.objects.create(
+                parent_release=self.releases[-1],
+                change_type=ReleaseChangeType.CREATE,
+                model_type='function',
+                syntax_json={'function_name': f'Function {i}'},
+            )
+
+    def test_list_single_query(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(RELEASES_URL)
+
+        # Ignore the savepoints of the atomic request.
+        queries = [x for x in context.captured_queries if 'SAVEPOINT' not in x['sql']]
+        self.assertEqual(1, len(queries))
+
+        self.assertEqual(200, response.status_code)
+        self.assertListEqual(
+            [x.release_version for x in self.releases],
+            [x['release_version'] for x in response.data],
+        )
+        self.assertListEqual([0, 0, 0, 0, 0, 3], [x['unapplied_changes'] for x in response.data])
+
+    def test_list_subtree(self):
+        root = self.releases[2]
+
+        response = self.client.get(RELEASES_URL, {'root': root.id})
+        self.assertListEqual(
+            [x.release_version for x in self.releases[2:]],
+            [x['release_version'] for x in response.data],
+        )
+
+        response = self.client.get(RELEASES_URL, {'root': root.id, 'depth': 1})
+        self.assertListEqual(
+            [x.release_version for x in self.releases[2:4]],
+            [x['release_version'] for x in response.data],
+        )
+
+    def test_list_paginated(self):
+        response = self.client.get(RELEASES_URL, {'page_num': 2, 'page_size': 4})
+
+        self.assertEqual(6, response.data['count'])
+        self.assertListEqual(
+            [x.release_version for x in self.releases[4:]],
+            [x['release_version'] for x in response.data['results']],
+        )
+
+
+class ReleaseViewSetDiffTest(TestCase):
+    def test_diff_pending_changes(self):
+        client = APIClient()
+        release = create_release_chain(1)[0]
+        ReleaseChange.objects.create(
+            parent_release=release,
+            change_type=ReleaseChangeType.CREATE,
+            model_type='function',
+            syntax_json={'function_name': 'Send Email'},
+        )
+
+        response = client.get(f'{RELEASES_URL}{release.id}/diff/')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+
+        self.assertEqual('application/x-ndjson', response['Content-Type'])
+        self.assertEqual(1, len(lines))
+        self.assertEqual('added', json.loads(lines[0])['diff_type'])
+
+
+class ReleaseViewSetRestoreTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.releases = create_release_chain(2)
+
+    def test_restore_dry_run(self):
+        url = f'{RELEASES_URL}{self.releases[0].id}/restore/'
+
+        response = self.client.post(url, {'dry_run': 'true'})
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(self.releases[1], Release.get_current_release())
+
+        # Form data is parsed as a boolean, so 'false' restores the release.
+        response = self.client.post(url, {'dry_run': 'false'})
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(self.releases[0], Release.get_current_release())
+
+        response = self.client.post(url, {'dry_run': 'maybe'})
+
+        self.assertEqual(400, response.status_code)
@@ -2,7 +2,8 @@ from django.urls import path
 
 from rest_framework.routers import DefaultRouter
 
-from . import views
+from core.routers import read_replica
+from . import async_views, views
 
 router = DefaultRouter()
 router.register(r'developer/user', views.UserViewSet, basename='users')
@@ -13,17 +14,46 @@ router.register(r'developer/releases', views.ReleaseViewSet, basename='releases'
 urlpatterns = router.urls + [
     path(
         'application/layout/',
-        views.LayoutAPIView.as_view(),
+        read_replica(views.LayoutAPIView.as_view()),
     ),
     path(
         'application/data/<str:model>/',
-        views.DataAPIView.as_view(),
+        read_replica(views.DataAPIView.as_view()),
     ),
     path(
         'application/data/<str:model>/<uuid:object_id>/',
-        views.DataAPIView.as_view(),
+        read_replica(views.DataAPIView.as_view()),
+    ),
+    path(
+        'application/render/<str:model>/<str:page_name>/',
+        read_replica(views.PageAPIView.as_view()),
+    ),
+    path(
+        'application/render/<str:model>/<str:page_name>/<uuid:object_id>/',
+        read_replica(views.PageAPIView.as_view()),
+    ),
+    # Async variants of the read endpoints
+    path(
+        'application/async/layout/',
+        async_views.AsyncLayoutView.as_view(),
+    ),
+    path(
+        'application/async/data/<str:model>/',
+        async_views.AsyncDataView.as_view(),
+    ),
+    path(
+        'application/async/data/<str:model>/<uuid:object_id>/',
+        async_views.AsyncDataView.as_view(),
     ),
     # Developer Views
+    path(
+        'developer/batch/',
+        views.DeveloperBatchAPIView.as_view(),
+    ),
+    path(
+        'developer/page/<uuid:page_id>/component/<str:component_id>/',
+        views.DeveloperComponentAPIView.as_view(),
+    ),
     path(
         'developer/<str:model>/',
         views.DeveloperAPIView.as_view(),
@@ -1,66 +1,87 @@
+import json
 import random
 import string
 
 from django.contrib.auth.models import Group
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Count
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from django.utils.functional import cached_property
 
-from api.pagination import DataPagination
-from rest_framework import serializers, status
+from api.pagination import DataPagination, ReleasePagination
+from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ParseError, ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet, ViewSet
 
+from accounts.memberships import MembershipChange, change_group_users, change_user_groups
 from accounts.models import User
-from accounts.serializers import GroupSerializer, UserSerializer
-from db.models import ModelSchema
-from syntax.models import Release, ReleaseChange, ReleaseChangeType
-from syntax.serializers import ReleaseChangeSerializer, ReleaseSerializer
-from .mixins import ReleaseMixin, ViewMixin
-
-
-class LayoutAPIView(ReleaseMixin, APIView):
+from accounts.serializers import (
+    GroupIdsSerializer,
+    GroupSerializer,
+    UserIdsSerializer,
+    UserSerializer,
+)
+from core.routers import read_replica
+from db.models import OutboxEvent
+from syntax.bundle import export_bundle, import_bundle
+from syntax.diff import diff_release_changes, diff_releases
+from syntax.exceptions import ComponentNotFoundError, PendingChangesError, StaleReleaseError
+from syntax.models import PermissionIndex, Release, ReleaseChange, ReleaseChangeType
+from syntax.serializers import (
+    BatchReleaseChangeSerializer,
+    ComponentPatchSerializer,
+    ReleaseChangeSerializer,
+    ReleaseRestoreSerializer,
+    ReleaseSerializer,
+)
+from workflows.engine import Event, trigger_workflows
+from .exceptions import ReleaseConflict
+from .mixins import DynamicModelMixin, QueryMixin, ReleaseMixin, ViewMixin
+from .permissions import ModelPermission
+
+
+def get_layout(release):
     """
-    Returns the application information.
+    Return the published models of a release with their pages.
     """
+    models = release.get_syntax_definitions('modelschema', release=release, include_changes=False)
+    model_ids = [x['id'] for x in models]
 
-    def get(self, *args, **kwargs):
-        models = self.release.get_syntax_definitions(
-            'modelschema', release=self.release, include_changes=False
-        )
-        model_ids = [x['id'] for x in models]
+    pages = release.get_syntax_definitions(
+        'page', release=release, modelschema_id__in=model_ids, include_changes=False
+    )
 
-        pages = self.release.get_syntax_definitions(
-            'page', release=self.release, modelschema_id__in=model_ids, include_changes=False
-        )
+    for page in pages:
+        model_id = page['modelschema_id']
 
-        for page in pages:
-            model_id = page['modelschema_id']
+        model = [x for x in models if x['id'] == model_id][0]
 
-            model = [x for x in models if x['id'] == model_id][0]
+        if 'pages' in model:
+            model['pages'].append(page)
+        else:
+            model['pages'] = [page]
 
-            if 'pages' in model:
-                model['pages'].append(page)
-            else:
-                model['pages'] = [page]
+    return {'models': models}
 
-        data = {'models': models}
 
-        return Response(data)
+class LayoutAPIView(ReleaseMixin, APIView):
+    """
+    Returns the application information.
+    """
+
+    def get(self, *args, **kwargs):
+        return Response(get_layout(self.release))
 
 
-class DataAPIView(ViewMixin, APIView):
+class DataAPIView(DynamicModelMixin, ViewMixin, APIView):
     """
     API responsible for returning data for a specified model.
     """
 
-    @cached_property
-    def model(self):
-        model_schema = ModelSchema.objects.filter(name__iexact=self.kwargs.get('model')).first()
-
-        if model_schema:
-            return model_schema.as_model()
+    permission_classes = [ModelPermission]
 
     # ---------------------------------------------------------------------------------------------
     # Views
@@ -74,14 +95,15 @@ class DataAPIView(ViewMixin, APIView):
         return paginator.get_paginated_response(serializer.data)
 
     def detail(self):
-        resource = get_object_or_404(self.get_queryset(), id=self.object_id)
-        serializer = self.get_serializer(resource)
+        resource = self.get_object(fields=self.page_fields)
+        serializer = self.get_serializer(resource, fields=self.page_fields)
         return Response(serializer.data)
 
     def create(self):
         serializer = self.get_serializer(data=self.request.data)
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        self.record_change(Event.CREATE, serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def update(self):
@@ -90,6 +112,7 @@ class DataAPIView(ViewMixin, APIView):
         serializer = self.get_serializer(resource, data=self.request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        self.record_change(Event.UPDATE, serializer.data)
 
         if getattr(resource, '_prefetched_objects_cache', None):
             # If 'prefetch_related' has been applied to a queryset, we need to
@@ -105,41 +128,47 @@ class DataAPIView(ViewMixin, APIView):
             serializer = self.get_serializer(resource)
             return Response(serializer.data)
         else:
+            data = self.get_serializer(resource).data
             resource.delete()
+            self.record_change(Event.DELETE, data)
             return Response({})
 
-    # ---------------------------------------------------------------------------------------------
-    # Util methods
-    # ---------------------------------------------------------------------------------------------
-
-    def get_queryset(self):
-        queryset = self.model.objects.all()  # type: ignore
-
-        if params := self.query_params:
-            queryset = queryset.filter(**params)
-
-        queryset = self.order_queryset(queryset)
+    def record_change(self, event, data):
+        """
+        Record the change in the outbox, in the transaction of the write, and trigger workflows.
+        """
+        OutboxEvent.record(self.model_schema, event, [data])
+        trigger_workflows(self.release, self.model_schema.id, event, [data])
 
-        return queryset
 
-    def order_queryset(self, queryset):
-        return queryset.order_by('-created_at')
+class PageAPIView(DynamicModelMixin, QueryMixin, ReleaseMixin, APIView):
+    """
+    Returns everything required to render a page in one response: the page syntax and its data.
+    With an object id the page is given the object (e.g. an edit page), a list page is given the
+    first page of rows and other pages are given no data.
+    """
 
-    def get_serializer(self, *args, **kwargs):
-        serializer_class = self.generic_serializer()
-        kwargs.setdefault(
-            'context',
-            {'request': self.request, 'format': self.format_kwarg, 'view': self},
-        )
-        return serializer_class(*args, **kwargs)
+    permission_classes = [ModelPermission]
+
+    def get(self, request, *args, **kwargs):
+        if self.object_id:
+            resource = self.get_object(fields=self.page_fields)
+            data = self.get_serializer(resource, fields=self.page_fields).data
+        elif self.page_name == 'list':
+            queryset = self.get_queryset()
+            paginator = DataPagination()
+            rows = paginator.paginate_queryset(queryset, self.request, view=self)
+            data = paginator.get_paginated_response(self.get_serializer(rows, many=True).data).data
+        else:
+            data = None
 
-    def generic_serializer(self):
-        class GenericSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = self.model
-                fields = '__all__'
+        response_data = {
+            'release': ReleaseSerializer(self.release).data,
+            'page': self.page.syntax_json,
+            'data': data,
+        }
 
-        return GenericSerializer
+        return Response(response_data)
 
 
 class DeveloperAPIView(ViewMixin, APIView):
@@ -204,6 +233,63 @@ class DeveloperAPIView(ViewMixin, APIView):
         return Response(self._get_response_data(None), status=status.HTTP_200_OK)
 
 
+class DeveloperBatchAPIView(ReleaseMixin, APIView):
+    """
+    API to make many changes in the developer site at once. Takes a list of changes, each with a
+    change_type, model_type, syntax_json and (to update or delete) object_id. The changes are
+    validated, saved in one transaction and the result of each returned in order.
+    """
+
+    def post(self, request, *args, **kwargs):
+        serializer = BatchReleaseChangeSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            release_changes = ReleaseChange.bulk_save(
+                self.release,
+                [x['release_change'] for x in serializer.validated_data],
+                [x.get('object_id') for x in serializer.validated_data],
+            )
+        except StaleReleaseError as err:
+            raise ReleaseConflict(str(err)) from err
+
+        # Changes that cancelled out an unpublished object are returned as null.
+        data = [
+            {
+                'id': x.object_id,
+                'change_type': x.change_type,
+                'model_type': x.model_type,
+            }
+            if x
+            else None
+            for x in release_changes
+        ]
+
+        return Response(self._get_response_data(data), status=status.HTTP_200_OK)
+
+
+class DeveloperComponentAPIView(ReleaseMixin, APIView):
+    """
+    API to update the config of a single component of a page in the developer site, without
+    sending the whole layout of the page.
+    """
+
+    def patch(self, request, page_id, component_id, *args, **kwargs):
+        serializer = ComponentPatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            component = self.release.patch_page_component(
+                str(page_id), component_id, serializer.validated_data['config']
+            )
+        except ComponentNotFoundError as err:
+            raise NotFound(str(err)) from err
+        except StaleReleaseError as err:
+            raise ReleaseConflict(str(err)) from err
+
+        return Response(self._get_response_data(component), status=status.HTTP_200_OK)
+
+
 class UserViewSet(ReleaseMixin, ModelViewSet):
     """
     API viewset to manage user accounts.
@@ -237,18 +323,32 @@ class UserViewSet(ReleaseMixin, ModelViewSet):
 
         return Response({})
 
+    @action(detail=True, methods=['post'], url_path='add-groups')
+    def add_groups(self, request, pk=None):
+        return self._change_groups(request, pk, MembershipChange.ADD)
+
+    @action(detail=True, methods=['post'], url_path='remove-groups')
+    def remove_groups(self, request, pk=None):
+        return self._change_groups(request, pk, MembershipChange.REMOVE)
+
+    @action(detail=True, methods=['post'], url_path='set-groups')
+    def set_groups(self, request, pk=None):
+        return self._change_groups(request, pk, MembershipChange.SET)
+
+    def _change_groups(self, request, pk, change):
+        user = get_object_or_404(User.objects.all(), pk=pk)
+        serializer = GroupIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        return Response(change_user_groups(user, serializer.validated_data['group_ids'], change))
+
     @action(detail=True, methods=['get'])
     def permissions(self, request, pk=None):
         user = get_object_or_404(User.objects.all(), pk=pk)
-        user_groups = set(user.groups.all().values_list('id', flat=True))
-
-        permissions = self.release.get_syntax_definitions('permission')
-        permissions = [
-            permission
-            for permission in permissions
-            if str(user.id) in permission['users']
-            or len(set(permission['groups']).union(user_groups)) > 0
-        ]
+
+        permissions = self.release.get_syntax_definitions(
+            'permission', object_ids=PermissionIndex.get_permission_ids(self.release, user=user)
+        )
         return Response(permissions)
 
     @action(detail=True, methods=['post'], url_path='add-permission')
@@ -259,8 +359,15 @@ class UserViewSet(ReleaseMixin, ModelViewSet):
             'permission', object_id=request.data.get('permission_id')
         )
 
-        if str(user.id) not in permission.syntax_json['users']:
-            permission.syntax_json['users'].append(str(user.id))
+        if permission and str(user.id) not in permission['users']:
+            permission['users'].append(str(user.id))
+
+            self._create_release(
+                ReleaseChangeType.UPDATE,
+                model_type='permission',
+                syntax_json=permission,
+                object_id=permission['id'],
+            )
 
         return Response({})
 
@@ -272,8 +379,15 @@ class UserViewSet(ReleaseMixin, ModelViewSet):
             'permission', object_id=request.data.get('permission_id')
         )
 
-        if str(user.id) not in permission.syntax_json['users']:
-            permission.syntax_json['users'].append(str(user.id))
+        if permission and str(user.id) in permission['users']:
+            permission['users'].remove(str(user.id))
+
+            self._create_release(
+                ReleaseChangeType.UPDATE,
+                model_type='permission',
+                syntax_json=permission,
+                object_id=permission['id'],
+            )
 
         return Response({})
 
@@ -310,14 +424,33 @@ class GroupViewSet(ReleaseMixin, ModelViewSet):
 
         return Response({})
 
+    @action(detail=True, methods=['post'], url_path='add-users')
+    def add_users(self, request, pk=None):
+        return self._change_users(request, pk, MembershipChange.ADD)
+
+    @action(detail=True, methods=['post'], url_path='remove-users')
+    def remove_users(self, request, pk=None):
+        return self._change_users(request, pk, MembershipChange.REMOVE)
+
+    @action(detail=True, methods=['post'], url_path='set-users')
+    def set_users(self, request, pk=None):
+        return self._change_users(request, pk, MembershipChange.SET)
+
+    def _change_users(self, request, pk, change):
+        group = get_object_or_404(Group.objects.all(), pk=pk)
+        serializer = UserIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        return Response(change_group_users(group, serializer.validated_data['user_ids'], change))
+
     @action(detail=True, methods=['get'])
     def permissions(self, request, pk=None):
         group = get_object_or_404(Group.objects.all(), pk=pk)
 
-        permissions = self.release.get_syntax_definitions('permission')
-        permissions = [
-            permission for permission in permissions if group.id in permission['groups']
-        ]
+        permissions = self.release.get_syntax_definitions(
+            'permission',
+            object_ids=PermissionIndex.get_permission_ids(self.release, group_ids=[group.id]),
+        )
 
         return Response(permissions)
 
@@ -350,7 +483,7 @@ class GroupViewSet(ReleaseMixin, ModelViewSet):
         )
 
         if permission and group.id in permission['groups']:
-            permission['groups'].pop(group.id)
+            permission['groups'].remove(group.id)
 
             self._create_release(
                 ReleaseChangeType.UPDATE,
@@ -366,24 +499,63 @@ class ReleaseViewSet(ReleaseMixin, ViewSet):
     """
     API view to manage the releases for the application.
 
-    list: get release tree.
+    list: get release tree in tree order. A subtree can be fetched by passing the root release id
+          (root) and optionally the number of levels below it (depth). Passing page_num pages the
+          result.
     retrieve: get release model instance.
     publish: publish the current ReleaseChanges as a new Release.
+    diff: stream the objects that differ between a release and another release (compare_to) or
+          its pending ReleaseChanges.
     destroy: delete a release and all child releases.
+    restore: make a previous release the current release, reconciling the dynamic tables with the
+             changed modelschemas. Passing dry_run returns the schema plan without applying it.
+    export: get the application bundle of a release, merged with its pending ReleaseChanges when
+            include_changes is passed.
+    import: stage the changes that make the current release match an application bundle.
+
+    Safe requests are read from the read replica (see core.routers).
     """
 
     serializer_class = ReleaseSerializer
 
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        return read_replica(super().as_view(actions, **initkwargs))
+
     def list(self, request):
-        queryset = Release.objects.all().only(
-            'id',
-            'release_version',
-            'release_notes',
-            'released_at',
-            'released_by',
-            'current_release',
-            'parent',
+        queryset = Release.objects.all()
+
+        if root_id := request.query_params.get('root'):
+            root = get_object_or_404(Release.objects.all(), pk=root_id)
+            queryset = root.get_descendants(include_self=True)
+
+            if depth := request.query_params.get('depth'):
+                if not depth.isdigit():
+                    raise ParseError('depth must be a positive integer.')
+
+                queryset = queryset.filter(level__lte=root.level + int(depth))
+
+        queryset = (
+            queryset.only(
+                'id',
+                'release_version',
+                'release_notes',
+                'released_at',
+                'released_by',
+                'current_release',
+                'parent',
+            )
+            .annotate(release_change_count=Count('release_changes'))
+            .order_by('tree_id', 'lft')
         )
+
+        paginator = ReleasePagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+
+        if page is not None:
+            serializer = self.serializer_class(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
         serializer = self.serializer_class(queryset, many=True)
         return Response(serializer.data)
 
@@ -394,10 +566,48 @@ class ReleaseViewSet(ReleaseMixin, ViewSet):
         return Response(serializer.data)
 
     def destroy(self, request, pk=None):
-        instance = self.get_object()
+        instance = get_object_or_404(Release.objects.all(), pk=pk)
+
+        if instance.get_descendants(include_self=True).filter(current_release=True).exists():
+            raise ReleaseConflict('The current release and its ancestors cannot be deleted.')
+
         instance.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @action(detail=True, methods=['post'])
+    def restore(self, request, pk=None):
+        release = get_object_or_404(Release.objects.all(), pk=pk)
+        options = ReleaseRestoreSerializer(data=request.data)
+        options.is_valid(raise_exception=True)
+
+        try:
+            plan = release.restore(dry_run=options.validated_data['dry_run'])
+        except PendingChangesError as err:
+            raise ReleaseConflict(str(err)) from err
+
+        serializer = self.serializer_class(release)
+        return Response({'release': serializer.data, 'plan': plan})
+
+    @action(detail=True, methods=['get'], url_path='export')
+    def export_bundle(self, request, pk=None):
+        release = get_object_or_404(Release.objects.all(), pk=pk)
+        bundle = export_bundle(
+            release, include_changes=bool(request.query_params.get('include_changes'))
+        )
+
+        return Response(bundle)
+
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_bundle(self, request):
+        try:
+            counts = import_bundle(self.release, request.data)
+        except DjangoValidationError as err:
+            raise ValidationError({'bundle': err.messages})
+        except (PendingChangesError, StaleReleaseError) as err:
+            raise ReleaseConflict(str(err)) from err
+
+        return Response(self._get_response_data(counts))
+
     @action(detail=False, methods=['get'], url_path='current')
     def current_release(self, request):
         release_change_count = self.release.release_changes.count()
@@ -412,6 +622,24 @@ class ReleaseViewSet(ReleaseMixin, ViewSet):
         serializer = ReleaseChangeSerializer(release_changes, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['get'])
+    def diff(self, request, pk=None):
+        """
+        The diff is streamed as newline delimited JSON, one changed object per line.
+        """
+        release = get_object_or_404(Release.objects.all(), pk=pk)
+
+        if compare_to := request.query_params.get('compare_to'):
+            target = get_object_or_404(Release.objects.all(), pk=compare_to)
+            entries = diff_releases(release, target)
+        else:
+            entries = diff_release_changes(release)
+
+        return StreamingHttpResponse(
+            (json.dumps(entry) + '\n' for entry in entries),
+            content_type='application/x-ndjson',
+        )
+
     @action(detail=False, methods=['post'])
     def publish(self, request):
         if not self.release.release_changes.all().exists():
@@ -420,13 +648,17 @@ class ReleaseViewSet(ReleaseMixin, ViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        release = Release.objects.create(
-            parent=self.release,
-            release_version=''.join(
-                random.choice(string.ascii_uppercase + string.digits) for _ in range(5)
-            ),
-            release_notes='',
-            released_by=User.objects.all()[0],
-        )
+        try:
+            release = Release.objects.create(
+                parent=self.release,
+                release_version=''.join(
+                    random.choice(string.ascii_uppercase + string.digits) for _ in range(5)
+                ),
+                release_notes='',
+                released_by=User.objects.all()[0],
+            )
+        except StaleReleaseError as err:
+            raise ReleaseConflict(str(err)) from err
+
         serializer = self.serializer_class(release)
         return Response(serializer.data)
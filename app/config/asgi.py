@@ -1,7 +1,8 @@
 """
 ASGI config for config project.
 
-It exposes the ASGI callable as a module-level variable named ``application``.
+It exposes the ASGI callable as a module-level variable named ``application``. Live event streams
+are served by the live app, everything else by Django.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.0/howto/deployment/asgi/
@@ -13,4 +14,15 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from live.asgi import LIVE_PATH, LiveEventsApp  # noqa: E402
+
+live_application = LiveEventsApp()
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'http' and scope['path'] == LIVE_PATH:
+        await live_application(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
@@ -13,4 +13,8 @@ app.conf.beat_schedule = {
         'task': 'post_office.tasks.send_queued_mail',
         'schedule': 600.0,
     },
+    'drain-outbox': {
+        'task': 'db.tasks.drain_outbox',
+        'schedule': float(os.environ.get('OUTBOX_DRAIN_INTERVAL', 5)),
+    },
 }
@@ -39,6 +39,7 @@ INSTALLED_APPS = [
     'packages',
     'syntax',
     'workflows',
+    'live',
 ]
 
 MIDDLEWARE = [
@@ -48,6 +49,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ReplicaStickyMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -74,9 +76,13 @@ WSGI_APPLICATION = 'config.wsgi.application'
 
 # Cache
 
+# The cache holds the users and permissions that authorise requests (see accounts.cache), so every
+# process must share it: a permission revoked in one process would still be granted by the others
+# from a cache local to each process.
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('CACHE_REDIS_URL'),
     },
 }
 
@@ -129,17 +135,69 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-        'rest_framework.authentication.BasicAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     # 'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     # 'PAGE_SIZE': 100,
 }
 
+# Basic authentication hashes the password on every request. Disable it in production with
+# BASIC_AUTHENTICATION=false.
+if os.environ.get('BASIC_AUTHENTICATION', 'true').lower() in ('1', 'true', 'yes'):
+    REST_FRAMEWORK['DEFAULT_AUTHENTICATION_CLASSES'].insert(
+        1, 'rest_framework.authentication.BasicAuthentication'
+    )
+
 
 # JWT
 
 JWT_AUTH = {
     'JWT_RESPONSE_PAYLOAD_HANDLER': 'accounts.utils.jwt_response_handler',
 }
+
+
+# Celery
+
+CELERY_TASK_ROUTES = {
+    'workflows.tasks.*': {'queue': 'workflows'},
+}
+# Workers reserve one task at a time so quick tasks are not held behind long running ones.
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
+
+# Database connections
+
+# Seconds between the health checks of a persistent connection.
+DB_HEALTH_CHECK_INTERVAL = int(os.environ.get('DB_HEALTH_CHECK_INTERVAL', 30))
+# Run the hot queries of dynamic models as prepared statements (see db.prepared). Measure with the
+# benchmark command before enabling, and never enable behind a transaction pooler.
+DB_PREPARED_STATEMENTS = os.environ.get('DB_PREPARED_STATEMENTS', 'false').lower() == 'true'
+# Prepared statements kept per connection.
+DB_PREPARED_STATEMENTS_MAX = 100
+
+
+# Read replica
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+# Seconds the reads of a user stay on the default database after a write, to cover replication lag.
+REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 10))
+
+
+# Live events
+
+LIVE_REDIS_URL = os.environ.get('LIVE_REDIS_URL')
+# Seconds between the keepalive comments of idle event streams.
+LIVE_KEEPALIVE = 15
+LIVE_QUEUE_SIZE = 100
+
+
+# Outbox
+
+OUTBOX_BATCH_SIZE = int(os.environ.get('OUTBOX_BATCH_SIZE', 500))
+
+
+# Workflows
+
+WORKFLOW_BATCH_SIZE = int(os.environ.get('WORKFLOW_BATCH_SIZE', 100))
+WORKFLOW_MAX_RETRIES = 3
@@ -0,0 +1,28 @@
+from django.apps import AppConfig
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+
+    def ready(self):
+        from .connections import check_connections, mark_checked
+
+        connection_created.connect(mark_checked)
+        request_started.connect(check_connections)
+
+        check_cache()
+
+
+def check_cache():
+    """
+    Fail on start up rather than on the first request when the shared cache is not configured.
+    """
+    cache = settings.CACHES['default']
+
+    if cache['BACKEND'].endswith('.RedisCache') and not cache.get('LOCATION'):
+        raise ImproperlyConfigured('The default cache requires CACHE_REDIS_URL to be set.')
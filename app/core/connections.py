@@ -0,0 +1,32 @@
+"""
+Health checks of persistent database connections (CONN_MAX_AGE).
+
+A persistent connection may have been closed by the server, e.g. on a restart or failover, since
+it was last used, which Django 4.0 only notices when a query fails. When a request starts, open
+connections are checked at most every DB_HEALTH_CHECK_INTERVAL seconds and closed if unusable, so
+the request opens a new one.
+"""
+import time
+
+from django.conf import settings
+from django.db import connections
+
+
+def mark_checked(sender, connection, **kwargs):
+    connection.health_checked_at = time.monotonic()
+
+
+def check_connections(**kwargs):
+    now = time.monotonic()
+
+    for connection in connections.all():
+        if connection.connection is None or connection.in_atomic_block:
+            continue
+
+        if now - getattr(connection, 'health_checked_at', 0) < settings.DB_HEALTH_CHECK_INTERVAL:
+            continue
+
+        connection.health_checked_at = now
+
+        if not connection.is_usable():
+            connection.close()
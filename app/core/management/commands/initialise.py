@@ -53,7 +53,7 @@ class Command(BaseCommand):
 
         author_modelschema_id = (
             ReleaseSyntax.objects.filter(
-                model_type='modelschema', syntax_json__model_name='Author'
+                model_type='modelschema', blob__syntax_json__model_name='Author'
             )
             .first()
             .syntax_json['id']
@@ -87,7 +87,9 @@ class Command(BaseCommand):
         )
 
         book_modelschema_id = (
-            ReleaseSyntax.objects.filter(model_type='modelschema', syntax_json__model_name='Book')
+            ReleaseSyntax.objects.filter(
+                model_type='modelschema', blob__syntax_json__model_name='Book'
+            )
             .first()
             .syntax_json['id']
         )
@@ -142,7 +144,7 @@ class Command(BaseCommand):
                 'page_name': 'list',
                 'modelschema_id': str(
                     ReleaseSyntax.objects.filter(
-                        model_type='modelschema', syntax_json__model_name='Book'
+                        model_type='modelschema', blob__syntax_json__model_name='Book'
                     )
                     .first()
                     .syntax_json['id']
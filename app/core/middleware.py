@@ -0,0 +1,29 @@
+from rest_framework.permissions import SAFE_METHODS
+
+from .routers import stick_to_primary
+
+
+class ReplicaStickyMiddleware:
+    """
+    Sends the reads of a user to the default database for a while after a successful write, so
+    their reads are not served by a replica that has not caught up (see core.routers).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        # The REST framework sets the user it authenticates on the request.
+        user = getattr(request, 'user', None)
+
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and user is not None
+            and user.is_authenticated
+        ):
+            stick_to_primary(user.pk)
+
+        return response
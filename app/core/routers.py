@@ -0,0 +1,122 @@
+"""
+Routing of read-only API traffic to a read replica.
+
+Views decorated with read_replica read from the replica database for safe requests, unless the
+user wrote within the last REPLICA_STICKY_SECONDS (see core.middleware), so users always read their
+own writes despite replication lag. The writes are marked in the cache shared by every process, as
+the next request of a user is often served by another process. Without a replica database
+configured every query goes to the default database.
+"""
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from accounts.authentication import CachedJWTAuthentication
+
+REPLICA_DATABASE = 'replica'
+
+_use_read_replica = ContextVar('use_read_replica', default=False)
+
+
+@contextmanager
+def use_read_replica():
+    """
+    Send the reads made in the context to the read replica.
+    """
+    token = _use_read_replica.set(True)
+
+    try:
+        yield
+    finally:
+        _use_read_replica.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _use_read_replica.get() and REPLICA_DATABASE in settings.DATABASES:
+            return REPLICA_DATABASE
+
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the default database.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPLICA_DATABASE:
+            return False
+
+        return None
+
+
+def sticky_cache_key(user_id):
+    return f'replica:sticky:{user_id}'
+
+
+def stick_to_primary(user_id):
+    """
+    Send the reads of the user to the default database until the replica has caught up with their
+    write.
+    """
+    cache.set(sticky_cache_key(user_id), True, settings.REPLICA_STICKY_SECONDS)
+
+
+def is_sticky(user_id):
+    return user_id is not None and cache.get(sticky_cache_key(user_id), False)
+
+
+def get_user_id(request):
+    """
+    Return the id of the user of a request before the view authenticates it, from the session or
+    the claims of the access token.
+    """
+    if request.user.is_authenticated:
+        return request.user.pk
+
+    authentication = CachedJWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+
+    if raw_token is None:
+        return None
+
+    try:
+        return authentication.get_validated_token(raw_token).get(api_settings.USER_ID_CLAIM)
+    except (InvalidToken, TokenError):
+        return None
+
+
+def read_replica(view):
+    """
+    Serve the safe requests of a view from the read replica, outside a transaction. Other requests
+    are served from the default database, in a transaction when ATOMIC_REQUESTS is set.
+    """
+
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        safe = request.method in SAFE_METHODS
+        connection = connections[DEFAULT_DB_ALIAS]
+
+        # Within an enclosing transaction a safe request still gets a savepoint, so the rollback of
+        # a failed request does not roll back the enclosing transaction.
+        atomic = connection.settings_dict['ATOMIC_REQUESTS'] and (
+            not safe or connection.in_atomic_block
+        )
+        replica = safe and not is_sticky(get_user_id(request))
+
+        with transaction.atomic() if atomic else nullcontext():
+            with use_read_replica() if replica else nullcontext():
+                return view(request, *args, **kwargs)
+
+    return transaction.non_atomic_requests(wrapped)
@@ -0,0 +1,17 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from core.apps import check_cache
+
+REDIS_CACHE = 'django.core.cache.backends.redis.RedisCache'
+
+
+class CheckCacheTest(SimpleTestCase):
+    @override_settings(CACHES={'default': {'BACKEND': REDIS_CACHE, 'LOCATION': None}})
+    def test_missing_location(self):
+        with self.assertRaises(ImproperlyConfigured):
+            check_cache()
+
+    @override_settings(CACHES={'default': {'BACKEND': REDIS_CACHE, 'LOCATION': 'redis://redis'}})
+    def test_location(self):
+        check_cache()
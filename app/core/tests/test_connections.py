@@ -0,0 +1,34 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from ..connections import check_connections
+
+
+@override_settings(DB_HEALTH_CHECK_INTERVAL=30)
+class CheckConnectionsTest(SimpleTestCase):
+    def check(self, usable, health_checked_at=0):
+        connection = mock.Mock(in_atomic_block=False, health_checked_at=health_checked_at)
+        connection.is_usable.return_value = usable
+
+        with mock.patch('core.connections.connections') as connections:
+            connections.all.return_value = [connection]
+            check_connections()
+
+        return connection
+
+    def test_unusable_closed(self):
+        connection = self.check(usable=False)
+
+        connection.close.assert_called_once()
+
+    def test_usable_kept(self):
+        connection = self.check(usable=True)
+
+        connection.close.assert_not_called()
+
+    def test_checked_at_interval(self):
+        with mock.patch('core.connections.time.monotonic', return_value=100):
+            connection = self.check(usable=False, health_checked_at=90)
+
+        connection.is_usable.assert_not_called()
@@ -0,0 +1,126 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from accounts.tests.test_cache import SHARED_CACHES
+from syntax.models import Release
+from ..middleware import ReplicaStickyMiddleware
+from ..routers import REPLICA_DATABASE, ReplicaRouter, is_sticky, read_replica, use_read_replica
+
+
+class ReplicaRouterTest(SimpleTestCase):
+    def test_db_for_read(self):
+        router = ReplicaRouter()
+
+        with use_read_replica():
+            self.assertIsNone(router.db_for_read(Release))
+
+        with mock.patch.dict(settings.DATABASES, {REPLICA_DATABASE: {}}):
+            self.assertIsNone(router.db_for_read(Release))
+
+            with use_read_replica():
+                self.assertEqual(REPLICA_DATABASE, router.db_for_read(Release))
+                self.assertEqual(DEFAULT_DB_ALIAS, router.db_for_write(Release))
+
+    def test_allow_migrate(self):
+        self.assertFalse(ReplicaRouter().allow_migrate(REPLICA_DATABASE, 'syntax'))
+        self.assertIsNone(ReplicaRouter().allow_migrate(DEFAULT_DB_ALIAS, 'syntax'))
+
+
+class ReadReplicaTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('alice@example.com', 'password')
+        self.factory = RequestFactory(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}'
+        )
+        self.calls = []
+
+        @read_replica
+        def view(request):
+            self.calls.append(ReplicaRouter().db_for_read(Release) == REPLICA_DATABASE)
+            return HttpResponse()
+
+        self.view = view
+        self.replica = mock.patch.dict(settings.DATABASES, {REPLICA_DATABASE: {}})
+        self.replica.start()
+        self.addCleanup(self.replica.stop)
+
+    def tearDown(self):
+        cache.clear()
+
+    def request(self, method):
+        request = getattr(self.factory, method)('/')
+        request.user = AnonymousUser()
+        return self.view(request)
+
+    def test_read_replica(self):
+        self.request('get')
+        self.request('post')
+
+        self.assertListEqual([True, False], self.calls)
+        # The view makes its own transactions rather than one per request.
+        self.assertTrue(self.view._non_atomic_requests)
+
+    def test_sticky_after_write(self):
+        request = self.factory.post('/')
+        request.user = self.user
+        ReplicaStickyMiddleware(lambda request: HttpResponse())(request)
+
+        self.assertTrue(is_sticky(self.user.pk))
+
+        self.request('get')
+
+        self.assertListEqual([False], self.calls)
+
+    def test_failed_write_not_sticky(self):
+        request = self.factory.post('/')
+        request.user = self.user
+        ReplicaStickyMiddleware(lambda request: HttpResponse(status=400))(request)
+
+        self.assertFalse(is_sticky(self.user.pk))
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class ReadYourWritesTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('createcachetable', verbosity=0)
+
+    def setUp(self):
+        Release.objects.create(release_version='0', release_notes='')
+        user = User.objects.create_superuser('admin@example.com', 'password')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+
+        patcher = mock.patch('core.routers.use_read_replica', wraps=use_read_replica)
+        self.use_read_replica = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_layout(self):
+        """
+        Return whether the layout was read from the replica.
+        """
+        self.use_read_replica.reset_mock()
+        self.assertEqual(200, self.client.get('/internal-api/application/layout/').status_code)
+
+        return self.use_read_replica.called
+
+    def test_reads_after_write_on_primary(self):
+        self.assertTrue(self.get_layout())
+
+        # The write is served by another process, which has its own connection to the cache.
+        with mock.patch('core.routers.cache', caches.create_connection('default')):
+            response = self.client.post('/internal-api/developer/group/', {'name': 'Editors'})
+
+        self.assertEqual(201, response.status_code)
+        self.assertFalse(self.get_layout())
@@ -1,4 +1,5 @@
 from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils.text import slugify
 
@@ -198,3 +199,45 @@ class FieldSchema(BaseModel):
             # Will not exist if the field has not been added to the model yet.
             field = None
         return model, field
+
+
+class OutboxEvent(models.Model):
+    """
+    Transactional outbox of changes to the rows of dynamic models. Events are written in the same
+    transaction as the change and drained in id order by a worker (see db.outbox), so subscribers
+    receive every committed change, in order, without polling the dynamic tables.
+    """
+
+    class EventType(models.TextChoices):
+        CREATE = 'create'
+        UPDATE = 'update'
+        DELETE = 'delete'
+
+    modelschema_id = models.UUIDField()
+    model_name = models.CharField(max_length=32)
+    event = models.CharField(max_length=10, choices=EventType.choices)
+    object_id = models.CharField(max_length=36)
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.event} {self.model_name} {self.object_id}'
+
+    @classmethod
+    def record(cls, model_schema, event, rows):
+        """
+        Record an event for each of the given serialized rows with a single insert.
+        """
+        return cls.objects.bulk_create(
+            [
+                cls(
+                    modelschema_id=model_schema.id,
+                    model_name=model_schema.name,
+                    event=event,
+                    object_id=str(row['id']),
+                    data=row,
+                )
+                for row in rows
+            ],
+            batch_size=1000,
+        )
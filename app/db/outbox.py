@@ -0,0 +1,72 @@
+"""
+Delivery of the OutboxEvents of dynamic model changes to subscribers.
+
+Subscribers are registered with @subscribe and called with each batch of events in id order, e.g.
+to invalidate caches or send webhooks. Events are deleted once every subscriber has handled the
+batch, in the same transaction, so a subscriber that raises leaves the batch to be delivered again
+by the next drain (delivery is at least once).
+
+Ids are assigned when an event is inserted, not when its transaction commits, so an event may
+become visible after events with higher ids were delivered. No id watermark is kept: each batch
+is the oldest of the events left in the table, so such an event is delivered by a later batch.
+Events of the same row are still delivered in order, as the row lock held by the change that
+recorded an event is only released when its transaction commits.
+"""
+from django.conf import settings
+from django.db import connection, transaction
+
+from .models import OutboxEvent
+
+# Application wide key of the advisory lock held while a batch is drained.
+DRAIN_LOCK_KEY = 62342108
+
+SUBSCRIBERS = []
+
+
+def subscribe(subscriber):
+    SUBSCRIBERS.append(subscriber)
+    return subscriber
+
+
+def _drain_batch(batch_size):
+    """
+    Deliver the oldest batch of events, returning the number delivered. Returns None if another
+    drain holds the lock. Only one batch is in flight at a time so batches are delivered in order.
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_try_advisory_xact_lock(%s)', [DRAIN_LOCK_KEY])
+
+            if not cursor.fetchone()[0]:
+                return None
+
+        events = list(OutboxEvent.objects.order_by('id')[:batch_size])
+
+        if events:
+            for subscriber in SUBSCRIBERS:
+                subscriber(events)
+
+            OutboxEvent.objects.filter(id__in=[x.id for x in events]).delete()
+
+        return len(events)
+
+
+def drain(batch_size=None, max_batches=None):
+    """
+    Deliver the outbox in batches until it is empty (or max_batches have been delivered),
+    returning the number of events delivered.
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    delivered = 0
+    batches = 0
+
+    while max_batches is None or batches < max_batches:
+        count = _drain_batch(batch_size)
+
+        if not count:
+            break
+
+        delivered += count
+        batches += 1
+
+    return delivered
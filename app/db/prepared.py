@@ -0,0 +1,161 @@
+"""
+Server-side prepared statements for the hot queries of dynamic models.
+
+The SQL of a query is prepared once per database connection with PREPARE and then run with
+EXECUTE, so Postgres parses and plans it once rather than on every request. Statements live as long
+as the connection, so they pay off with persistent connections (CONN_MAX_AGE), and mostly for
+queries that are expensive to plan. They do not work through a transaction pooler (e.g. PgBouncer
+in transaction mode). Enabled with DB_PREPARED_STATEMENTS=true.
+"""
+import hashlib
+import logging
+import re
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER_RE = re.compile(r'%%|%s')
+
+
+@receiver(connection_created)
+def reset_prepared_statements(sender, connection, **kwargs):
+    """
+    A new connection has no prepared statements.
+    """
+    connection.prepared_statements = OrderedDict()
+
+
+def _positional_sql(sql):
+    """
+    Return the SQL with its %s placeholders numbered as the $n parameters of a prepared statement.
+    """
+    count = 0
+
+    def replace(match):
+        nonlocal count
+
+        if match.group() == '%%':
+            return '%'
+
+        count += 1
+        return f'${count}'
+
+    return PLACEHOLDER_RE.sub(replace, sql)
+
+
+def prepare(connection, sql, key=''):
+    """
+    Return the name of the statement prepared for the SQL on the connection, preparing it on first
+    use, or None if Postgres cannot prepare it (e.g. a parameter of unknown type). The least
+    recently used statements are deallocated beyond DB_PREPARED_STATEMENTS_MAX.
+    """
+    statements = connection.__dict__.setdefault('prepared_statements', OrderedDict())
+    name = 'dm_' + hashlib.md5(f'{key}:{sql}'.encode(), usedforsecurity=False).hexdigest()
+
+    if name in statements:
+        statements.move_to_end(name)
+        return name if statements[name] else None
+
+    try:
+        # A savepoint keeps a failed PREPARE from aborting the transaction.
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(f'PREPARE {name} AS {_positional_sql(sql)}')
+    except DatabaseError:
+        logger.warning('Could not prepare %s', sql, exc_info=True)
+        statements[name] = False
+        return None
+
+    statements[name] = True
+
+    while len(statements) > settings.DB_PREPARED_STATEMENTS_MAX:
+        evicted, prepared = statements.popitem(last=False)
+
+        if prepared:
+            with connection.cursor() as cursor:
+                cursor.execute(f'DEALLOCATE {evicted}')
+
+    return name
+
+
+def execute_sql(name, param_count):
+    if not param_count:
+        return f'EXECUTE {name}'
+
+    return f'EXECUTE {name}({", ".join(["%s"] * param_count)})'
+
+
+class PreparedQuerySet:
+    """
+    A lazy sequence of the objects of a queryset for a Paginator, counting and slicing it with
+    prepared statements. The limit and offset are parameters, so every page of a query runs the
+    same statement. Querysets with annotations, select_related or prefetch_related are not
+    supported.
+    """
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+        self.model = queryset.model
+        self.db = queryset.db
+        # A model rebuilt after a schema change may return different columns for the same SQL.
+        self.key = f'{self.model._meta.db_table}:{getattr(self.model, "_declared", "")}'
+
+    @property
+    def connection(self):
+        return connections[self.db]
+
+    def count(self):
+        sql, params = self.queryset.order_by().query.get_compiler(self.db).as_sql()
+        name = prepare(self.connection, f'SELECT COUNT(*) FROM ({sql}) subquery', self.key)
+
+        if name is None:
+            return self.queryset.count()
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(execute_sql(name, len(params)), params)
+            return cursor.fetchone()[0]
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, k):
+        if not isinstance(k, slice) or k.step is not None or k.stop is None:
+            return self.queryset[k]
+
+        start = k.start or 0
+        compiler = self.queryset.query.get_compiler(self.db)
+        sql, params = compiler.as_sql()
+        name = prepare(self.connection, f'{sql} LIMIT %s OFFSET %s', self.key)
+
+        if name is None:
+            return list(self.queryset[k])
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                execute_sql(name, len(params) + 2), [*params, max(k.stop - start, 0), start]
+            )
+            rows = cursor.fetchall()
+
+        # Build the objects from the rows as a queryset does (see ModelIterable).
+        select_fields = compiler.klass_info['select_fields']
+        fields_start, fields_end = select_fields[0], select_fields[-1] + 1
+        init_list = [x[0].target.attname for x in compiler.select[fields_start:fields_end]]
+
+        return [
+            self.model.from_db(self.db, init_list, row[fields_start:fields_end])
+            for row in compiler.results_iter([rows])
+        ]
+
+    @classmethod
+    def supports(cls, queryset):
+        return (
+            settings.DB_PREPARED_STATEMENTS
+            and connections[queryset.db].vendor == 'postgresql'
+            and not queryset.query.select_related
+            and not queryset.query.annotation_select
+            and not queryset._prefetch_related_lookups
+        )
@@ -1,10 +1,14 @@
 from rest_framework import serializers
 
 from layout.models import Page
-from syntax._old.utils import replace_syntax
+from syntax.template import Template
 from .constants import MODEL_DEFAULT_PAGES
 from .models import FieldSchema, ModelSchema
 
+DEFAULT_PAGE_TEMPLATES = {
+    page_name: Template(definition) for page_name, definition in MODEL_DEFAULT_PAGES.items()
+}
+
 
 class ModelSchemaSerializer(serializers.ModelSerializer):
     """
@@ -18,13 +22,11 @@ class ModelSchemaSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         model_schema = ModelSchema.objects.create(name=validated_data['name'])
 
-        for page_name, definition in MODEL_DEFAULT_PAGES.items():
+        for page_name, template in DEFAULT_PAGE_TEMPLATES.items():
             # Replace ${model} with name of this model.
-            parsed_syntax = replace_syntax(definition, '${model}', model_schema.model_name_lower)
-
             Page.objects.create(
                 page_name=page_name,
-                layout=parsed_syntax,
+                layout=template.render({'model': model_schema.model_name_lower}),
                 model_schema=model_schema,
             )
 
@@ -0,0 +1,11 @@
+from celery import shared_task
+
+from . import outbox
+
+
+@shared_task(ignore_result=True)
+def drain_outbox():
+    """
+    Deliver the pending outbox events to the subscribers. Run periodically by celery beat.
+    """
+    return outbox.drain()
@@ -0,0 +1,71 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from api.tests.test_data import DATA_URL, AuthorTestCase
+
+from .. import outbox
+from ..models import OutboxEvent
+
+
+class OutboxTest(AuthorTestCase):
+    def test_data_api_records_events(self):
+        response = self.client.post(DATA_URL, {'name': 'Ann', 'biography': '', 'notes': ''})
+        object_id = response.data['id']
+        self.client.patch(f'{DATA_URL}{object_id}/', {'name': 'Anne'})
+        self.client.delete(f'{DATA_URL}{object_id}/')
+
+        events = OutboxEvent.objects.order_by('id')
+
+        self.assertListEqual(['create', 'update', 'delete'], [x.event for x in events])
+        self.assertTrue(all(x.object_id == object_id for x in events))
+        self.assertEqual('Anne', events[1].data['name'])
+
+
+class DrainTest(TestCase):
+    def setUp(self):
+        self.schema = mock.Mock(id='00000000-0000-0000-0000-000000000001')
+        self.schema.name = 'Author'
+        OutboxEvent.record(self.schema, 'create', [{'id': i} for i in range(5)])
+
+        self.batches = []
+        subscribers = mock.patch.object(outbox, 'SUBSCRIBERS', [self.batches.append])
+        subscribers.start()
+        self.addCleanup(subscribers.stop)
+
+    def test_drain(self):
+        self.assertEqual(5, outbox.drain(batch_size=2))
+
+        self.assertListEqual(
+            [['0', '1'], ['2', '3'], ['4']],
+            [[x.object_id for x in batch] for batch in self.batches],
+        )
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_max_batches(self):
+        self.assertEqual(2, outbox.drain(batch_size=2, max_batches=1))
+        self.assertEqual(3, OutboxEvent.objects.count())
+
+    def test_subscriber_error_keeps_events(self):
+        outbox.SUBSCRIBERS.append(mock.Mock(side_effect=RuntimeError))
+
+        with self.assertRaises(RuntimeError):
+            outbox.drain(batch_size=2)
+
+        self.assertEqual(5, OutboxEvent.objects.count())
+
+    def test_late_commit_delivered(self):
+        # An event with a lower id whose transaction has not committed yet is not visible.
+        late = OutboxEvent.objects.order_by('id')[1]
+        OutboxEvent.objects.filter(id=late.id).delete()
+
+        self.assertEqual(4, outbox.drain(batch_size=2))
+
+        late.save(force_insert=True)
+
+        self.assertEqual(1, outbox.drain(batch_size=2))
+        self.assertEqual(late.id, self.batches[-1][0].id)
+        self.assertListEqual(
+            [['0', '2'], ['3', '4'], ['1']],
+            [[x.object_id for x in batch] for batch in self.batches],
+        )
@@ -0,0 +1,64 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from api.tests.test_data import DATA_URL, AuthorTestCase
+
+from ..prepared import PreparedQuerySet, prepare
+
+
+def prepared_statement_count():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM pg_prepared_statements WHERE name LIKE 'dm\\_%%'")
+        return cursor.fetchone()[0]
+
+
+@override_settings(DB_PREPARED_STATEMENTS=True)
+class PreparedQuerySetTest(AuthorTestCase):
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(self.deallocate)
+
+    def deallocate(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DEALLOCATE ALL')
+
+        connection.prepared_statements.clear()
+
+    def test_list(self):
+        for name in ['Ann', 'Bob']:
+            self.model.objects.create(name=name, biography='', notes='')
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(DATA_URL, {'page_size': 2})
+
+        self.assertEqual(3, response.data['count'])
+        self.assertListEqual(['Bob', 'Ann'], [x['name'] for x in response.data['results']])
+        self.assertEqual(2, len([x for x in context.captured_queries if 'PREPARE' in x['sql']]))
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(DATA_URL, {'page_size': 2, 'page_num': 2})
+
+        self.assertListEqual(['Jane'], [x['name'] for x in response.data['results']])
+        # Every page of a query runs the same statements.
+        self.assertFalse([x for x in context.captured_queries if 'PREPARE' in x['sql']])
+        self.assertEqual(2, prepared_statement_count())
+
+    def test_filter(self):
+        response = self.client.get(DATA_URL, {'name': 'Jane'})
+
+        self.assertEqual(1, response.data['count'])
+        self.assertEqual(str(self.author.id), response.data['results'][0]['id'])
+
+    @override_settings(DB_PREPARED_STATEMENTS_MAX=1)
+    def test_deallocate(self):
+        PreparedQuerySet(self.model.objects.order_by('name'))[0:10]
+        PreparedQuerySet(self.model.objects.order_by('-name'))[0:10]
+
+        self.assertEqual(1, prepared_statement_count())
+
+    def test_unpreparable(self):
+        with self.assertLogs('db.prepared', 'WARNING'):
+            self.assertIsNone(prepare(connection, 'SELECT %s + %s', 'unknown'))
+
+        self.assertEqual(1, PreparedQuerySet(self.model.objects.all()).count())
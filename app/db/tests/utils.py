@@ -1,8 +1,25 @@
 from contextlib import contextmanager
 
+from django.apps import apps
+from django.core.cache import cache
 from django.core.exceptions import FieldDoesNotExist
 from django.db import connection
 
+from ..models import FieldSchema, ModelSchema, OutboxEvent
+from .fixtures import TEST_APP_LABEL
+
+
+def clear_dynamic_models():
+    """
+    The app registry bleeds between tests. Remove all dynamically declared models, for use in the
+    tearDown of tests that create ModelSchemas.
+    """
+    apps.all_models[TEST_APP_LABEL].clear()
+    apps.register_model(TEST_APP_LABEL, ModelSchema)
+    apps.register_model(TEST_APP_LABEL, FieldSchema)
+    apps.register_model(TEST_APP_LABEL, OutboxEvent)
+    cache.clear()
+
 
 def db_table_exists(table_name):
     with _db_cursor() as c:
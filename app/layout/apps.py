@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class LayoutConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'layout'
+
+    def ready(self):
+        from .registry import layouts
+
+        layouts.load()
@@ -0,0 +1,99 @@
+"""
+In-memory registry of the developer site skeleton layouts (layout/layouts/*.json).
+
+Layouts are loaded and validated once at startup so serving a developer page does no disk I/O.
+When DEBUG is on, files are reloaded when their modification time changes.
+"""
+import copy
+import json
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Mapping
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+LAYOUTS_DIR = Path(__file__).resolve().parent / 'layouts'
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    elif isinstance(value, list):
+        return tuple(_freeze(x) for x in value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    elif isinstance(value, tuple):
+        return [_thaw(x) for x in value]
+    return copy.copy(value)
+
+
+def validate_layout(name: str, layouts) -> None:
+    """
+    Check a layout file is an object of pages, where the layout of each page is a list of
+    components.
+    """
+    if not isinstance(layouts, dict):
+        raise ImproperlyConfigured(f"Layout file '{name}' must contain a JSON object")
+
+    for page_name, page in layouts.items():
+        if isinstance(page, dict) and not isinstance(page.get('layout', []), list):
+            raise ImproperlyConfigured(f"Layout '{page_name}' in '{name}' must be a list")
+
+
+class LayoutRegistry:
+    def __init__(self, path: Path = LAYOUTS_DIR):
+        self.path = path
+        self._layouts = MappingProxyType({})
+        self._mtimes = {}
+
+    def load(self) -> None:
+        """
+        Load every layout file whose modification time has changed since the last load. Hidden
+        files (e.g. the manifest of the parse command) are not layouts.
+        """
+        layouts = dict(self._layouts)
+        mtimes = {}
+
+        for file in sorted(self.path.glob('*.json')):
+            if file.name.startswith('.'):
+                continue
+
+            name = file.name[: -len('.json')]
+            mtimes[name] = file.stat().st_mtime
+
+            if self._mtimes.get(name) == mtimes[name]:
+                continue
+
+            try:
+                data = json.loads(file.read_text())
+            except ValueError as err:
+                raise ImproperlyConfigured(f"Layout file '{file.name}' is not valid JSON") from err
+
+            validate_layout(name, data)
+            layouts[name] = _freeze(data)
+
+        self._layouts = MappingProxyType({k: v for k, v in layouts.items() if k in mtimes})
+        self._mtimes = mtimes
+
+    def get(self, resource: str) -> Mapping:
+        """
+        Return the read only layouts of a resource, e.g. 'function' or 'function.min'.
+        """
+        if settings.DEBUG:
+            self.load()
+
+        return self._layouts[resource]
+
+    def get_page(self, resource: str, page_name: str) -> Dict:
+        """
+        Return a mutable copy of a single page of a resource.
+        """
+        return _thaw(self.get(resource).get(page_name, {}))
+
+
+layouts = LayoutRegistry()
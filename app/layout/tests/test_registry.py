@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from rest_framework.exceptions import ParseError
+
+from ..registry import LAYOUTS_DIR, LayoutRegistry, layouts
+from ..utils import get_page_layout
+
+
+class LayoutRegistryTest(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name)
+        self.registry = LayoutRegistry(self.path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_layout(self, name, data, mtime=None):
+        file = self.path / f'{name}.json'
+        file.write_text(json.dumps(data))
+
+        if mtime is not None:
+            os.utime(file, (mtime, mtime))
+
+    def test_get_page_returns_copy(self):
+        self.write_layout('function', {'list': {'layout': [{'component': 'header'}]}})
+        self.registry.load()
+
+        page = self.registry.get_page('function', 'list')
+        page['layout'][0]['component'] = 'table'
+
+        self.assertEqual(
+            'header', self.registry.get_page('function', 'list')['layout'][0]['component']
+        )
+        self.assertEqual({}, self.registry.get_page('function', 'missing'))
+
+        with self.assertRaises(TypeError):
+            self.registry.get('function')['list'] = {}
+
+    def test_hidden_files_skipped(self):
+        self.write_layout('function', {'list': {'layout': []}})
+        self.write_layout('.parse_manifest', {'function.min.json': 'hash'})
+        self.registry.load()
+
+        self.assertListEqual(['list'], list(self.registry.get('function')))
+
+        with self.assertRaises(KeyError):
+            self.registry.get('.parse_manifest')
+
+    def test_invalid_layout(self):
+        self.write_layout('function', {'list': {'layout': {}}})
+
+        with self.assertRaises(ImproperlyConfigured):
+            self.registry.load()
+
+    @override_settings(DEBUG=True)
+    def test_reload_when_modified(self):
+        self.write_layout('function', {'list': {'layout': []}}, mtime=1)
+        self.registry.load()
+
+        self.write_layout('function', {'edit': {'layout': []}}, mtime=2)
+        self.write_layout('group', {'list': {'layout': []}})
+
+        self.assertListEqual(['edit'], list(self.registry.get('function')))
+        self.assertListEqual(['list'], list(self.registry.get('group')))
+
+        (self.path / 'group.json').unlink()
+        self.registry.load()
+
+        with self.assertRaises(KeyError):
+            self.registry.get('group')
+
+    @override_settings(DEBUG=False)
+    def test_no_reload_without_debug(self):
+        self.write_layout('function', {'list': {'layout': []}}, mtime=1)
+        self.registry.load()
+        self.write_layout('function', {'edit': {'layout': []}}, mtime=2)
+
+        self.assertListEqual(['list'], list(self.registry.get('function')))
+
+
+class GetPageLayoutTest(SimpleTestCase):
+    def test_developer_layouts_loaded(self):
+        for file in LAYOUTS_DIR.glob('*.json'):
+            self.assertIn(file.name[: -len('.json')], layouts._layouts)
+
+        page = get_page_layout('developer', 'function', 'list')
+        self.assertIn('layout', page)
+
+        with self.assertRaises(ParseError):
+            get_page_layout('developer', 'unknown', 'list')
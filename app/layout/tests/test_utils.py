@@ -0,0 +1,48 @@
+from django.test import SimpleTestCase
+
+from syntax.exceptions import ComponentNotFoundError
+from ..utils import build_component_index, find_component, get_component, patch_component
+
+
+def component(component_id, **config):
+    return {'id': component_id, 'component': 'container', 'config': config}
+
+
+class ComponentIndexTest(SimpleTestCase):
+    def setUp(self):
+        self.layout = [
+            component('header', tools=[component('button')]),
+            component(
+                'tabs',
+                tabs=[
+                    component('first', components=[component('table')]),
+                    component('second', components=[component('form', title='Edit')]),
+                ],
+            ),
+        ]
+
+    def test_find_component_in_later_sibling(self):
+        self.assertEqual('form', find_component(self.layout, 'form')['id'])
+        self.assertEqual('button', find_component(self.layout, 'button')['id'])
+        self.assertIsNone(find_component(self.layout, 'missing'))
+
+    def test_build_component_index(self):
+        index = build_component_index(self.layout)
+
+        self.assertSetEqual(
+            {'header', 'button', 'tabs', 'first', 'table', 'second', 'form'}, set(index)
+        )
+        self.assertListEqual([1, 'config', 'tabs', 1, 'config', 'components', 0], index['form'])
+
+        for component_id, path in index.items():
+            self.assertEqual(component_id, get_component(self.layout, path)['id'])
+
+    def test_patch_component(self):
+        index = build_component_index(self.layout)
+
+        patch_component(self.layout, index, 'form', {'title': 'Update'})
+
+        self.assertEqual('Update', find_component(self.layout, 'form')['config']['title'])
+
+        with self.assertRaises(ComponentNotFoundError):
+            patch_component(self.layout, index, 'missing', {})
@@ -1,37 +1,33 @@
-import json
 from typing import Dict, List, Optional
 
 from rest_framework.exceptions import ParseError
 
 from db.models import ModelSchema
 from layout.models import Page
-from syntax._old.utils import replace_syntax
+from layout.registry import layouts
+from syntax.exceptions import ComponentNotFoundError
+from syntax.template import render_syntax
 
 
 def populate_all_fields(model_schema, layout):
     all_fields = [
         {'field_name': x.db_column, 'verbose_name': x.name} for x in model_schema.fields.all()
     ]
-    all_fields_json = json.dumps(all_fields)
 
-    return replace_syntax(layout, '"__all__"', all_fields_json)
+    return render_syntax(layout, {'__all__': all_fields}, literals=['__all__'])
 
 
 def get_page_layout(
     environment: str, resource: str, resource_type: str, populate_all: bool = False
 ) -> Dict:
     if environment == 'developer':
-        # Open layout file for model.
+        # Get specific page in the preloaded layout data for model.
         try:
-            with open(f'layout/layouts/{resource}.json') as f:
-                model_layouts = json.loads(f.read())
-        except FileNotFoundError:
+            return layouts.get_page(resource, resource_type)
+        except KeyError:
             raise ParseError(
                 'Skeleton definition file not found',
             )
-
-        # Get specific page in layout data.
-        return model_layouts.get(resource_type, {})
     else:
         model_schema = ModelSchema.objects.get(name__iexact=resource)
         page = Page.objects.get(model_schema=model_schema, page_name=resource_type)
@@ -45,14 +41,86 @@ def get_page_layout(
         return layout
 
 
+def _child_components(component: Dict):
+    """
+    Yield the (path, child) of the components nested in the config of a component, e.g. in the
+    components of a column or the tabs of a tabs component.
+    """
+    for attribute, value in (component.get('config') or {}).items():
+        if isinstance(value, dict) and 'component' in value:
+            yield [attribute], value
+        elif isinstance(value, list):
+            for i, child in enumerate(value):
+                if isinstance(child, dict) and 'component' in child:
+                    yield [attribute, i], child
+
+
+def build_component_index(layout: List) -> Dict[str, List]:
+    """
+    Return a dict of component id -> path of the component in the layout, where the path is the
+    list of keys and indexes to follow from the layout, e.g. [0, 'config', 'components', 1].
+    """
+    index = {}
+    stack = [([i], component) for i, component in enumerate(layout)]
+
+    while stack:
+        path, component = stack.pop()
+
+        if component_id := component.get('id'):
+            index[str(component_id)] = path
+
+        for child_path, child in _child_components(component):
+            stack.append(([*path, 'config', *child_path], child))
+
+    return index
+
+
+def get_component(layout: List, path: List) -> Dict:
+    """
+    Return the component at the given path of the layout.
+    """
+    component = layout
+
+    for key in path:
+        component = component[key]
+
+    return component
+
+
+def patch_component(
+    layout: List, component_index: Dict[str, List], component_id: str, config: Dict
+) -> Dict:
+    """
+    Update the config of a single component of the given layout in place using the component
+    index, returning the component. The rest of the layout is left untouched. The index must be
+    rebuilt if the config adds or removes child components.
+
+    Only the given layout is changed, use Release.patch_page_component to change a page of the
+    application.
+    """
+    try:
+        path = component_index[component_id]
+    except KeyError:
+        raise ComponentNotFoundError(f'Component {component_id} not found in layout')
+
+    component = get_component(layout, path)
+    component['config'].update(config)
+
+    return component
+
+
 def find_component(layout: List, component_id: str) -> Optional[Dict]:
     """
     Recursively iterate through the nested tree of the layout to find the component with given id.
+    Prefer build_component_index when looking up more than one component in a layout.
     """
 
     for component in layout:
         if component.get('id') == component_id:
             return component
-        elif children := component['config'].get('components'):
-            return find_component(children, component_id)
+
+        children = [child for _, child in _child_components(component)]
+
+        if found := find_component(children, component_id):
+            return found
     return None
@@ -0,0 +1,250 @@
+"""
+ASGI app streaming live events (see live.events) to the browser as server-sent events:
+
+    GET /live/events/?token=<access token>&model=<modelschema id>&model=...
+
+The access token is given as a query parameter as EventSource cannot set headers. Every stream
+receives the release channel and the data channels of the requested models the user can view.
+
+Each process holds a single Redis subscription for all of its streams, so the number of Redis
+connections does not grow with the number of open tabs. Without LIVE_REDIS_URL, e.g. in
+development, streams only receive the events published by their own process.
+"""
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from urllib.parse import parse_qs
+
+from django.conf import settings
+
+import redis.asyncio as redis
+from api.permissions import get_effective_permissions
+from asgiref.sync import sync_to_async
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from accounts.authentication import CachedJWTAuthentication
+from .events import RELEASE_CHANNEL, data_channel, local_hubs
+
+logger = logging.getLogger(__name__)
+
+LIVE_PATH = '/live/events/'
+
+
+def format_event(message):
+    """
+    Format a published message as a server-sent event.
+    """
+    message = json.loads(message)
+    return f'event: {message["event"]}\ndata: {json.dumps(message["data"])}\n\n'.encode()
+
+
+class Hub:
+    """
+    Fans the messages of the Redis channels out to the queues of the connected streams. A stream
+    that falls behind by more than LIVE_QUEUE_SIZE messages is closed, and reconnects.
+    """
+
+    def __init__(self):
+        self.queues = defaultdict(set)
+        self._lock = asyncio.Lock()
+        self._pubsub = None
+        self._task = None
+
+    async def subscribe(self, channels):
+        queue = asyncio.Queue(maxsize=settings.LIVE_QUEUE_SIZE)
+
+        async with self._lock:
+            new_channels = [x for x in channels if not self.queues[x]]
+
+            for channel in channels:
+                self.queues[channel].add(queue)
+
+            if new_channels:
+                await self._subscribe(new_channels)
+
+        return queue
+
+    async def unsubscribe(self, queue, channels):
+        async with self._lock:
+            unused_channels = []
+
+            for channel in channels:
+                self.queues[channel].discard(queue)
+
+                if not self.queues[channel]:
+                    del self.queues[channel]
+                    unused_channels.append(channel)
+
+            if unused_channels:
+                await self._unsubscribe(unused_channels)
+
+    def dispatch(self, channel, message):
+        """
+        Put a published message on the queues of the channel's streams. The event is formatted
+        once for all of them.
+        """
+        event = format_event(message)
+
+        for queue in self.queues.get(channel, ()):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+
+                queue.put_nowait(None)
+
+    async def _subscribe(self, channels):
+        if self._pubsub is None:
+            self._pubsub = redis.from_url(settings.LIVE_REDIS_URL).pubsub()
+
+        await self._pubsub.subscribe(*channels)
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._listen())
+
+    async def _unsubscribe(self, channels):
+        await self._pubsub.unsubscribe(*channels)
+
+    async def _listen(self):
+        while self.queues:
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+            except redis.RedisError:
+                logger.exception('Lost the live events subscription')
+                await asyncio.sleep(1)
+                continue
+
+            if message is not None:
+                self.dispatch(message['channel'].decode(), message['data'])
+
+
+class LocalHub(Hub):
+    """
+    A hub without Redis, receiving the events published by its own process (see
+    live.events.publish) from any thread.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._loop = None
+        local_hubs.add(self)
+
+    def publish(self, channel, message):
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self.dispatch, channel, message)
+
+    async def _subscribe(self, channels):
+        self._loop = asyncio.get_running_loop()
+
+    async def _unsubscribe(self, channels):
+        pass
+
+
+class LiveEventsApp:
+    def __init__(self, hub=None):
+        if hub is None and not settings.LIVE_REDIS_URL:
+            logger.warning(
+                'LIVE_REDIS_URL is not set, live events are not shared between processes'
+            )
+            hub = LocalHub()
+
+        self.hub = hub or Hub()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'] != LIVE_PATH or scope['method'] != 'GET':
+            await self.respond(send, 404, b'Not found.')
+            return
+
+        params = parse_qs(scope['query_string'].decode())
+        user = await self.authenticate(params.get('token', [''])[0])
+
+        if user is None:
+            await self.respond(send, 401, b'Authentication failed.')
+            return
+
+        channels = [RELEASE_CHANNEL] + await self.get_data_channels(user, params.get('model', []))
+        await self.stream(channels, receive, send)
+
+    async def respond(self, send, status, body):
+        await send(
+            {
+                'type': 'http.response.start',
+                'status': status,
+                'headers': [(b'content-type', b'text/plain')],
+            }
+        )
+        await send({'type': 'http.response.body', 'body': body})
+
+    @sync_to_async
+    def authenticate(self, raw_token):
+        authentication = CachedJWTAuthentication()
+
+        try:
+            user = authentication.get_user(authentication.get_validated_token(raw_token))
+        except (InvalidToken, TokenError):
+            return None
+
+        return user if user.is_active else None
+
+    @sync_to_async
+    def get_data_channels(self, user, modelschema_ids):
+        if not user.is_superuser:
+            permissions = get_effective_permissions(user)
+            modelschema_ids = [x for x in modelschema_ids if (x, 'View') in permissions]
+
+        return [data_channel(x) for x in modelschema_ids]
+
+    async def stream(self, channels, receive, send):
+        """
+        Stream the events of the channels until the client disconnects or falls behind.
+        """
+        await send(
+            {
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [
+                    (b'content-type', b'text/event-stream'),
+                    (b'cache-control', b'no-cache'),
+                    (b'x-accel-buffering', b'no'),
+                ],
+            }
+        )
+        queue = await self.hub.subscribe(channels)
+        await send({'type': 'http.response.body', 'body': b': connected\n\n', 'more_body': True})
+        disconnect = asyncio.ensure_future(self.wait_for_disconnect(receive))
+
+        try:
+            while True:
+                get = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait(
+                    {get, disconnect},
+                    timeout=settings.LIVE_KEEPALIVE,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                if get not in done:
+                    get.cancel()
+
+                if disconnect in done:
+                    return
+
+                # A comment keeps idle connections open through proxies.
+                event = get.result() if get in done else b': keepalive\n\n'
+
+                if event is None:
+                    break
+
+                await send({'type': 'http.response.body', 'body': event, 'more_body': True})
+
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            disconnect.cancel()
+            await self.hub.unsubscribe(queue, channels)
+
+    async def wait_for_disconnect(self, receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
@@ -0,0 +1,133 @@
+"""
+Live events, published to Redis pub/sub and pushed to the browser by the live ASGI app (see
+live.asgi), so the frontend does not poll for changes.
+
+Every client receives the events of the release channel:
+
+    release   a release was published or restored, {"id": ..., "release_version": ...}
+    changes   the pending changes of the current release changed, {"release_id": ..., "count": ...}
+
+and may subscribe to the data channels of the models it can view:
+
+    data      rows of the model changed, {"modelschema_id": ..., "changes": [{"event", "id"}]}
+
+Events only say what changed, clients fetch the changed data through the API.
+"""
+import json
+import logging
+import weakref
+from collections import defaultdict
+from functools import partial
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+import redis
+
+from db.outbox import subscribe
+
+logger = logging.getLogger(__name__)
+
+RELEASE_CHANNEL = 'release'
+
+_redis = None
+
+# The hubs of the live app of this process, which receive the published events directly when
+# LIVE_REDIS_URL is not set (see live.asgi.LocalHub).
+local_hubs = weakref.WeakSet()
+
+
+def data_channel(modelschema_id):
+    return f'data.{modelschema_id}'
+
+
+def get_redis():
+    global _redis
+
+    if _redis is None:
+        _redis = redis.Redis.from_url(settings.LIVE_REDIS_URL)
+
+    return _redis
+
+
+def publish(*messages):
+    """
+    Publish (channel, event, data) messages with a single round trip. Publishing is best effort,
+    a failure is logged and does not fail the change that caused it. Without LIVE_REDIS_URL the
+    messages only reach the streams of this process.
+    """
+    messages = [
+        (channel, json.dumps({'event': event, 'data': data}, cls=DjangoJSONEncoder))
+        for channel, event, data in messages
+    ]
+
+    if not settings.LIVE_REDIS_URL:
+        for hub in list(local_hubs):
+            for channel, message in messages:
+                hub.publish(channel, message)
+
+        return
+
+    try:
+        pipeline = get_redis().pipeline(transaction=False)
+
+        for channel, message in messages:
+            pipeline.publish(channel, message)
+
+        pipeline.execute()
+    except redis.RedisError:
+        logger.exception('Failed to publish live events')
+
+
+def _publish_release(release):
+    publish(
+        (
+            RELEASE_CHANNEL,
+            'release',
+            {'id': release.id, 'release_version': release.release_version},
+        )
+    )
+
+
+def _publish_change_count(release_id):
+    from syntax.models import ReleaseChange
+
+    count = ReleaseChange.objects.filter(parent_release_id=release_id).count()
+    publish((RELEASE_CHANNEL, 'changes', {'release_id': release_id, 'count': count}))
+
+
+def release_published(release):
+    """
+    Announce a new current release once the transaction commits.
+    """
+    transaction.on_commit(partial(_publish_release, release))
+
+
+def release_changes_updated(release_id):
+    """
+    Announce the pending change count of a release once the transaction commits.
+    """
+    transaction.on_commit(partial(_publish_change_count, release_id))
+
+
+@subscribe
+def publish_data_changes(events):
+    """
+    Announce a batch of outbox events with one message per model.
+    """
+    changes = defaultdict(list)
+
+    for event in events:
+        changes[str(event.modelschema_id)].append({'event': event.event, 'id': event.object_id})
+
+    publish(
+        *[
+            (
+                data_channel(modelschema_id),
+                'data',
+                {'modelschema_id': modelschema_id, 'changes': x},
+            )
+            for modelschema_id, x in changes.items()
+        ]
+    )
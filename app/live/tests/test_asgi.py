@@ -0,0 +1,171 @@
+import asyncio
+import json
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from asgiref.sync import sync_to_async
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from db.models import OutboxEvent
+from db.outbox import drain
+from syntax.models import Release
+from .. import events
+from ..asgi import LIVE_PATH, LiveEventsApp, LocalHub
+
+
+def scope(query_string=''):
+    return {
+        'type': 'http',
+        'method': 'GET',
+        'path': LIVE_PATH,
+        'query_string': query_string.encode(),
+    }
+
+
+class LiveEventsAppTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('alice@example.com', 'password')
+        self.token = str(AccessToken.for_user(self.user))
+        self.admin_token = str(
+            AccessToken.for_user(User.objects.create_superuser('admin@example.com', 'password'))
+        )
+        Release.objects.create(release_version='0', release_notes='')
+        self.hub = LocalHub()
+        self.app = LiveEventsApp(self.hub)
+
+    async def run_app(self, scope, on_started=None):
+        """
+        Run the app until the response is complete or on_started returns, then disconnect.
+        """
+        sent = []
+        disconnected = asyncio.Event()
+
+        async def receive():
+            await disconnected.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            sent.append(message)
+
+        task = asyncio.ensure_future(self.app(scope, receive, send))
+
+        if on_started:
+            while len(sent) < 2 and not task.done():
+                await asyncio.sleep(0)
+
+            await on_started()
+
+            while sent[-1].get('body', b'').startswith(b': ') and not task.done():
+                await asyncio.sleep(0)
+
+            disconnected.set()
+
+        await asyncio.wait_for(task, 1)
+        return sent
+
+    async def test_authentication(self):
+        for query_string in ['', 'token=invalid']:
+            with self.subTest(query_string):
+                sent = await self.run_app(scope(query_string))
+
+                self.assertEqual(401, sent[0]['status'])
+
+    async def test_stream(self):
+        model_channel = events.data_channel('m1')
+
+        async def on_started():
+            # The user cannot view the model, so only receives the release channel.
+            self.assertSetEqual({events.RELEASE_CHANNEL}, set(self.hub.queues))
+            self.hub.dispatch(model_channel, json.dumps({'event': 'data', 'data': {}}))
+            self.hub.dispatch(
+                events.RELEASE_CHANNEL, json.dumps({'event': 'release', 'data': {'id': 1}})
+            )
+
+        sent = await self.run_app(scope(f'token={self.token}&model=m1'), on_started)
+
+        self.assertEqual(200, sent[0]['status'])
+        self.assertIn((b'content-type', b'text/event-stream'), sent[0]['headers'])
+        self.assertEqual(b'event: release\ndata: {"id": 1}\n\n', sent[-1]['body'])
+        self.assertDictEqual({}, self.hub.queues)
+
+    async def test_superuser_data_channels(self):
+        async def on_started():
+            self.assertIn(events.data_channel('m1'), self.hub.queues)
+            self.hub.dispatch(
+                events.data_channel('m1'), json.dumps({'event': 'data', 'data': {'id': 1}})
+            )
+
+        await self.run_app(scope(f'token={self.admin_token}&model=m1'), on_started)
+
+    @override_settings(LIVE_REDIS_URL=None)
+    async def test_without_redis(self):
+        self.app = LiveEventsApp()
+
+        async def on_started():
+            await sync_to_async(events.publish)((events.RELEASE_CHANNEL, 'release', {'id': 1}))
+
+        sent = await self.run_app(scope(f'token={self.token}'), on_started)
+
+        self.assertIsInstance(self.app.hub, LocalHub)
+        self.assertEqual(b'event: release\ndata: {"id": 1}\n\n', sent[-1]['body'])
+
+    @override_settings(LIVE_QUEUE_SIZE=1)
+    async def test_slow_stream_closed(self):
+        queue = await self.hub.subscribe([events.RELEASE_CHANNEL])
+
+        for i in range(2):
+            self.hub.dispatch(events.RELEASE_CHANNEL, json.dumps({'event': 'release', 'data': i}))
+
+        self.assertIsNone(queue.get_nowait())
+
+
+@override_settings(LIVE_REDIS_URL='redis://localhost:6379')
+class PublishTest(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(events, 'get_redis')
+        self.pipeline = patcher.start().return_value.pipeline.return_value
+        self.addCleanup(patcher.stop)
+
+    def get_published(self):
+        return [(x.args[0], json.loads(x.args[1])) for x in self.pipeline.publish.call_args_list]
+
+    def test_release_published(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            release = Release.objects.create(release_version='0', release_notes='')
+
+        self.assertIn(
+            (
+                events.RELEASE_CHANNEL,
+                {'event': 'release', 'data': {'id': release.id, 'release_version': '0'}},
+            ),
+            self.get_published(),
+        )
+
+    def test_data_changes(self):
+        schema = mock.Mock(id='00000000-0000-0000-0000-000000000001')
+        schema.name = 'Author'
+        OutboxEvent.record(schema, 'create', [{'id': 1}, {'id': 2}])
+
+        drain()
+
+        self.assertListEqual(
+            [
+                (
+                    events.data_channel(schema.id),
+                    {
+                        'event': 'data',
+                        'data': {
+                            'modelschema_id': schema.id,
+                            'changes': [
+                                {'event': 'create', 'id': '1'},
+                                {'event': 'create', 'id': '2'},
+                            ],
+                        },
+                    },
+                )
+            ],
+            self.get_published(),
+        )
+        self.pipeline.execute.assert_called_once()
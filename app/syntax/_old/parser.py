@@ -1,3 +1,4 @@
+import copy
 from uuid import uuid4
 
 from .components import COMPONENT_CONFIG
@@ -5,6 +6,135 @@ from .constants import STATELESS_COMPONENTS, ComponentsType
 from .helpers import extract_fields
 
 
+def _compile_attribute(attribute, config):
+    """
+    Compile the configuration of a single component attribute into a validator, which validates
+    the attribute of a component config and adds the default when an optional attribute is not
+    given.
+    """
+    required = config['required']
+    default = config['default']
+    is_component = isinstance(config['type'], ComponentsType)
+    validator = config['validator']
+
+    def validate(parser, component_config):
+        component_value = component_config.get(attribute)
+
+        if not (required or component_value):
+            # An optional config key has not been given.
+            component_config[attribute] = copy.copy(default)
+            return
+
+        if not component_value:
+            raise Exception(f'{attribute}: required attribute not provided')
+
+        # Make the component value a list (in the case it is a single value).
+        if not isinstance(component_value, list):
+            component_value = [component_value]
+
+        for child in component_value:
+            if is_component:
+                # Attribute type is a component.
+                parser.validate_component(child)
+            else:
+                # Attribute type is a string or dictionary.
+                validator(child)
+
+    return validate
+
+
+def compile_component_config(component_config):
+    """
+    Compile COMPONENT_CONFIG into a tuple of attribute validators per component type. Attributes
+    starting with an underscore are metadata about the component and are skipped.
+    """
+    return {
+        component_type: tuple(
+            _compile_attribute(attribute, config)
+            for attribute, config in attributes.items()
+            if not attribute.startswith('_')
+        )
+        for component_type, attributes in component_config.items()
+    }
+
+
+COMPONENT_VALIDATORS = compile_component_config(COMPONENT_CONFIG)
+
+
+class _AllFields(Exception):
+    """
+    Raised while collecting the fields of a page when the page may use any field.
+    """
+
+
+def _collect_fields(value, fields):
+    """
+    Add the fields used by a config value to the list, descending into nested values and
+    components.
+    """
+    if isinstance(value, str):
+        fields += extract_fields(value)
+    elif isinstance(value, list):
+        for child in value:
+            _collect_fields(child, fields)
+    elif isinstance(value, dict):
+        if 'component' in value:
+            _collect_component_fields(value, fields)
+        else:
+            for child in value.values():
+                _collect_fields(child, fields)
+
+
+def _collect_component_fields(component, fields):
+    component_type = ComponentsType.__members__.get(component.get('component'))
+    config = component.get('config') or {}
+
+    if component_type is None or component_type == ComponentsType._component:
+        # A component the parser does not know, e.g. the core@ components of the default pages.
+        raise _AllFields()
+
+    if component_type not in STATELESS_COMPONENTS:
+        # Tables and inlines load their own objects, containers only hold other components.
+        for value in config.values():
+            if isinstance(value, (list, dict)):
+                _collect_fields(value, fields)
+
+        return
+
+    for attribute, value in config.items():
+        if attribute == 'fields':
+            if not isinstance(value, list):
+                # A form of every field, e.g. '__all__'.
+                raise _AllFields()
+
+            # Attribute is a list of model fields.
+            fields += [field['field_name'].strip() for field in value]
+        else:
+            _collect_fields(value, fields)
+
+    if component_type == ComponentsType.form and 'fields' not in config:
+        raise _AllFields()
+
+
+def get_page_object_fields(layout):
+    """
+    Return the fields of the page object used by the components of a layout, in the order they
+    first appear, or None when the page may use any field: a form without a list of fields or a
+    component the parser does not know. These are the only fields that need to be loaded to render
+    the page.
+    """
+    fields = []
+
+    try:
+        for component in layout:
+            _collect_component_fields(component, fields)
+    except _AllFields:
+        return None
+
+    # Remove duplicate fields, keeping the order they first appear in.
+    return list(dict.fromkeys(fields))
+
+
 class SyntaxParser:
     """
     This class is responsible for parsing the configuration syntax for a ModelSchema, FieldSchema,
@@ -12,11 +142,11 @@ class SyntaxParser:
     """
 
     def __init__(self):
-        self.component_ids = []
+        self.component_ids = set()
         self.stateless_fields = []
 
     def _reset_class(self):
-        self.component_ids = []
+        self.component_ids = set()
         self.stateless_fields = []
 
     def validate_component(self, component):
@@ -28,43 +158,18 @@ class SyntaxParser:
             component_type = ComponentsType[component['component']]
             component_config = component['config']
 
-            for attribute, config in COMPONENT_CONFIG[component_type].items():
-                # Attribute starting with an underscore are metadata about the component.
-                if attribute.startswith('_'):
-                    continue
-
-                component_value = component_config.get(attribute)
-
-                if config['required'] or component_value:
-                    # The config key is required or an optional config key has a value.
-
-                    if not component_value:
-                        raise Exception(f'{attribute}: required attribute not provided')
-
-                    # Make the component value a list (in the case it is a single value).
-                    if not isinstance(component_value, list):
-                        component_value = [component_value]
-
-                    for child in component_value:
-                        if config['type'] in ComponentsType:
-                            # Attribute type is a component.
-                            self.validate_component(child)
-                        else:
-                            # Attribute type is a string or dictionary.
-                            config['validator'](child)
-                else:
-                    # An optional config key has not been given.
-                    component_config[attribute] = config['default']
+            for validate in COMPONENT_VALIDATORS[component_type]:
+                validate(self, component_config)
 
         # Ensure component has a unique id. UUIDs are used for this. If a component already has an
         # id, this should be used, unless a previous component already has that id. However, the
         # probability of this collision is extremly small, the case is handled.
-        component_id = component.get('id', uuid4())
+        component_id = str(component.get('id', uuid4()))
         while component_id in self.component_ids:
-            component_id = uuid4()
+            component_id = str(uuid4())
 
-        self.component_ids.append(component_id)
-        component['id'] = str(component_id)
+        self.component_ids.add(component_id)
+        component['id'] = component_id
 
     def parse_layout(self, page):
         """
@@ -84,29 +189,10 @@ class SyntaxParser:
         if layout is None:
             raise Exception('Layout is not defined for page.')
 
-        stateless_fields = []
-
         for component in layout:
             self.validate_component(component)
 
-            # Find if any stateless components have data fields.
-            if not component['component'].startswith('core@'):
-                if ComponentsType[component['component']] in STATELESS_COMPONENTS:
-                    for attribute, value in component['config'].items():
-                        if isinstance(value, list):
-                            if attribute == 'fields':
-                                # Attribute is a list of model fields.
-                                for field in value:
-                                    stateless_fields.append(field['field_name'].strip())
-                            else:
-                                # Attribute is a list of children components.
-                                for child_component in value:
-                                    for child_value in child_component['config'].values():
-                                        stateless_fields += extract_fields(child_value)
-                        else:
-                            stateless_fields += extract_fields(value)
-
-        page['page_object_fields'] = list(set(stateless_fields))
+        page['page_object_fields'] = get_page_object_fields(layout)
 
         return page
 
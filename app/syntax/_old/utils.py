@@ -1,11 +1,19 @@
 import json
 import os
 
+from syntax.template import PLACEHOLDER_RE, render_syntax
+
 
 def replace_syntax(syntax, old, new):
-    syntax_json = json.dumps(syntax)
-    syntax_json = syntax_json.replace(old, new)
-    return json.loads(syntax_json)
+    """
+    Deprecated: use syntax.template. Replaces a ${name} placeholder with a string, or a quoted JSON
+    string literal (e.g. '"__all__"') with a JSON value.
+    """
+    if match := PLACEHOLDER_RE.fullmatch(old):
+        return render_syntax(syntax, {match.group(1): new})
+
+    literal = json.loads(old)
+    return render_syntax(syntax, {literal: json.loads(new)}, literals=[literal])
 
 
 def _read_file(file_path):
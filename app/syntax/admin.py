@@ -5,6 +5,8 @@ from .models import Release, ReleaseChange, ReleaseSyntax
 
 class ReleaseSyntaxInline(admin.TabularInline):
     model = ReleaseSyntax
+    fields = ['model_type', 'object_id', 'blob']
+    readonly_fields = ['model_type', 'object_id', 'blob']
     extra = 0
 
 
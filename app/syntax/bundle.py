@@ -0,0 +1,189 @@
+"""
+Application bundles: the syntax of a whole application (modelschemas, pages, workflows, functions
+and permissions) in a single JSON document.
+
+A bundle is exported from any Release and imported declaratively into the current release as one
+batch of ReleaseChanges: objects missing from the release are created with the ids they have in
+the bundle, changed objects are updated, and objects missing from the bundle are deleted. Object
+ids are preserved so references between objects (e.g. modelschema_id) stay valid.
+
+    {
+        "version": 1,
+        "release_version": "...",
+        "modelschema": [...],
+        "page": [...],
+        ...
+    }
+"""
+import uuid
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from db.models import ModelSchema
+from live.events import release_changes_updated
+from .diff import syntax_hash
+from .exceptions import PendingChangesError, StaleReleaseError
+from .locks import lock_release
+from .models import MODEL_TYPES, PermissionIndex, ReleaseChange, ReleaseChangeType
+from .validation import validate_release_change
+
+BUNDLE_VERSION = 1
+
+
+def export_bundle(release, include_changes=False):
+    """
+    Return the bundle of a release, optionally merged with its pending ReleaseChanges. The syntax
+    is loaded with a single query.
+    """
+    objects = {model_type: [] for model_type in MODEL_TYPES}
+
+    syntaxes = release.syntax.order_by('model_type', 'object_id').values_list(
+        'model_type', 'blob__syntax_json'
+    )
+
+    for model_type, syntax_json in syntaxes.iterator():
+        objects.setdefault(model_type, []).append(syntax_json)
+
+    if include_changes:
+        release_changes = list(release.release_changes.order_by('created_at'))
+
+        for model_type in objects:
+            objects[model_type] = release._merge_changes(
+                objects[model_type], [x for x in release_changes if x.model_type == model_type]
+            )
+
+    return {
+        'version': BUNDLE_VERSION,
+        'release_version': release.release_version,
+        **objects,
+    }
+
+
+def _bundle_objects(bundle):
+    """
+    Validate the structure of a bundle and yield its (model_type, syntax_json) objects.
+    """
+    if not isinstance(bundle, dict):
+        raise ValidationError('A bundle must be an object.')
+
+    if bundle.get('version') != BUNDLE_VERSION:
+        raise ValidationError(f'Unsupported bundle version {bundle.get("version")!r}.')
+
+    for model_type in MODEL_TYPES:
+        syntaxes = bundle.get(model_type, [])
+
+        if not isinstance(syntaxes, list):
+            raise ValidationError(f'{model_type} must be a list.')
+
+        for syntax_json in syntaxes:
+            if not isinstance(syntax_json, dict):
+                raise ValidationError(f'Each {model_type} must be an object.')
+
+            yield model_type, syntax_json
+
+
+def build_bundle_changes(release, bundle):
+    """
+    Return the unsaved ReleaseChanges that make the syntax of the release match the bundle.
+    Unchanged objects are found by comparing content hashes, so only changed syntax is validated
+    and stored.
+    """
+    release_hashes = {
+        object_id: (model_type, blob_id)
+        for object_id, model_type, blob_id in release.syntax.values_list(
+            'object_id', 'model_type', 'blob_id'
+        ).iterator()
+    }
+    modelschema_ids = set()
+    object_ids = set()
+    release_changes = []
+
+    for model_type, syntax_json in _bundle_objects(bundle):
+        try:
+            object_id = str(uuid.UUID(str(syntax_json.get('id'))))
+        except ValueError:
+            raise ValidationError(f'{model_type} has an invalid id {syntax_json.get("id")!r}.')
+
+        if object_id in object_ids:
+            raise ValidationError(f'Duplicate id {object_id} in bundle.')
+
+        object_ids.add(object_id)
+
+        if model_type == ModelSchema._meta.model_name:
+            modelschema_ids.add(object_id)
+
+        release_syntax = release_hashes.get(object_id)
+
+        if release_syntax == (model_type, syntax_hash(syntax_json)):
+            continue
+
+        if release_syntax and release_syntax[0] != model_type:
+            raise ValidationError(f'{object_id} is a {release_syntax[0]}, not a {model_type}.')
+
+        release_change = ReleaseChange(
+            parent_release=release,
+            change_type=ReleaseChangeType.UPDATE if release_syntax else ReleaseChangeType.CREATE,
+            model_type=model_type,
+            object_id=object_id,
+            syntax_json={**syntax_json, 'id': object_id},
+        )
+
+        try:
+            validate_release_change(release_change)
+        except ValidationError as err:
+            raise ValidationError([f'{model_type} {object_id}: {x}' for x in err.messages])
+
+        release_change._prepare_syntax()
+        release_changes.append(release_change)
+
+    for release_change in release_changes:
+        modelschema_id = release_change.syntax_json.get('modelschema_id')
+
+        if modelschema_id and modelschema_id not in modelschema_ids:
+            raise ValidationError(
+                f'{release_change.model_type} {release_change.object_id} references the '
+                f'modelschema {modelschema_id}, which is not in the bundle.'
+            )
+
+    release_changes += [
+        ReleaseChange(
+            parent_release=release,
+            change_type=ReleaseChangeType.DELETE,
+            model_type=model_type,
+            object_id=object_id,
+            syntax_json={'id': object_id},
+        )
+        for object_id, (model_type, _) in release_hashes.items()
+        if object_id not in object_ids
+    ]
+
+    return release_changes
+
+
+def import_bundle(release, bundle):
+    """
+    Stage the changes that make the syntax of the release match the bundle, with a single bulk
+    insert. The release must be the current release and have no pending changes, which the import
+    would otherwise have to merge with. Returns the number of changes of each change type.
+    """
+    with transaction.atomic():
+        if not lock_release(release.id):
+            raise StaleReleaseError(f'Release {release} is no longer the current release.')
+
+        if release.release_changes.exists():
+            raise PendingChangesError(
+                'The release has unpublished changes, publish or discard them first.'
+            )
+
+        release_changes = build_bundle_changes(release, bundle)
+        ReleaseChange.objects.bulk_create(release_changes, batch_size=1000)
+        PermissionIndex.stage(release.id, release_changes, replace=False)
+        release_changes_updated(release.id)
+
+    counts = {change_type: 0 for change_type in ReleaseChangeType.values}
+
+    for release_change in release_changes:
+        counts[release_change.change_type] += 1
+
+    return counts
@@ -0,0 +1,194 @@
+"""
+Reconciliation of the dynamic tables (ModelSchema/FieldSchema) between releases.
+
+A plan is a list of JSON serialisable operations. The models whose syntax differs between two
+releases are compared against their live ModelSchema/FieldSchema rows, so restoring a release only
+touches the models that changed and the plan matches the tables even where they have drifted from
+the syntax (e.g. fields removed by an update are kept in the table).
+"""
+from django.db import models
+
+from db.models import FieldSchema, ModelSchema
+from .diff import DiffType, diff_releases
+
+
+class Operation:
+    CREATE_MODEL = 'create_model'
+    RENAME_MODEL = 'rename_model'
+    ADD_FIELD = 'add_field'
+    ALTER_FIELD = 'alter_field'
+    REMOVE_FIELD = 'remove_field'
+    DELETE_MODEL = 'delete_model'
+
+
+# Models are created before fields are added so foreign keys can reference them, and dropped last.
+OPERATION_ORDER = [
+    Operation.CREATE_MODEL,
+    Operation.RENAME_MODEL,
+    Operation.ADD_FIELD,
+    Operation.ALTER_FIELD,
+    Operation.REMOVE_FIELD,
+    Operation.DELETE_MODEL,
+]
+
+
+def get_class_name(field_type):
+    fields = {
+        'text': 'django.db.models.TextField',
+        'email': 'django.db.models.EmailField',
+        'float': 'django.db.models.FloatField',
+        'date': 'django.db.models.DateField',
+        'datetime': 'django.db.models.DateTimeField',
+        'fk': 'django.db.models.ForeignKey',
+    }
+    return fields.get(field_type, fields['text'])
+
+
+def get_kwargs(field):
+    field_type = field['field_type']
+    required = field['required']
+
+    if field_type == 'fk':
+        return {
+            'on_delete': models.CASCADE,
+            'to': ModelSchema.objects.get(id=field["modelschema_id"]).name,
+            'null': not required,
+        }
+    elif field_type in ['float', 'datetime', 'date']:
+        return {
+            'null': not required,
+        }
+    elif field_type in ['text', 'email']:
+        return {
+            'blank': True,
+        }
+
+
+def create_field(model_schema, field):
+    FieldSchema.objects.create(
+        model_schema=model_schema,
+        name=field['field_name'],
+        class_name=get_class_name(field['field_type']),
+        kwargs=get_kwargs(field),
+    )
+
+
+def _operation(operation, modelschema_id, **kwargs):
+    return {'operation': operation, 'modelschema_id': modelschema_id, **kwargs}
+
+
+def _plan_model_changes(base_syntax, target_syntax, model_schema):
+    """
+    Return the operations required to take the live model_schema to the target syntax. Fields
+    that exist in both are only altered when their syntax changed between the releases or their
+    type differs from the table.
+    """
+    modelschema_id = target_syntax['id']
+    operations = []
+
+    if model_schema.name != target_syntax['model_name']:
+        operations.append(
+            _operation(
+                Operation.RENAME_MODEL, modelschema_id, model_name=target_syntax['model_name']
+            )
+        )
+
+    base_fields = {x['field_name']: x for x in (base_syntax or {}).get('fields', [])}
+    target_fields = {x['field_name']: x for x in target_syntax.get('fields', [])}
+    live_fields = {x.name: x for x in model_schema.fields.all()}
+
+    for field_name, field in target_fields.items():
+        if field_name not in live_fields:
+            operations.append(_operation(Operation.ADD_FIELD, modelschema_id, field=field))
+        elif field != base_fields.get(field_name) or live_fields[
+            field_name
+        ].class_name != get_class_name(field['field_type']):
+            operations.append(_operation(Operation.ALTER_FIELD, modelschema_id, field=field))
+
+    for field_name in live_fields.keys() - target_fields.keys():
+        operations.append(
+            _operation(Operation.REMOVE_FIELD, modelschema_id, field_name=field_name)
+        )
+
+    return operations
+
+
+def plan_schema_changes(base, target):
+    """
+    Return the operations required to take the dynamic tables from the state of the base Release
+    to the state of the target Release.
+    """
+    diff = list(diff_releases(base, target, model_type=ModelSchema._meta.model_name))
+
+    modelschema_ids = [x['id'] for x in diff]
+    base_syntax = dict(
+        base.syntax.filter(
+            model_type=ModelSchema._meta.model_name, object_id__in=modelschema_ids
+        ).values_list('object_id', 'blob__syntax_json')
+    )
+    model_schemas = {
+        str(x.id): x
+        for x in ModelSchema.objects.filter(id__in=modelschema_ids).prefetch_related('fields')
+    }
+
+    plan = []
+
+    for entry in diff:
+        modelschema_id = entry['id']
+        model_schema = model_schemas.get(modelschema_id)
+
+        if entry['diff_type'] == DiffType.REMOVED:
+            if model_schema is not None:
+                plan.append(_operation(Operation.DELETE_MODEL, modelschema_id))
+        elif model_schema is None:
+            syntax_json = entry['syntax_json']
+            plan.append(
+                _operation(
+                    Operation.CREATE_MODEL, modelschema_id, model_name=syntax_json['model_name']
+                )
+            )
+            plan += [
+                _operation(Operation.ADD_FIELD, modelschema_id, field=field)
+                for field in syntax_json.get('fields', [])
+            ]
+        else:
+            plan += _plan_model_changes(
+                base_syntax.get(modelschema_id), entry['syntax_json'], model_schema
+            )
+
+    return sorted(plan, key=lambda x: OPERATION_ORDER.index(x['operation']))
+
+
+def apply_schema_plan(plan):
+    """
+    Apply the operations of a plan to the dynamic tables.
+    """
+    for operation in plan:
+        modelschema_id = operation['modelschema_id']
+
+        if operation['operation'] == Operation.CREATE_MODEL:
+            ModelSchema.objects.create(id=modelschema_id, name=operation['model_name'])
+            continue
+
+        model_schema = ModelSchema.objects.filter(id=modelschema_id).first()
+
+        if model_schema is None:
+            # The table was never created (e.g. the model was created and deleted between the
+            # releases), so there is nothing to reconcile.
+            continue
+
+        if operation['operation'] == Operation.RENAME_MODEL:
+            model_schema.name = operation['model_name']
+            model_schema.save()
+        elif operation['operation'] == Operation.ADD_FIELD:
+            create_field(model_schema, operation['field'])
+        elif operation['operation'] == Operation.ALTER_FIELD:
+            field = operation['field']
+            field_schema = model_schema.fields.get(name=field['field_name'])
+            field_schema.class_name = get_class_name(field['field_type'])
+            field_schema.kwargs = get_kwargs(field)
+            field_schema.save()
+        elif operation['operation'] == Operation.REMOVE_FIELD:
+            model_schema.fields.get(name=operation['field_name']).delete()
+        elif operation['operation'] == Operation.DELETE_MODEL:
+            model_schema.delete()
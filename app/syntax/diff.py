@@ -0,0 +1,112 @@
+import hashlib
+import json
+
+
+class DiffType:
+    ADDED = 'added'
+    REMOVED = 'removed'
+    CHANGED = 'changed'
+
+
+def syntax_hash(syntax_json):
+    """
+    Return the content hash of a syntax object. Keys are sorted so equal syntax always hashes the
+    same regardless of key order.
+    """
+    payload = json.dumps(syntax_json, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _diff_entry(diff_type, model_type, object_id, syntax_json=None):
+    entry = {
+        'diff_type': diff_type,
+        'model_type': model_type,
+        'id': object_id,
+    }
+
+    if syntax_json is not None:
+        entry['syntax_json'] = syntax_json
+
+    return entry
+
+
+def _release_hashes(release, **kwargs):
+    """
+    Return a dict of object id -> (model_type, hash) for the syntax in a release. The hashes are
+    the stored SyntaxBlob keys, so no syntax JSON is loaded.
+    """
+    syntaxes = release.syntax.filter(**kwargs).values_list('object_id', 'model_type', 'blob_id')
+
+    return {object_id: (model_type, blob_id) for object_id, model_type, blob_id in syntaxes}
+
+
+def _with_syntax(entries):
+    """
+    Load the syntax JSON of a chunk of (diff_type, model_type, object_id, hash) entries with a
+    single query and yield the diff entries.
+    """
+    from .models import SyntaxBlob
+
+    blobs = SyntaxBlob.objects.in_bulk([x[3] for x in entries])
+
+    for diff_type, model_type, object_id, hash in entries:
+        yield _diff_entry(diff_type, model_type, object_id, blobs[hash].syntax_json)
+
+
+def diff_releases(base, target, model_type=None, chunk_size=500):
+    """
+    Yield the objects added, removed and changed going from the base Release to the target
+    Release, optionally only for a single model_type. Objects are compared by their SyntaxBlob
+    hashes and syntax is only loaded, in chunks, for objects that differ.
+    """
+    filters = {'model_type': model_type} if model_type else {}
+    base_hashes = _release_hashes(base, **filters)
+    chunk = []
+
+    target_syntax = target.syntax.filter(**filters).values_list(
+        'object_id', 'model_type', 'blob_id'
+    )
+
+    for object_id, model_type, blob_id in target_syntax.iterator():
+        base_syntax = base_hashes.pop(object_id, None)
+
+        if base_syntax is None:
+            chunk.append((DiffType.ADDED, model_type, object_id, blob_id))
+        elif base_syntax[1] != blob_id:
+            chunk.append((DiffType.CHANGED, model_type, object_id, blob_id))
+
+        if len(chunk) >= chunk_size:
+            yield from _with_syntax(chunk)
+            chunk = []
+
+    yield from _with_syntax(chunk)
+
+    for object_id, (model_type, _) in base_hashes.items():
+        yield _diff_entry(DiffType.REMOVED, model_type, object_id)
+
+
+def diff_release_changes(release):
+    """
+    Yield the objects added, removed and changed by the pending ReleaseChanges of a Release. Only
+    the hashes of the release syntax touched by a change are loaded.
+    """
+    from .models import ReleaseChangeType
+
+    release_changes = list(
+        release.release_changes.order_by('created_at').values_list(
+            'change_type', 'model_type', 'syntax_json'
+        )
+    )
+    base_hashes = _release_hashes(release, object_id__in=[x[2]['id'] for x in release_changes])
+
+    for change_type, model_type, syntax_json in release_changes:
+        object_id = syntax_json['id']
+        base_syntax = base_hashes.get(object_id)
+
+        if change_type == ReleaseChangeType.DELETE:
+            if base_syntax is not None:
+                yield _diff_entry(DiffType.REMOVED, model_type, object_id)
+        elif base_syntax is None:
+            yield _diff_entry(DiffType.ADDED, model_type, object_id, syntax_json)
+        elif base_syntax[1] != syntax_hash(syntax_json):
+            yield _diff_entry(DiffType.CHANGED, model_type, object_id, syntax_json)
@@ -0,0 +1,32 @@
+class ReleaseError(Exception):
+    """
+    Base exception for use in releases.
+    """
+
+    pass
+
+
+class StaleReleaseError(ReleaseError):
+    """
+    Raised when a release or change is made against a Release that is no longer the current
+    release (e.g. another release was published concurrently).
+    """
+
+    pass
+
+
+class ComponentNotFoundError(Exception):
+    """
+    Raised when a page, or a component of a page layout, does not exist.
+    """
+
+    pass
+
+
+class PendingChangesError(ReleaseError):
+    """
+    Raised when a release is restored or a bundle imported while the current release has
+    unpublished ReleaseChanges.
+    """
+
+    pass
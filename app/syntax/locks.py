@@ -0,0 +1,35 @@
+"""Locks used to serialise concurrent writes to the release tree."""
+from contextlib import contextmanager
+
+from django.db import connection, transaction
+
+# Application wide key of the advisory lock held while a release is published.
+PUBLISH_LOCK_KEY = 48151623
+
+
+@contextmanager
+def publish_lock():
+    """
+    Open a transaction holding the publish advisory lock. The lock is released when the outermost
+    transaction commits or rolls back, so at most one release is published at any time.
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(%s)', [PUBLISH_LOCK_KEY])
+        yield
+
+
+def lock_release(release_id):
+    """
+    Take a row lock on a Release, returning whether it is the current release. Must be called
+    within a transaction. Publishing and ReleaseChange writes both lock the release they are made
+    against, so a change can never be written while its release is being published.
+    """
+    from .models import Release
+
+    return (
+        Release.objects.select_for_update()
+        .filter(pk=release_id)
+        .values_list('current_release', flat=True)
+        .get()
+    )
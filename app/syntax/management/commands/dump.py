@@ -0,0 +1,39 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...bundle import export_bundle
+from ...models import Release
+
+
+class Command(BaseCommand):
+    help = 'Dump the application bundle of a release, the current release by default.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=str, help='Bundle file to write, - for stdout')
+        parser.add_argument('--release-version', type=str, help='Version of the release to dump')
+        parser.add_argument(
+            '--include-changes',
+            action='store_true',
+            help='Merge the pending changes of the release into the bundle',
+        )
+
+    def handle(self, *args, **options):
+        if options['release_version']:
+            release = Release.objects.filter(release_version=options['release_version']).first()
+
+            if not release:
+                raise CommandError(f'Release {options["release_version"]} does not exist')
+        else:
+            release = Release.get_current_release()
+
+        bundle = json.dumps(export_bundle(release, include_changes=options['include_changes']))
+
+        if options['path'] == '-':
+            self.stdout.write(bundle)
+            return
+
+        with open(options['path'], 'w') as f:
+            f.write(bundle)
+
+        self.stdout.write(self.style.SUCCESS(f'Successfully dumped release {release}'))
@@ -1,17 +1,98 @@
-from django.core.management.base import BaseCommand
-from django.db import DEFAULT_DB_ALIAS, connections
-from django.db.backends.postgresql.introspection import DatabaseIntrospection
+import json
+import time
 
-from ..._old.utils import load_from_directory
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from ...bundle import import_bundle
+from ...exceptions import ReleaseError
+from ...models import Release
+
+
+def get_unused_release_version(release_version):
+    """
+    Return the release version, suffixed with a number when a release already has it.
+    """
+    versions = set(
+        Release.objects.filter(release_version__startswith=release_version).values_list(
+            'release_version', flat=True
+        )
+    )
+    candidate = release_version
+    suffix = 1
+
+    while candidate in versions:
+        suffix += 1
+        candidate = f'{release_version}-{suffix}'
+
+    return candidate
 
 
 class Command(BaseCommand):
-    help = 'Load an application configuration'
+    help = (
+        'Load an application bundle (see the dump command), staging the changes that make the '
+        'current release match it.'
+    )
 
-    # def add_arguments(self, parser):
-    # parser.add_argument('directory', type=str)
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=str, help='Bundle file to load')
+        parser.add_argument(
+            '--publish',
+            action='store_true',
+            help='Publish the loaded changes as a new release',
+        )
+        parser.add_argument(
+            '--release-version',
+            type=str,
+            help=(
+                'Version of the published release, by default the version of the bundle '
+                '(suffixed with a number when a release already has it)'
+            ),
+        )
 
     def handle(self, *args, **options):
-        connection = connections['default']
-        introspection = DatabaseIntrospection(connection)
-        print(introspection)
+        start = time.perf_counter()
+
+        try:
+            with open(options['path']) as f:
+                bundle = json.loads(f.read())
+        except (OSError, ValueError) as err:
+            raise CommandError(f'Could not read bundle: {err}')
+
+        release_version = options['release_version']
+
+        if options['publish']:
+            if release_version is None:
+                release_version = get_unused_release_version(
+                    bundle.get('release_version') or 'loaded'
+                )
+            elif Release.objects.filter(release_version=release_version).exists():
+                raise CommandError(f'Release {release_version} already exists')
+
+        # The changes are only staged if they can be published, so a failed load changes nothing.
+        with transaction.atomic():
+            release = Release.get_current_release()
+
+            try:
+                counts = import_bundle(release, bundle)
+
+                if options['publish'] and any(counts.values()):
+                    release = Release.objects.create(
+                        parent=release,
+                        release_version=release_version,
+                        release_notes=f'Loaded from {options["path"]}',
+                    )
+            except ValidationError as err:
+                raise CommandError('Invalid bundle: ' + ' '.join(err.messages))
+            except ReleaseError as err:
+                raise CommandError(str(err))
+
+        self.stdout.write(', '.join(f'{count} {x}' for x, count in counts.items()))
+
+        if options['publish'] and any(counts.values()):
+            self.stdout.write(f'Published release {release}')
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully loaded bundle in {time.perf_counter() - start:.2f}s')
+        )
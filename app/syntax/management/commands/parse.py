@@ -1,31 +1,196 @@
+import hashlib
 import json
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 
 from ..._old.parser import SyntaxParser
 
+MANIFEST_FILE_NAME = '.parse_manifest.json'
 
-class Command(BaseCommand):
-    help = 'Closes the specified poll for voting'
 
-    def add_arguments(self, parser):
-        parser.add_argument('layout_file_path', nargs=1, type=str)
+class ParseStatus:
+    PARSED = 'parsed'
+    UNCHANGED = 'unchanged'
+    SKIPPED = 'skipped'
+    ERROR = 'error'
+
+
+def get_output_path(input_path):
+    return input_path.with_name(input_path.name.replace('.min', ''))
+
+
+def is_source_file(path):
+    return path.name.endswith('.min.json')
+
+
+def find_layout_files(directory):
+    """
+    Return the layout files to parse in a directory tree. The .min.json files are the sources of
+    the parsed .json files; a .json file without a source is hand-written and never overwritten.
+    """
+    return sorted(Path(directory).rglob('*.min.json'))
+
+
+def is_layout_file(layouts):
+    """
+    A layout file is an object of pages, each with a list of components in 'layout'. Other JSON
+    files (e.g. skeleton.json or application model definitions) are skipped.
+    """
+    return (
+        isinstance(layouts, dict)
+        and len(layouts) > 0
+        and all(
+            isinstance(x, dict) and isinstance(x.get('layout'), list) for x in layouts.values()
+        )
+    )
 
-    def handle(self, *args, **options):
-        file_path = options['layout_file_path'][0]
-        layout_path_input = os.path.join(settings.BASE_DIR, '..', file_path)
-        layout_path_output = os.path.join(settings.BASE_DIR, '..', file_path.replace('.min', ''))
 
-        with open(layout_path_input) as f:
+def parse_layout_file(input_path, output_path):
+    """
+    Parse every page of a layout file and write the result. Runs in a worker process so returns a
+    (status, number of pages, duration, error) tuple instead of raising.
+    """
+    start = time.perf_counter()
+
+    try:
+        with open(input_path) as f:
             layouts = json.loads(f.read())
 
-        for page_name, page_config in layouts.items():
+        if not is_layout_file(layouts):
+            return ParseStatus.SKIPPED, 0, time.perf_counter() - start, 'not a layout file'
+
+        for page_config in layouts.values():
             SyntaxParser().parse_layout(page_config)
-            print(page_name)
 
-        with open(layout_path_output, 'w') as f:
+        with open(output_path, 'w') as f:
             f.write(json.dumps(layouts))
+    except Exception as err:
+        return ParseStatus.ERROR, 0, time.perf_counter() - start, repr(err)
+
+    return ParseStatus.PARSED, len(layouts), time.perf_counter() - start, None
+
+
+def file_hash(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class Command(BaseCommand):
+    help = (
+        'Parse layout files, giving each component an id and populating page_object_fields. '
+        'Directories are parsed in batch across a pool of worker processes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths',
+            nargs='+',
+            type=str,
+            help='Layout files or directories, relative to the app directory',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count(),
+            help='Number of worker processes used to parse directories',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Parse files even when unchanged since the last batch parse',
+        )
+
+    def handle(self, *args, **options):
+        base_dir = Path(settings.BASE_DIR).parent
+        results = {}
+
+        for path in options['paths']:
+            path = base_dir / path
+
+            if path.is_dir():
+                results.update(self.parse_directory(path, options['workers'], options['force']))
+            elif path.is_file():
+                if not is_source_file(path):
+                    raise CommandError(f'{path} is not a .min.json layout source')
+
+                results.update(self.parse_files([(path, get_output_path(path))], workers=1))
+            else:
+                raise CommandError(f'{path} does not exist')
+
+        if errors := list(results.values()).count(ParseStatus.ERROR):
+            raise CommandError(f'{errors} file(s) failed to parse')
+
+        self.stdout.write(self.style.SUCCESS('Successfully parsed layouts'))
+
+    def parse_directory(self, directory, workers, force):
+        """
+        Parse the layout files of a directory tree, skipping files whose content hash matches the
+        manifest of the last parse. Returns a dict of input path -> status of the parsed files.
+        """
+        manifest_path = directory / MANIFEST_FILE_NAME
+        manifest = {}
+
+        if manifest_path.exists() and not force:
+            manifest = json.loads(manifest_path.read_text())
+
+        hashes = {}
+        files = []
+
+        for input_path in find_layout_files(directory):
+            name = str(input_path.relative_to(directory))
+            output_path = get_output_path(input_path)
+            hashes[name] = file_hash(input_path)
+
+            if manifest.get(name) == hashes[name] and output_path.exists():
+                self.report(name, ParseStatus.UNCHANGED)
+            else:
+                files.append((input_path, output_path))
+
+        results = self.parse_files(files, workers, relative_to=directory)
+
+        # Only record files that parsed successfully so failed files are retried next time.
+        for input_path, status in results.items():
+            if status != ParseStatus.PARSED:
+                del hashes[str(input_path.relative_to(directory))]
+
+        manifest_path.write_text(json.dumps(hashes, indent=4, sort_keys=True))
+
+        return results
+
+    def parse_files(self, files, workers, relative_to=None):
+        """
+        Parse the (input, output) file pairs across a process pool, reporting the timing of each
+        file. Returns a dict of input path -> status.
+        """
+        workers = min(workers, len(files))
+        results = {}
+
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                parsed = list(executor.map(parse_layout_file, *zip(*files)))
+        else:
+            parsed = [parse_layout_file(*x) for x in files]
+
+        for (input_path, _), (status, pages, duration, error) in zip(files, parsed):
+            name = input_path.relative_to(relative_to) if relative_to else input_path
+            self.report(name, status, pages, duration, error)
+            results[input_path] = status
+
+        return results
+
+    def report(self, name, status, pages=0, duration=0, error=None):
+        style = {
+            ParseStatus.PARSED: self.style.SUCCESS,
+            ParseStatus.ERROR: self.style.ERROR,
+        }.get(status, self.style.WARNING)
+
+        line = f'{status:>9} {duration * 1000:8.1f}ms {pages:4} page(s)  {name}'
+
+        if error:
+            line += f' ({error})'
 
-        self.stdout.write(self.style.SUCCESS('Successfully'))
+        self.stdout.write(style(line))
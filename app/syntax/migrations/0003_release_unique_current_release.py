@@ -0,0 +1,17 @@
+# Generated by Django 4.0.4 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('syntax', '0002_alter_releasesyntax_syntax_json'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='release',
+            constraint=models.UniqueConstraint(condition=models.Q(('current_release', True)), fields=('current_release',), name='unique_current_release'),
+        ),
+    ]
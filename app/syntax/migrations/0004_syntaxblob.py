@@ -0,0 +1,37 @@
+# Generated by Django 4.0.4 on 2026-10-19 10:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('syntax', '0003_release_unique_current_release'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyntaxBlob',
+            fields=[
+                ('hash', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('syntax_json', models.JSONField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='releasesyntax',
+            name='object_id',
+            field=models.CharField(default='', max_length=36),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='releasesyntax',
+            name='blob',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='syntax.syntaxblob'),
+        ),
+        migrations.AlterField(
+            model_name='releasesyntax',
+            name='syntax_json',
+            field=models.JSONField(null=True),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 4.0.4 on 2026-10-19 10:02
+
+import hashlib
+import json
+
+from django.db import migrations
+
+
+def syntax_hash(syntax_json):
+    payload = json.dumps(syntax_json, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+BATCH_SIZE = 1000
+
+
+def batches(queryset):
+    batch = []
+
+    for obj in queryset.order_by('pk').iterator(chunk_size=BATCH_SIZE):
+        batch.append(obj)
+
+        if len(batch) == BATCH_SIZE:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def move_syntax_to_blobs(apps, schema_editor):
+    ReleaseSyntax = apps.get_model('syntax', 'ReleaseSyntax')
+    SyntaxBlob = apps.get_model('syntax', 'SyntaxBlob')
+
+    for release_syntaxes in batches(ReleaseSyntax.objects.all()):
+        blobs = {}
+
+        for release_syntax in release_syntaxes:
+            hash = syntax_hash(release_syntax.syntax_json)
+            blobs[hash] = SyntaxBlob(hash=hash, syntax_json=release_syntax.syntax_json)
+            release_syntax.blob_id = hash
+            release_syntax.object_id = release_syntax.syntax_json['id']
+
+        SyntaxBlob.objects.bulk_create(blobs.values(), ignore_conflicts=True)
+        ReleaseSyntax.objects.bulk_update(release_syntaxes, ['blob', 'object_id'])
+
+
+def move_blobs_to_syntax(apps, schema_editor):
+    ReleaseSyntax = apps.get_model('syntax', 'ReleaseSyntax')
+
+    for release_syntaxes in batches(ReleaseSyntax.objects.select_related('blob')):
+        for release_syntax in release_syntaxes:
+            release_syntax.syntax_json = release_syntax.blob.syntax_json
+
+        ReleaseSyntax.objects.bulk_update(release_syntaxes, ['syntax_json'])
+
+
+# The blobs are filled in a migration of their own, so the deferred checks of the blob foreign key
+# run on commit, before the schema of releasesyntax changes again.
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('syntax', '0004_syntaxblob'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_syntax_to_blobs, move_blobs_to_syntax),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.0.4 on 2026-10-19 10:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('syntax', '0005_move_syntax_to_blobs'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='releasesyntax',
+            name='syntax_json',
+        ),
+        migrations.AlterField(
+            model_name='releasesyntax',
+            name='blob',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='syntax.syntaxblob'),
+        ),
+        migrations.AddIndex(
+            model_name='releasesyntax',
+            index=models.Index(fields=['release', 'model_type', 'object_id'], name='syntax_rele_release_f2011b_idx'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 4.0.4 on 2026-10-19 11:40
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+# A frozen copy of layout.utils.build_component_index, so the migration does not change with it.
+def child_components(component):
+    for attribute, value in (component.get('config') or {}).items():
+        if isinstance(value, dict) and 'component' in value:
+            yield [attribute], value
+        elif isinstance(value, list):
+            for i, child in enumerate(value):
+                if isinstance(child, dict) and 'component' in child:
+                    yield [attribute, i], child
+
+
+def build_component_index(layout):
+    index = {}
+    stack = [([i], component) for i, component in enumerate(layout)]
+
+    while stack:
+        path, component = stack.pop()
+
+        if component_id := component.get('id'):
+            index[str(component_id)] = path
+
+        for child_path, child in child_components(component):
+            stack.append(([*path, 'config', *child_path], child))
+
+    return index
+
+
+def index_page_blobs(apps, schema_editor):
+    SyntaxBlob = apps.get_model('syntax', 'SyntaxBlob')
+
+    blobs = SyntaxBlob.objects.filter(syntax_json__has_key='layout').order_by('pk')
+    batch = []
+
+    for blob in blobs.iterator(chunk_size=BATCH_SIZE):
+        if isinstance(blob.syntax_json['layout'], list):
+            blob.component_index = build_component_index(blob.syntax_json['layout'])
+            batch.append(blob)
+
+        if len(batch) == BATCH_SIZE:
+            SyntaxBlob.objects.bulk_update(batch, ['component_index'])
+            batch = []
+
+    SyntaxBlob.objects.bulk_update(batch, ['component_index'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('syntax', '0006_remove_releasesyntax_syntax_json'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='syntaxblob',
+            name='component_index',
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(index_page_blobs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.0.4 on 2026-10-19 12:55
+
+from django.db import migrations, models
+
+
+def copy_object_ids(apps, schema_editor):
+    ReleaseChange = apps.get_model('syntax', 'ReleaseChange')
+
+    release_changes = list(ReleaseChange.objects.order_by('-created_at'))
+    seen = set()
+    duplicates = []
+
+    for release_change in release_changes:
+        release_change.object_id = release_change.syntax_json['id']
+        key = (release_change.parent_release_id, release_change.model_type, release_change.object_id)
+
+        # Only the latest change for an object is kept.
+        if key in seen:
+            duplicates.append(release_change.id)
+        seen.add(key)
+
+    ReleaseChange.objects.filter(id__in=duplicates).delete()
+    ReleaseChange.objects.bulk_update(
+        [x for x in release_changes if x.id not in duplicates], ['object_id'], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('syntax', '0007_syntaxblob_component_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='releasechange',
+            name='object_id',
+            field=models.CharField(default='', editable=False, max_length=36),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_object_ids, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='releasechange',
+            constraint=models.UniqueConstraint(
+                fields=('parent_release', 'model_type', 'object_id'),
+                name='unique_release_change_object',
+            ),
+        ),
+    ]
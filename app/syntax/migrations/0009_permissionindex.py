@@ -0,0 +1,100 @@
+# Generated by Django 4.0.4 on 2026-10-19 00:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_permission_index(apps, schema_editor):
+    PermissionIndex = apps.get_model('syntax', 'PermissionIndex')
+    ReleaseChange = apps.get_model('syntax', 'ReleaseChange')
+    ReleaseSyntax = apps.get_model('syntax', 'ReleaseSyntax')
+
+    def build_rows(release_id, syntax_json, staged):
+        principals = [('user', x) for x in syntax_json.get('users', [])] + [
+            ('group', x) for x in syntax_json.get('groups', [])
+        ]
+
+        return [
+            PermissionIndex(
+                release_id=release_id,
+                permission_id=syntax_json['id'],
+                modelschema_id=syntax_json.get('modelschema_id'),
+                permission_name=syntax_json['permission_name'],
+                principal_type=principal_type,
+                principal_id=str(principal_id),
+                staged=staged,
+            )
+            for principal_type, principal_id in principals
+        ]
+
+    rows = []
+    syntaxes = ReleaseSyntax.objects.filter(model_type='permission').values_list(
+        'release_id', 'blob__syntax_json'
+    )
+
+    for release_id, syntax_json in syntaxes.iterator():
+        rows += build_rows(release_id, syntax_json, staged=False)
+
+    release_changes = ReleaseChange.objects.filter(model_type='permission').exclude(
+        change_type='delete'
+    )
+
+    for release_change in release_changes.iterator():
+        rows += build_rows(release_change.parent_release_id, release_change.syntax_json, True)
+
+    PermissionIndex.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('syntax', '0008_releasechange_object_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PermissionIndex',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID'
+                    ),
+                ),
+                ('permission_id', models.CharField(max_length=36)),
+                ('modelschema_id', models.CharField(blank=True, max_length=36, null=True)),
+                ('permission_name', models.CharField(max_length=255)),
+                (
+                    'principal_type',
+                    models.CharField(
+                        choices=[('user', 'User'), ('group', 'Group')], max_length=10
+                    ),
+                ),
+                ('principal_id', models.CharField(max_length=36)),
+                ('staged', models.BooleanField(default=False)),
+                (
+                    'release',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='permission_index',
+                        to='syntax.release',
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='permissionindex',
+            index=models.Index(
+                fields=['release', 'principal_type', 'principal_id'],
+                name='syntax_perm_release_693367_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='permissionindex',
+            index=models.Index(
+                fields=['release', 'modelschema_id', 'permission_name'],
+                name='syntax_perm_release_e2b113_idx',
+            ),
+        ),
+        migrations.RunPython(build_permission_index, migrations.RunPython.noop),
+    ]
@@ -1,17 +1,26 @@
 import uuid
 
-from django.db import models
-from django.db.models import F, Value
+from django.db import models, transaction
+from django.db.models import Q
+from django.utils import timezone
 
 from mptt.models import MPTTModel, TreeForeignKey
 
+from accounts.cache import invalidate_permissions
 from accounts.models import User
 from core.models import BaseModel
-from db.models import FieldSchema, ModelSchema
+from db.models import ModelSchema
 from layout.models import Page
+from layout.utils import build_component_index, get_component, patch_component
+from live.events import release_changes_updated, release_published
 from packages.models import Package
 from workflows.models import Function, Workflow
+from ._old.parser import get_page_object_fields
 from .constants import CREATE_PAGE_LAYOUT, DELETE_PAGE_LAYOUT, EDIT_PAGE_LAYOUT, LIST_PAGE_LAYOUT
+from .ddl import apply_schema_plan, create_field, plan_schema_changes
+from .diff import syntax_hash
+from .exceptions import ComponentNotFoundError, PendingChangesError, StaleReleaseError
+from .locks import lock_release, publish_lock
 
 MODEL_TYPES = [
     'modelschema',
@@ -28,6 +37,61 @@ class ReleaseChangeType(models.TextChoices):
     DELETE = 'delete'
 
 
+class ChangeMerge:
+    """
+    How a ReleaseChange is stored once merged with the existing change or syntax of its object.
+    """
+
+    NEW_OBJECT = 'new_object'  # a new object, which is given an id
+    NEW = 'new'  # the first change to a released object
+    REPLACE = 'replace'  # replaces the existing change of the object
+    DISCARD = 'discard'  # deletes an unpublished object, so its changes are removed
+
+
+class SyntaxBlob(models.Model):
+    """
+    Content addressed store of syntax JSON. Each distinct syntax object is stored once, keyed by
+    the hash of its content, and ReleaseSyntax objects point to it. Copying syntax into a new
+    release only copies the pointer and two syntax objects are equal when their hashes are.
+    """
+
+    hash = models.CharField(max_length=64, primary_key=True)
+    syntax_json = models.JSONField()
+    # For page syntax, the id -> path index of the components in the layout.
+    component_index = models.JSONField(null=True, blank=True, editable=False)
+
+    def __str__(self):
+        return self.hash
+
+    @staticmethod
+    def get_component_index(syntax_json):
+        layout = syntax_json.get('layout')
+
+        if isinstance(layout, list):
+            return build_component_index(layout)
+
+        return None
+
+    @classmethod
+    def store(cls, syntax_jsons):
+        """
+        Store the given syntax objects if they are not already stored, returning their hashes in
+        the same order.
+        """
+        hashes = [syntax_hash(syntax_json) for syntax_json in syntax_jsons]
+        blobs = {
+            hash: cls(
+                hash=hash,
+                syntax_json=syntax_json,
+                component_index=cls.get_component_index(syntax_json),
+            )
+            for hash, syntax_json in zip(hashes, syntax_jsons)
+        }
+        cls.objects.bulk_create(blobs.values(), ignore_conflicts=True)
+
+        return hashes
+
+
 class ReleaseSyntax(BaseModel):
     """
     Rather than store the each syntax JSON as a unique field on the Release model, it is stored
@@ -43,7 +107,8 @@ class ReleaseSyntax(BaseModel):
         ...[unique data for each model type]
     }
 
-    Indexes are made on the id and model_id keys for faster lookups.
+    The syntax itself is stored in a SyntaxBlob and the object id is copied to the object_id
+    column, which is indexed for faster lookups.
     """
 
     release = models.ForeignKey(
@@ -53,29 +118,72 @@ class ReleaseSyntax(BaseModel):
     )
 
     model_type = models.CharField(max_length=30)
-    syntax_json = models.JSONField()
+    object_id = models.CharField(max_length=36)
+    blob = models.ForeignKey(SyntaxBlob, on_delete=models.PROTECT, related_name='+')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['release', 'model_type', 'object_id']),
+        ]
+
+    @property
+    def syntax_json(self):
+        return self.blob.syntax_json
+
+    @syntax_json.setter
+    def syntax_json(self, syntax_json):
+        self.object_id = syntax_json['id']
+        self.blob = SyntaxBlob(
+            hash=syntax_hash(syntax_json),
+            syntax_json=syntax_json,
+            component_index=SyntaxBlob.get_component_index(syntax_json),
+        )
+
+    def get_component(self, component_id):
+        """
+        Return a component of a page by its id, using the component index of the syntax.
+        """
+        path = (self.blob.component_index or {}).get(component_id)
+
+        if path is None:
+            return None
+
+        return get_component(self.syntax_json['layout'], path)
+
+    def save(self, *args, **kwargs):
+        # Syntax assigned through syntax_json is not stored until the object is saved.
+        if self._meta.get_field('blob').is_cached(self) and self.blob._state.adding:
+            SyntaxBlob.store([self.blob.syntax_json])
+
+        super().save(*args, **kwargs)
 
     @classmethod
     def get_modelschema_id_from_name(cls, release, model_name):
         """
         Return the id of a modelschema by its model_name field.
         """
-        release_syntax = cls.objects.filter(
-            release=release, model_type='modelschema', syntax_json__model_name=model_name
-        ).first()
-
-        if release_syntax:
-            return release_syntax.syntax_json['id']
-        return
+        return (
+            cls.objects.filter(
+                release=release,
+                model_type='modelschema',
+                blob__syntax_json__model_name=model_name,
+            )
+            .values_list('object_id', flat=True)
+            .first()
+        )
 
     @classmethod
     def get_page(cls, release, modelschema_id, page_name):
-        return cls.objects.filter(
-            release=release,
-            model_type='page',
-            syntax_json__modelschema_id=modelschema_id,
-            syntax_json__page_name=page_name,
-        ).first()
+        return (
+            cls.objects.filter(
+                release=release,
+                model_type='page',
+                blob__syntax_json__modelschema_id=modelschema_id,
+                blob__syntax_json__page_name=page_name,
+            )
+            .select_related('blob')
+            .first()
+        )
 
 
 class Release(MPTTModel):
@@ -90,6 +198,15 @@ class Release(MPTTModel):
     class MPTTMeta:
         order_insertion_by = ['release_version']
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['current_release'],
+                condition=Q(current_release=True),
+                name='unique_current_release',
+            ),
+        ]
+
     release_version = models.CharField(max_length=10, unique=True)
     release_notes = models.TextField()
     released_at = models.DateTimeField(auto_now_add=True)
@@ -108,11 +225,17 @@ class Release(MPTTModel):
         return cls.objects.get(current_release=True)
 
     def save(self, *args, **kwargs):
-        is_new = self.pk is None
+        if self.pk is not None:
+            super().save(*args, **kwargs)
+            return
 
-        super().save(*args, **kwargs)
+        # Publishing is serialised by an advisory lock (which also guards the MPTT tree updates)
+        # and the parent row lock, which waits for any in-flight ReleaseChange writes.
+        with publish_lock():
+            if self.parent_id and not lock_release(self.parent_id):
+                raise StaleReleaseError(f'Release {self.parent} is no longer the current release.')
 
-        if is_new:
+            super().save(*args, **kwargs)
             self._create_release()
 
     def _create_release(self):
@@ -121,27 +244,48 @@ class Release(MPTTModel):
         to pull in all of the changes, merge it with the last parent Releases' syntax and add it to
         the model.
         """
-        Release.objects.all().update(current_release=False)
+        Release.objects.filter(current_release=True).exclude(id=self.id).update(
+            current_release=False
+        )
         Release.objects.filter(id=self.id).update(current_release=True)
+        self.current_release = True
 
         if self.parent:
             # Create the new syntax from the existing and changes and add to ReleaseSyntax model.
-            release_syntax_models = []
-
-            for model_type in MODEL_TYPES:
-                syntaxes = self.get_syntax_definitions(model_type, release=self.parent)
-
-                for syntax_json in syntaxes:
-                    if syntax_json:
-                        release_syntax_models.append(
-                            ReleaseSyntax(
-                                release=self,
-                                model_type=model_type,
-                                syntax_json=syntax_json,
-                            )
-                        )
+            # Syntax untouched by a change is copied as a pointer to the existing SyntaxBlob.
+            release_changes = list(self.parent.release_changes.all())
+            changed_ids = [x.syntax_json['id'] for x in release_changes]
+
+            release_syntax_models = [
+                ReleaseSyntax(
+                    release=self,
+                    model_type=model_type,
+                    object_id=object_id,
+                    blob_id=blob_id,
+                )
+                for model_type, object_id, blob_id in self.parent.syntax.exclude(
+                    object_id__in=changed_ids
+                )
+                .values_list('model_type', 'object_id', 'blob_id')
+                .iterator()
+            ]
+
+            release_changes = [
+                x for x in release_changes if x.change_type != ReleaseChangeType.DELETE
+            ]
+            hashes = SyntaxBlob.store([x.syntax_json for x in release_changes])
+
+            for release_change, blob_id in zip(release_changes, hashes):
+                release_syntax_models.append(
+                    ReleaseSyntax(
+                        release=self,
+                        model_type=release_change.model_type,
+                        object_id=release_change.syntax_json['id'],
+                        blob_id=blob_id,
+                    )
+                )
 
-            ReleaseSyntax.objects.bulk_create(release_syntax_models)
+            ReleaseSyntax.objects.bulk_create(release_syntax_models, batch_size=1000)
 
             # Apply database changes.
             model_schema_changes = self._get_release_changes(
@@ -149,7 +293,46 @@ class Release(MPTTModel):
             )
             self._apply_database_migrations(model_schema_changes)
 
+            PermissionIndex.build(self)
+            PermissionIndex.objects.filter(release=self.parent, staged=True).delete()
+
         ReleaseChange.objects.filter(parent_release=self.parent).delete()
+        # The cached permissions of users are those of the previous current release.
+        transaction.on_commit(invalidate_permissions)
+        release_published(self)
+
+    def restore(self, dry_run=False):
+        """
+        Make this release the current release. The dynamic tables are reconciled to the state of
+        this release by applying only the changes between the modelschemas of the current release
+        and this release. Returns the plan of schema operations applied.
+        """
+        with publish_lock():
+            current_release = Release.objects.select_for_update().get(current_release=True)
+
+            if current_release.pk == self.pk:
+                return []
+
+            if current_release.release_changes.exists():
+                raise PendingChangesError(
+                    'The current release has unpublished changes, publish or discard them first.'
+                )
+
+            plan = plan_schema_changes(current_release, self)
+
+            if dry_run:
+                return plan
+
+            apply_schema_plan(plan)
+
+            Release.objects.filter(id=current_release.id).update(current_release=False)
+            Release.objects.filter(id=self.id).update(current_release=True)
+            self.current_release = True
+
+        transaction.on_commit(invalidate_permissions)
+        release_published(self)
+
+        return plan
 
     def _apply_database_migrations(self, release_changes):
         """
@@ -157,45 +340,6 @@ class Release(MPTTModel):
         tracked using the ModelSchema model (within the db app):
          - CREATE: create a new model with all fields.
         """
-
-        def get_class_name(field_type):
-            fields = {
-                'text': 'django.db.models.TextField',
-                'email': 'django.db.models.EmailField',
-                'float': 'django.db.models.FloatField',
-                'date': 'django.db.models.DateField',
-                'datetime': 'django.db.models.DateTimeField',
-                'fk': 'django.db.models.ForeignKey',
-            }
-            return fields.get(field_type, fields['text'])
-
-        def get_kwargs(field):
-            field_type = field['field_type']
-            required = field['required']
-
-            if field_type == 'fk':
-                return {
-                    'on_delete': models.CASCADE,
-                    'to': ModelSchema.objects.get(id=field["modelschema_id"]).name,
-                    'null': not required,
-                }
-            elif field_type in ['float', 'datetime', 'date']:
-                return {
-                    'null': not required,
-                }
-            elif field_type in ['text', 'email']:
-                return {
-                    'blank': True,
-                }
-
-        def create_field(model_schema, field):
-            FieldSchema.objects.create(
-                model_schema=model_schema,
-                name=field['field_name'],
-                class_name=get_class_name(field['field_type']),
-                kwargs=get_kwargs(field),
-            )
-
         for release_change in release_changes:
             if release_change.change_type == ReleaseChangeType.CREATE:
                 # Create model schema and fields.
@@ -225,25 +369,37 @@ class Release(MPTTModel):
                     model_schema.delete()
 
                     ReleaseSyntax.objects.filter(
-                        syntax_json__modelschema_id=release_change.syntax_json['id']
+                        release=self,
+                        blob__syntax_json__modelschema_id=release_change.syntax_json['id'],
                     ).delete()
 
     def get_syntax_definitions(
-        self, model_type, object_id=None, release=None, include_changes=True, **kwargs
+        self,
+        model_type,
+        object_id=None,
+        release=None,
+        include_changes=True,
+        object_ids=None,
+        **kwargs,
     ):
         """
         This method returns the all of the syntax definitions for a given model. However, a release
         only contains the current committed changes to an application. This means there may exist
         updated to one of the syntaxes within a ReleaseChange model.
+
+        object_ids (a list or subquery) limits the syntax to the given objects.
         """
         if kwargs:
             for key in list(kwargs):
                 kwargs[f'syntax_json__{key}'] = kwargs.pop(key)
 
+        if object_ids is not None:
+            kwargs['object_id__in'] = object_ids
+
         release_syntaxes = list(
             self._get_release_syntax(
                 model_type, object_id=object_id, release=release, **kwargs
-            ).values_list('syntax_json', flat=True)
+            ).values_list('blob__syntax_json', flat=True)
         )
 
         syntax = release_syntaxes
@@ -262,6 +418,46 @@ class Release(MPTTModel):
             return {}
         return syntax
 
+    def patch_page_component(self, page_id, component_id, config):
+        """
+        Update the config of a single component of a page, recording the updated page as a
+        ReleaseChange as every other layout edit is. Returns the updated component.
+
+        The component is found with the component index stored with the released page, the index
+        is only built for a page with unpublished changes.
+        """
+        release_change = self.release_changes.filter(model_type='page', object_id=page_id).first()
+
+        if release_change is not None:
+            if release_change.change_type == ReleaseChangeType.DELETE:
+                raise ComponentNotFoundError(f'Page {page_id} not found')
+
+            page = release_change.syntax_json
+            component_index = build_component_index(page['layout'])
+        else:
+            release_syntax = (
+                self.syntax.select_related('blob')
+                .filter(model_type='page', object_id=page_id)
+                .first()
+            )
+
+            if release_syntax is None:
+                raise ComponentNotFoundError(f'Page {page_id} not found')
+
+            page = release_syntax.syntax_json
+            component_index = release_syntax.blob.component_index or {}
+
+        component = patch_component(page['layout'], component_index, component_id, config)
+
+        ReleaseChange(
+            parent_release=self,
+            change_type=ReleaseChangeType.UPDATE,
+            model_type='page',
+            syntax_json=page,
+        ).save(object_id=page_id)
+
+        return component
+
     def _get_release_syntax(self, model_type, object_id=None, release=None, **kwargs):
         if release is None:
             release = self
@@ -269,10 +465,16 @@ class Release(MPTTModel):
         syntax = release.syntax.filter(model_type=model_type)
 
         if object_id:
-            syntax = syntax.filter(syntax_json__id=object_id)
+            syntax = syntax.filter(object_id=object_id)
+
+        object_ids = kwargs.pop('object_id__in', None)
+
+        if object_ids is not None:
+            syntax = syntax.filter(object_id__in=object_ids)
 
         if kwargs:
-            syntax = syntax.filter(**kwargs)
+            # Syntax filters (syntax_json__*) are made against the blob.
+            syntax = syntax.filter(**{f'blob__{key}': value for key, value in kwargs.items()})
 
         return syntax
 
@@ -283,7 +485,7 @@ class Release(MPTTModel):
         syntax = release.release_changes.filter(model_type=model_type)
 
         if object_id:
-            syntax = syntax.filter(syntax_json__id=object_id)
+            syntax = syntax.filter(object_id=object_id)
 
         if kwargs:
             syntax = syntax.filter(**kwargs)
@@ -333,69 +535,228 @@ class ReleaseChange(BaseModel):
 
     change_type = models.CharField(max_length=10, choices=ReleaseChangeType.choices)
     model_type = models.CharField(max_length=30)
+    object_id = models.CharField(max_length=36, editable=False)
     syntax_json = models.JSONField()
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['parent_release', 'model_type', 'object_id'],
+                name='unique_release_change_object',
+            ),
+        ]
+
     def __str__(self):
         return f'{self.change_type} {self.model_type} {self.syntax_json["id"]}'
 
     def save(self, *args, object_id=None, **kwargs):
-        if release_change := self.get_existing_release_change(object_id):
-            existing_syntax = dict(release_change.syntax_json)
-            release_change.delete()
+        with transaction.atomic():
+            if not lock_release(self.parent_release_id):
+                raise StaleReleaseError(
+                    f'Release {self.parent_release} is no longer the current release.'
+                )
+
+            self._save_change(*args, object_id=object_id, **kwargs)
+
+    def _save_change(self, *args, object_id=None, **kwargs):
+        """
+        Store the change, replacing any existing change for the same object in place. The parent
+        release row lock held by save() serialises writes, so the existing change read here cannot
+        be changed or inserted concurrently.
+        """
+        release_change = self.get_existing_release_change(object_id)
+        release_syntax = None if release_change else self._get_existing_release_syntax(object_id)
+
+        merge = self.merge(release_change, release_syntax.syntax_json if release_syntax else None)
+
+        if merge == ChangeMerge.DISCARD:
+            ReleaseChange.objects.filter(parent_release=self.parent_release_id).filter(
+                Q(pk=release_change.pk) | Q(syntax_json__modelschema_id=self.object_id)
+            ).delete()
+            PermissionIndex.unstage(self.parent_release_id, [self.object_id])
+            release_changes_updated(self.parent_release_id)
+            return
+
+        super().save(*args, **kwargs)
+
+        if merge == ChangeMerge.NEW_OBJECT:
+            default_changes = self.get_default_changes()
+            ReleaseChange.objects.bulk_create(default_changes)
+            PermissionIndex.stage(self.parent_release_id, [self, *default_changes], replace=False)
+        else:
+            PermissionIndex.stage(self.parent_release_id, [self])
+
+        release_changes_updated(self.parent_release_id)
+
+    def merge(self, release_change=None, existing_syntax=None):
+        """
+        Merge this change with the existing change or released syntax of its object, without
+        making any queries, and return how the change is to be stored (see ChangeMerge).
+        """
+        self._prepare_syntax()
+
+        if release_change:
+            existing_syntax = release_change.syntax_json
             previous_change_type = release_change.change_type
-        elif release_syntax := self._get_existing_release_syntax(object_id):
-            existing_syntax = dict(release_syntax.syntax_json)
-            previous_change_type = None
         else:
-            existing_syntax = None
             previous_change_type = None
 
-        self.syntax_json = dict(self.syntax_json)
+        if not existing_syntax:
+            self._prepare_new_syntax()
+            return ChangeMerge.NEW_OBJECT
+
+        self.object_id = self.syntax_json['id'] = existing_syntax['id']
+
+        if 'modelschema_id' in existing_syntax:
+            self.syntax_json['modelschema_id'] = existing_syntax['modelschema_id']
+
+        # If the resource does not exist in the db yet, and prev change was create, make sure
+        # this is also a create.
+        if (
+            previous_change_type == ReleaseChangeType.CREATE
+            and self.change_type == ReleaseChangeType.UPDATE
+        ):
+            self.change_type = ReleaseChangeType.CREATE
+
+        # If the resource does not exist in the db yet, don't create change and delete the change
+        # and related changes.
+        if (
+            previous_change_type == ReleaseChangeType.CREATE
+            and self.change_type == ReleaseChangeType.DELETE
+        ):
+            return ChangeMerge.DISCARD
+
+        if not release_change:
+            return ChangeMerge.NEW
 
-        if existing_syntax:
-            self.syntax_json['id'] = existing_syntax['id']
-
-            if 'modelschema_id' in existing_syntax:
-                self.syntax_json['modelschema_id'] = existing_syntax['modelschema_id']
-
-            # If the resource does not exist in the db yet, and prev change was create, make sure
-            # this is also a create.
-            if (
-                previous_change_type == ReleaseChangeType.CREATE
-                and self.change_type == ReleaseChangeType.UPDATE
-            ):
-                self.change_type = ReleaseChangeType.CREATE
-
-            # If the resource does not exist in the db yet, don't create change and delete related
-            # changes.
-            if (
-                previous_change_type == ReleaseChangeType.CREATE
-                and self.change_type == ReleaseChangeType.DELETE
-            ):
-                (
-                    ReleaseChange.objects.annotate(modelschema_id=F('syntax_json__modelschema_id'))
-                    .filter(modelschema_id=self.syntax_json['id'])
-                    .delete()
+        # Replace the existing change in place.
+        self.pk = release_change.pk
+        self.created_at = release_change.created_at
+        self.updated_at = timezone.now()
+        self._state.adding = release_change._state.adding
+
+        return ChangeMerge.REPLACE
+
+    @classmethod
+    def bulk_save(cls, release, release_changes, object_ids):
+        """
+        Save many changes against a release with a fixed number of queries, as if each was saved
+        in turn with save(object_id=...). Changes later in the list see the earlier ones. Returns
+        the merged changes, with None for changes that cancelled out an unpublished object.
+        """
+        with transaction.atomic():
+            if not lock_release(release.id):
+                raise StaleReleaseError(f'Release {release} is no longer the current release.')
+
+            ids = [x for x in object_ids if x]
+            existing_changes = {
+                (x.model_type, x.object_id): x
+                for x in cls.objects.filter(parent_release=release, object_id__in=ids)
+            }
+            existing_syntax = {
+                (x.model_type, x.object_id): x.syntax_json
+                for x in ReleaseSyntax.objects.filter(
+                    release=release, object_id__in=ids
+                ).select_related('blob')
+            }
+
+            # The state of each object's change after the batch, keyed by (model_type, object id).
+            changes = dict(existing_changes)
+            discarded_ids = set()
+            merged = []
+
+            for release_change, object_id in zip(release_changes, object_ids):
+                release_change.parent_release = release
+                key = (release_change.model_type, str(object_id)) if object_id else None
+                merge = release_change.merge(
+                    changes.get(key), None if key in changes else existing_syntax.get(key)
                 )
-                return
 
-            create_pages = False
-        else:
-            self._generate_id()
+                if merge == ChangeMerge.DISCARD:
+                    discarded_ids.add(release_change.object_id)
+                    changes = {
+                        k: v
+                        for k, v in changes.items()
+                        if k != key
+                        and v.syntax_json.get('modelschema_id') != release_change.object_id
+                    }
+                    merged.append(None)
+                    continue
+
+                changes[(release_change.model_type, release_change.object_id)] = release_change
+                merged.append(release_change)
+
+                if merge == ChangeMerge.NEW_OBJECT:
+                    for default_change in release_change.get_default_changes():
+                        changes[
+                            (default_change.model_type, default_change.object_id)
+                        ] = default_change
+
+            if discarded_ids:
+                cls.objects.filter(parent_release=release).filter(
+                    Q(object_id__in=discarded_ids)
+                    | Q(syntax_json__modelschema_id__in=list(discarded_ids))
+                ).delete()
+
+            changed = [x for k, x in changes.items() if x is not existing_changes.get(k)]
+            cls.objects.bulk_create([x for x in changed if x._state.adding], batch_size=1000)
+            cls.objects.bulk_update(
+                [x for x in changed if not x._state.adding],
+                ['change_type', 'syntax_json', 'updated_at'],
+                batch_size=1000,
+            )
 
-            if (
-                self.model_type != ModelSchema._meta.model_name
-                and 'modelschema_id' not in self.syntax_json
-            ):
-                self.syntax_json['modelschema_id'] = None
+            if discarded_ids:
+                PermissionIndex.unstage(release.id, discarded_ids)
 
-            create_pages = True
+            PermissionIndex.stage(release.id, changed)
+            release_changes_updated(release.id)
 
-        super().save(*args, **kwargs)
+        return merged
 
-        if create_pages and self.model_type == ModelSchema._meta.model_name:
-            self._create_default_pages()
-            self._create_default_permissions()
+    def _prepare_syntax(self):
+        """
+        Copy the syntax and add the values derived from it.
+        """
+        self.syntax_json = dict(self.syntax_json)
+
+        if self.model_type == Page._meta.model_name and isinstance(
+            self.syntax_json.get('layout'), list
+        ):
+            # Store the fields the page needs so only those are loaded when rendering the page.
+            self.syntax_json['page_object_fields'] = get_page_object_fields(
+                self.syntax_json['layout']
+            )
+
+    def _prepare_new_syntax(self):
+        """
+        Give the syntax of a new object its id.
+        """
+        self._generate_id()
+        self.object_id = self.syntax_json['id']
+
+        if (
+            self.model_type != ModelSchema._meta.model_name
+            and 'modelschema_id' not in self.syntax_json
+        ):
+            self.syntax_json['modelschema_id'] = None
+
+    @classmethod
+    def build_new(cls, parent_release, model_type, syntax_json):
+        """
+        Return an unsaved CREATE change for a new object, for use with bulk_create. The parent
+        release must be locked by the caller.
+        """
+        release_change = cls(
+            parent_release=parent_release,
+            change_type=ReleaseChangeType.CREATE,
+            model_type=model_type,
+            syntax_json=syntax_json,
+        )
+        release_change._prepare_syntax()
+        release_change._prepare_new_syntax()
+
+        return release_change
 
     def _get_existing_release_syntax(self, object_id):
         """
@@ -407,14 +768,11 @@ class ReleaseChange(BaseModel):
 
         return (
             ReleaseSyntax.objects.filter(
-                release=self.parent_release,
+                release=self.parent_release_id,
                 model_type=self.model_type,
+                object_id=object_id,
             )
-            .annotate(
-                object_id=F('syntax_json__id'),
-                change_type=Value(None, output_field=models.CharField()),
-            )
-            .filter(object_id=object_id)
+            .select_related('blob')
             .first()
         )
 
@@ -422,47 +780,29 @@ class ReleaseChange(BaseModel):
         if not object_id:
             return
 
-        return (
-            ReleaseChange.objects.filter(
-                parent_release=self.parent_release,
-                model_type=self.model_type,
-            )
-            .annotate(object_id=F('syntax_json__id'))
-            .filter(object_id=object_id)
-            .first()
-        )
+        return ReleaseChange.objects.filter(
+            parent_release=self.parent_release_id,
+            model_type=self.model_type,
+            object_id=object_id,
+        ).first()
 
     def _generate_id(self):
-        # Get all existing ids in the parent release as well as other change creations.
-        release_syntax_ids = list(
-            ReleaseSyntax.objects.filter(
-                release=self.parent_release,
-                model_type=self.model_type,
-            )
-            .annotate(object_id=F('syntax_json__id'))
-            .values_list('object_id', flat=True)
-        )
-        release_change_ids = list(
-            ReleaseChange.objects.filter(
-                parent_release=self.parent_release,
-                model_type=self.model_type,
-                change_type=ReleaseChangeType.CREATE,
-            )
-            .annotate(object_id=F('syntax_json__id'))
-            .values_list('object_id', flat=True)
-        )
+        # Ids are random UUIDs so no existing ids need to be loaded to avoid a collision. The
+        # unique constraint on the object id guards against the (negligible) chance of one.
+        self.syntax_json['id'] = str(uuid.uuid4())
 
-        existing_ids = release_syntax_ids + release_change_ids
-
-        object_id = uuid.uuid4()
-        while object_id in existing_ids:
-            object_id = uuid.uuid4()
+    def get_default_changes(self):
+        """
+        Return the unsaved default pages and permissions for a new model.
+        """
+        if self.model_type != ModelSchema._meta.model_name:
+            return []
 
-        self.syntax_json['id'] = str(object_id)
+        return self._get_default_pages() + self._get_default_permissions()
 
-    def _create_default_pages(self):
+    def _get_default_pages(self):
         """
-        Create the default pages for a model.
+        Return the default pages for a model.
         """
         pages = [
             ('list', LIST_PAGE_LAYOUT),
@@ -471,23 +811,22 @@ class ReleaseChange(BaseModel):
             ('delete', DELETE_PAGE_LAYOUT),
         ]
 
-        for page_name, layout in pages:
-            syntax_json = {
-                'page_name': page_name,
-                'modelschema_id': self.syntax_json['id'],
-                'layout': layout,
-            }
-
-            ReleaseChange.objects.create(
-                parent_release=self.parent_release,
-                change_type=ReleaseChangeType.CREATE,
-                model_type='page',
-                syntax_json=syntax_json,
+        return [
+            ReleaseChange.build_new(
+                self.parent_release,
+                'page',
+                {
+                    'page_name': page_name,
+                    'modelschema_id': self.syntax_json['id'],
+                    'layout': layout,
+                },
             )
+            for page_name, layout in pages
+        ]
 
-    def _create_default_permissions(self):
+    def _get_default_permissions(self):
         """
-        Create the default permissions for a model.
+        Return the default permissions for a model.
         """
         permissions = [
             'View',
@@ -495,17 +834,186 @@ class ReleaseChange(BaseModel):
             'Delete',
         ]
 
-        for permission in permissions:
-            syntax_json = {
-                'permission_name': permission,
-                'modelschema_id': self.syntax_json['id'],
-                'groups': [],
-                'users': [],
-            }
+        return [
+            ReleaseChange.build_new(
+                self.parent_release,
+                'permission',
+                {
+                    'permission_name': permission,
+                    'modelschema_id': self.syntax_json['id'],
+                    'groups': [],
+                    'users': [],
+                },
+            )
+            for permission in permissions
+        ]
 
-            ReleaseChange.objects.create(
-                parent_release=self.parent_release,
-                change_type=ReleaseChangeType.CREATE,
-                model_type='permission',
-                syntax_json=syntax_json,
+
+class PrincipalType(models.TextChoices):
+    USER = 'user'
+    GROUP = 'group'
+
+
+class PermissionIndex(models.Model):
+    """
+    Index of the users and groups given each permission of a release, so the permissions of a
+    user, group or model are key lookups rather than a scan of every permission syntax object.
+    There is a row for each (permission, user or group) pair.
+
+    Published rows are built from the release syntax on publish. The pending permission
+    ReleaseChanges of a release are indexed as staged rows, which take the place of the published
+    rows of the same permission when changes are included.
+    """
+
+    release = models.ForeignKey(
+        Release,
+        on_delete=models.CASCADE,
+        related_name='permission_index',
+    )
+
+    permission_id = models.CharField(max_length=36)
+    modelschema_id = models.CharField(max_length=36, null=True, blank=True)
+    permission_name = models.CharField(max_length=255)
+    principal_type = models.CharField(max_length=10, choices=PrincipalType.choices)
+    principal_id = models.CharField(max_length=36)
+    staged = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['release', 'principal_type', 'principal_id']),
+            models.Index(fields=['release', 'modelschema_id', 'permission_name']),
+        ]
+
+    def __str__(self):
+        return f'{self.permission_name} {self.principal_type} {self.principal_id}'
+
+    @classmethod
+    def _build_rows(cls, release_id, syntax_json, staged=False):
+        principals = [(PrincipalType.USER, x) for x in syntax_json.get('users', [])] + [
+            (PrincipalType.GROUP, x) for x in syntax_json.get('groups', [])
+        ]
+
+        return [
+            cls(
+                release_id=release_id,
+                permission_id=syntax_json['id'],
+                modelschema_id=syntax_json.get('modelschema_id'),
+                permission_name=syntax_json['permission_name'],
+                principal_type=principal_type,
+                principal_id=str(principal_id),
+                staged=staged,
             )
+            for principal_type, principal_id in principals
+        ]
+
+    @classmethod
+    def build(cls, release):
+        """
+        Index the published permissions of a release.
+        """
+        syntaxes = release.syntax.filter(model_type='permission').values_list(
+            'blob__syntax_json', flat=True
+        )
+        rows = [
+            x
+            for syntax_json in syntaxes.iterator()
+            for x in cls._build_rows(release.id, syntax_json)
+        ]
+
+        cls.objects.filter(release=release, staged=False).delete()
+        cls.objects.bulk_create(rows, batch_size=1000)
+
+    @classmethod
+    def stage(cls, release_id, release_changes, replace=True):
+        """
+        Index the permissions of the given saved ReleaseChanges as staged rows, replacing their
+        existing staged rows unless the permissions are new. Other changes are ignored.
+        """
+        release_changes = [x for x in release_changes if x.model_type == 'permission']
+
+        if not release_changes:
+            return
+
+        if replace:
+            cls.objects.filter(
+                release_id=release_id,
+                staged=True,
+                permission_id__in=[x.object_id for x in release_changes],
+            ).delete()
+
+        rows = [
+            x
+            for release_change in release_changes
+            if release_change.change_type != ReleaseChangeType.DELETE
+            for x in cls._build_rows(release_id, release_change.syntax_json, staged=True)
+        ]
+
+        if rows:
+            cls.objects.bulk_create(rows, batch_size=1000)
+
+    @classmethod
+    def unstage(cls, release_id, object_ids):
+        """
+        Remove the staged rows of discarded permissions, and of the permissions of discarded
+        modelschemas.
+        """
+        object_ids = list(object_ids)
+
+        cls.objects.filter(release_id=release_id, staged=True).filter(
+            Q(permission_id__in=object_ids) | Q(modelschema_id__in=object_ids)
+        ).delete()
+
+    @classmethod
+    def lookup(cls, release, include_changes=True):
+        """
+        Return the rows in effect for a release. With changes included, the staged rows replace
+        the published rows of permissions that have a pending change.
+        """
+        rows = cls.objects.filter(release=release)
+
+        if not include_changes:
+            return rows.filter(staged=False)
+
+        changed_ids = release.release_changes.filter(model_type='permission').values('object_id')
+
+        return rows.filter(Q(staged=True) | ~Q(permission_id__in=changed_ids))
+
+    @classmethod
+    def for_principals(cls, release, user=None, group_ids=(), include_changes=True):
+        """
+        Return the rows in effect for a user, directly or through their groups, or for any of the
+        given groups.
+        """
+        if user is not None:
+            group_ids = list(user.groups.values_list('id', flat=True))
+
+        principals = Q(
+            principal_type=PrincipalType.GROUP, principal_id__in=[str(x) for x in group_ids]
+        )
+
+        if user is not None:
+            principals |= Q(principal_type=PrincipalType.USER, principal_id=str(user.id))
+
+        return cls.lookup(release, include_changes=include_changes).filter(principals)
+
+    @classmethod
+    def get_permission_ids(cls, release, user=None, group_ids=(), include_changes=True):
+        """
+        Return a subquery of the ids of the permissions given to a user or groups.
+        """
+        return (
+            cls.for_principals(release, user, group_ids, include_changes)
+            .values('permission_id')
+            .distinct()
+        )
+
+    @classmethod
+    def get_user_permissions(cls, release, user):
+        """
+        Return the set of (modelschema id, permission name) pairs published for a user.
+        """
+        return frozenset(
+            cls.for_principals(release, user, include_changes=False).values_list(
+                'modelschema_id', 'permission_name'
+            )
+        )
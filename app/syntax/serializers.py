@@ -1,6 +1,9 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+
 from rest_framework import serializers
 
-from .models import Release, ReleaseChange
+from .models import MODEL_TYPES, Release, ReleaseChange, ReleaseChangeType
+from .validation import validate_release_change
 
 
 class ReleaseSerializer(serializers.ModelSerializer):
@@ -25,6 +28,9 @@ class ReleaseSerializer(serializers.ModelSerializer):
         }
 
     def get_unapplied_changes(self, obj):
+        # Listings annotate the count to avoid a query per release.
+        if hasattr(obj, 'release_change_count'):
+            return obj.release_change_count
         return obj.release_changes.count()
 
     def validate(self, data):
@@ -60,3 +66,52 @@ class ReleaseChangeSerializer(serializers.ModelSerializer):
             'syntax_json',
             'created_at',
         ]
+
+
+class BatchReleaseChangeSerializer(serializers.Serializer):
+    """
+    Serializer for a single change in a batch of changes made in the developer site. The validated
+    data holds the unsaved ReleaseChange.
+    """
+
+    change_type = serializers.ChoiceField(choices=ReleaseChangeType.choices)
+    model_type = serializers.ChoiceField(choices=MODEL_TYPES)
+    object_id = serializers.UUIDField(required=False, allow_null=True)
+    syntax_json = serializers.DictField(required=False, default=dict)
+
+    def validate(self, data):
+        if data['change_type'] != ReleaseChangeType.CREATE and not data.get('object_id'):
+            raise serializers.ValidationError(
+                {'object_id': 'This field is required to update or delete an object.'}
+            )
+
+        release_change = ReleaseChange(
+            change_type=data['change_type'],
+            model_type=data['model_type'],
+            syntax_json=data['syntax_json'],
+        )
+
+        try:
+            validate_release_change(release_change)
+        except DjangoValidationError as err:
+            raise serializers.ValidationError({'syntax_json': err.messages})
+
+        data['release_change'] = release_change
+
+        return data
+
+
+class ComponentPatchSerializer(serializers.Serializer):
+    """
+    Serializer for an update of the config of a single component of a page.
+    """
+
+    config = serializers.DictField()
+
+
+class ReleaseRestoreSerializer(serializers.Serializer):
+    """
+    Serializer for the options of restoring a release.
+    """
+
+    dry_run = serializers.BooleanField(default=False)
@@ -0,0 +1,76 @@
+"""
+Substitution of placeholders in syntax (e.g. page layouts).
+
+A Template walks the syntax once and compiles it into a renderer, so any number of substitutions
+are rendered in a single pass with no JSON re-serialisation. Two kinds of placeholder are
+supported:
+
+- ``${name}`` inside a string is interpolated, e.g. ``'Edit ${model}'``. A string that is exactly
+  one placeholder is replaced by the value itself, which need not be a string.
+- Literal strings given at compile time (e.g. ``'__all__'``) are replaced by the value when they
+  are the whole string, never when they appear inside another string.
+
+Placeholders missing from the render context are left untouched (e.g. ``${id}`` is filled in by
+the client).
+"""
+import re
+from typing import Any, Dict, Iterable
+
+PLACEHOLDER_RE = re.compile(r'\$\{(\w+)\}')
+
+
+class Template:
+    def __init__(self, syntax: Any, literals: Iterable[str] = ()):
+        self.literals = frozenset(literals)
+        self.placeholders = set()
+        self._render = self._compile(syntax)
+
+    def render(self, context: Dict[str, Any]) -> Any:
+        """
+        Return a new copy of the syntax with the placeholders in the context substituted.
+        """
+        return self._render(context)
+
+    def _compile(self, value):
+        if isinstance(value, dict):
+            items = [(key, self._compile(x)) for key, x in value.items()]
+            return lambda context: {key: render(context) for key, render in items}
+        elif isinstance(value, list):
+            renders = [self._compile(x) for x in value]
+            return lambda context: [render(context) for render in renders]
+        elif isinstance(value, str):
+            return self._compile_string(value)
+
+        return lambda context: value
+
+    def _compile_string(self, value):
+        if value in self.literals:
+            self.placeholders.add(value)
+            return lambda context: context.get(value, value)
+
+        # Odd indexes are placeholder names, even indexes the text between them.
+        parts = PLACEHOLDER_RE.split(value)
+
+        if len(parts) == 1:
+            return lambda context: value
+
+        names = parts[1::2]
+        self.placeholders.update(names)
+
+        if parts[0] == parts[2] == '' and len(parts) == 3:
+            name = names[0]
+            return lambda context: context.get(name, value)
+
+        def render(context):
+            return ''.join(
+                str(context.get(x, f'${{{x}}}')) if i % 2 else x for i, x in enumerate(parts)
+            )
+
+        return render
+
+
+def render_syntax(syntax: Any, context: Dict[str, Any], literals: Iterable[str] = ()) -> Any:
+    """
+    Compile and render a template for syntax that is only rendered once.
+    """
+    return Template(syntax, literals).render(context)
@@ -0,0 +1,218 @@
+import json
+import tempfile
+import uuid
+from io import StringIO
+from pathlib import Path
+
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APIClient
+
+from db.models import ModelSchema
+from db.tests.utils import clear_dynamic_models
+from ..bundle import BUNDLE_VERSION, export_bundle, import_bundle
+from ..exceptions import PendingChangesError
+from ..models import Release, ReleaseChange, ReleaseChangeType
+
+
+def publish(parent, release_version):
+    return Release.objects.create(parent=parent, release_version=release_version, release_notes='')
+
+
+def text_field(field_name):
+    return {'field_name': field_name, 'field_type': 'text', 'required': True}
+
+
+def build_bundle(models):
+    """
+    Return a bundle with a modelschema and a list page for each model name.
+    """
+    bundle = {'version': BUNDLE_VERSION, 'modelschema': [], 'page': [], 'function': []}
+
+    for model_name in models:
+        modelschema_id = str(uuid.uuid4())
+        bundle['modelschema'].append(
+            {'id': modelschema_id, 'model_name': model_name, 'fields': [text_field('name')]}
+        )
+        bundle['page'].append(
+            {
+                'id': str(uuid.uuid4()),
+                'modelschema_id': modelschema_id,
+                'page_name': 'list',
+                'layout': [],
+            }
+        )
+
+    return bundle
+
+
+class BundleTest(TestCase):
+    def setUp(self):
+        self.release = Release.objects.create(release_version='0', release_notes='')
+
+    def tearDown(self):
+        clear_dynamic_models()
+
+    def test_import_into_empty_release(self):
+        bundle = build_bundle(['Author', 'Book'])
+
+        counts = import_bundle(self.release, bundle)
+
+        self.assertDictEqual({'create': 4, 'update': 0, 'delete': 0}, counts)
+        release = publish(self.release, '1')
+
+        # Ids are preserved, so the pages still reference their models.
+        modelschema_ids = [x['id'] for x in bundle['modelschema']]
+        self.assertSetEqual(
+            set(modelschema_ids),
+            {str(x) for x in ModelSchema.objects.values_list('id', flat=True)},
+        )
+
+        exported = export_bundle(release)
+        self.assertEqual('1', exported['release_version'])
+        self.assertCountEqual(bundle['modelschema'], exported['modelschema'])
+        self.assertCountEqual(
+            [x['id'] for x in bundle['page']], [x['id'] for x in exported['page']]
+        )
+
+    def test_import_changes(self):
+        bundle = build_bundle(['Author'])
+        import_bundle(self.release, bundle)
+        release = publish(self.release, '1')
+
+        bundle = export_bundle(release)
+        bundle['modelschema'][0]['fields'].append(text_field('bio'))
+        bundle['page'] = []
+        bundle['function'].append({'id': str(uuid.uuid4()), 'function_name': 'Send Email'})
+
+        counts = import_bundle(release, bundle)
+
+        self.assertDictEqual({'create': 1, 'update': 1, 'delete': 1}, counts)
+        self.assertEqual(3, release.release_changes.count())
+
+        # An unchanged bundle stages no changes.
+        release = publish(release, '2')
+        self.assertDictEqual(
+            {'create': 0, 'update': 0, 'delete': 0}, import_bundle(release, export_bundle(release))
+        )
+
+    def test_import_query_count(self):
+        def count_queries(models):
+            release_changes = self.release.release_changes.all()
+            release_changes.delete()
+
+            with CaptureQueriesContext(connection) as context:
+                import_bundle(self.release, build_bundle(models))
+
+            return len(context.captured_queries)
+
+        self.assertEqual(
+            count_queries(['Author']), count_queries([f'Model{i}' for i in range(200)])
+        )
+
+    def test_import_invalid(self):
+        bundle = build_bundle(['Author'])
+        bundle['page'][0]['modelschema_id'] = str(uuid.uuid4())
+
+        with self.assertRaisesMessage(ValidationError, 'not in the bundle'):
+            import_bundle(self.release, bundle)
+
+        bundle = build_bundle(['Author'])
+        del bundle['page'][0]['layout']
+
+        with self.assertRaisesMessage(ValidationError, 'Missing layout key'):
+            import_bundle(self.release, bundle)
+
+        with self.assertRaisesMessage(ValidationError, 'Unsupported bundle version'):
+            import_bundle(self.release, {'modelschema': []})
+
+        self.assertFalse(self.release.release_changes.exists())
+
+    def test_import_pending_changes(self):
+        ReleaseChange.objects.create(
+            parent_release=self.release,
+            change_type=ReleaseChangeType.CREATE,
+            model_type='function',
+            syntax_json={'function_name': 'Send Email'},
+        )
+
+        with self.assertRaises(PendingChangesError):
+            import_bundle(self.release, build_bundle(['Author']))
+
+    def test_export_include_changes(self):
+        ReleaseChange.objects.create(
+            parent_release=self.release,
+            change_type=ReleaseChangeType.CREATE,
+            model_type='modelschema',
+            syntax_json={'model_name': 'Author', 'fields': []},
+        )
+
+        self.assertListEqual([], export_bundle(self.release)['modelschema'])
+
+        bundle = export_bundle(self.release, include_changes=True)
+        self.assertEqual(1, len(bundle['modelschema']))
+        self.assertEqual(4, len(bundle['page']))
+        self.assertEqual(3, len(bundle['permission']))
+
+    def test_api(self):
+        client = APIClient()
+        url = '/internal-api/developer/releases/'
+
+        response = client.post(f'{url}import/', {'version': 0}, format='json')
+        self.assertEqual(400, response.status_code)
+
+        response = client.post(f'{url}import/', build_bundle(['Author']), format='json')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(2, response.data['data']['create'])
+
+        response = client.get(f'{url}{self.release.id}/export/')
+        self.assertListEqual([], response.data['modelschema'])
+
+        response = client.get(f'{url}{self.release.id}/export/', {'include_changes': 1})
+        self.assertEqual('Author', response.data['modelschema'][0]['model_name'])
+
+        # The imported changes must be published before importing again.
+        response = client.post(f'{url}import/', build_bundle(['Book']), format='json')
+        self.assertEqual(409, response.status_code)
+
+    def test_commands(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'bundle.json'
+            path.write_text(json.dumps(build_bundle(['Author'])))
+
+            call_command(
+                'load', str(path), '--publish', '--release-version', '1', stdout=StringIO()
+            )
+
+            self.assertEqual('1', Release.get_current_release().release_version)
+            self.assertTrue(ModelSchema.objects.filter(name='Author').exists())
+
+            call_command('dump', str(path), stdout=StringIO())
+
+            bundle = json.loads(path.read_text())
+            self.assertEqual('1', bundle['release_version'])
+            self.assertEqual('Author', bundle['modelschema'][0]['model_name'])
+
+    def test_load_existing_release_version(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'bundle.json'
+            bundle = build_bundle(['Author'])
+            path.write_text(json.dumps({**bundle, 'release_version': '0'}))
+
+            with self.assertRaisesMessage(CommandError, 'Release 0 already exists'):
+                call_command(
+                    'load', str(path), '--publish', '--release-version', '0', stdout=StringIO()
+                )
+
+            self.assertFalse(Release.get_current_release().release_changes.exists())
+
+            # A release of the bundle's version already exists, so the release gets a new one.
+            call_command('load', str(path), '--publish', stdout=StringIO())
+
+            self.assertEqual('0-2', Release.get_current_release().release_version)
+            self.assertTrue(ModelSchema.objects.filter(name='Author').exists())
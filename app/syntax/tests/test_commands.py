@@ -0,0 +1,81 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+
+from ..management.commands.parse import MANIFEST_FILE_NAME
+
+
+def header(title):
+    return {'component': 'header', 'config': {'title': title}}
+
+
+class ParseCommandTest(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, data):
+        file = self.path / name
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_text(json.dumps(data))
+
+    def parse(self, *args):
+        stdout = StringIO()
+        call_command('parse', str(self.path), *args, stdout=stdout)
+        # The status of each file starts its report line.
+        return [x.split()[0] for x in stdout.getvalue().splitlines()[:-1]]
+
+    def test_parse_directory(self):
+        self.write('function.min.json', {'list': {'layout': [header('{{ name }}')]}})
+        self.write('nested/page.min.json', {'edit': {'layout': [header('Edit')]}})
+        self.write('skeleton.min.json', {'colors': {'primary': 'blue'}})
+
+        statuses = self.parse('--workers', '2')
+
+        function = json.loads((self.path / 'function.json').read_text())
+        self.assertListEqual(['name'], function['list']['page_object_fields'])
+        self.assertIsNotNone(function['list']['layout'][0]['id'])
+        page = json.loads((self.path / 'nested/page.json').read_text())
+        self.assertIn('id', page['edit']['layout'][0])
+        self.assertListEqual(['parsed', 'parsed', 'skipped'], statuses)
+
+        manifest = json.loads((self.path / MANIFEST_FILE_NAME).read_text())
+        self.assertSetEqual({'function.min.json', 'nested/page.min.json'}, set(manifest))
+
+        # Unchanged files are not parsed again.
+        self.assertListEqual(['unchanged', 'unchanged', 'skipped'], self.parse())
+
+        self.write('function.min.json', {'list': {'layout': [header('Changed')]}})
+        self.assertListEqual(['unchanged', 'parsed', 'skipped'], self.parse())
+
+    def test_files_without_source(self):
+        # Hand-written layouts without a .min.json source are never overwritten.
+        self.write('page.json', {'edit': {'layout': [header('Edit')]}})
+        self.write('settings.json', {'list': {'layout': []}})
+        content = (self.path / 'page.json').read_text()
+
+        self.assertListEqual([], self.parse())
+        self.assertEqual(content, (self.path / 'page.json').read_text())
+
+        with self.assertRaisesMessage(CommandError, 'is not a .min.json layout source'):
+            call_command('parse', str(self.path / 'page.json'), stdout=StringIO())
+
+        self.assertEqual(content, (self.path / 'page.json').read_text())
+
+    def test_parse_error(self):
+        self.write('function.min.json', {'list': {'layout': [header('')]}})
+        self.write('group.min.json', {'list': {'layout': [header('Groups')]}})
+
+        with self.assertRaisesMessage(CommandError, '1 file(s) failed to parse'):
+            self.parse()
+
+        self.assertTrue((self.path / 'group.json').exists())
+        manifest = json.loads((self.path / MANIFEST_FILE_NAME).read_text())
+        self.assertListEqual(['group.min.json'], list(manifest))
@@ -0,0 +1,125 @@
+import threading
+import uuid
+
+from django.db import connection
+from django.test import TransactionTestCase
+
+from ..exceptions import StaleReleaseError
+from ..models import Release, ReleaseChange, ReleaseChangeType, ReleaseSyntax
+
+WORKERS = 12
+
+
+def run_concurrently(target, count=WORKERS):
+    """
+    Run target(i) in count threads released at the same time, returning the results (or raised
+    exceptions) in order.
+    """
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(i):
+        try:
+            barrier.wait()
+            results[i] = target(i)
+        except Exception as err:
+            results[i] = err
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return results
+
+
+class ConcurrentReleaseTest(TransactionTestCase):
+    def setUp(self):
+        self.initial_release = Release.objects.create(
+            release_version='0.0.0',
+            release_notes='Application Initial Release',
+        )
+
+    def test_concurrent_publish(self):
+        """
+        Only one of many concurrent publishes against the same release may succeed.
+        """
+        ReleaseChange.objects.create(
+            parent_release=self.initial_release,
+            change_type=ReleaseChangeType.CREATE,
+            model_type='function',
+            syntax_json={'function_name': 'Send Email'},
+        )
+
+        results = run_concurrently(
+            lambda i: Release.objects.create(
+                parent=self.initial_release,
+                release_version=f'1.0.{i}',
+                release_notes='',
+            )
+        )
+
+        published = [x for x in results if isinstance(x, Release)]
+        self.assertEqual(1, len(published))
+        self.assertTrue(all(isinstance(x, (Release, StaleReleaseError)) for x in results))
+        self.assertEqual(1, Release.objects.filter(current_release=True).count())
+        self.assertEqual(published[0], Release.get_current_release())
+        self.assertEqual(1, ReleaseSyntax.objects.filter(release=published[0]).count())
+        self.assertEqual(0, ReleaseChange.objects.count())
+
+    def test_concurrent_changes(self):
+        """
+        Concurrent updates to the same object leave exactly one ReleaseChange for it.
+        """
+        object_id = str(uuid.uuid4())
+        ReleaseSyntax.objects.create(
+            release=self.initial_release,
+            model_type='function',
+            syntax_json={'id': object_id, 'function_name': 'Send Email'},
+        )
+
+        def update(i):
+            release_change = ReleaseChange(
+                parent_release=self.initial_release,
+                change_type=ReleaseChangeType.UPDATE,
+                model_type='function',
+                syntax_json={'function_name': f'Send Email {i}'},
+            )
+            release_change.save(object_id=object_id)
+
+        results = run_concurrently(update)
+
+        self.assertEqual([None] * WORKERS, results)
+        self.assertEqual(1, ReleaseChange.objects.count())
+        self.assertEqual(object_id, ReleaseChange.objects.get().syntax_json['id'])
+
+    def test_changes_during_publish(self):
+        """
+        Changes racing a publish are either published or rejected, never silently dropped.
+        """
+
+        def write(i):
+            if i == 0:
+                return Release.objects.create(
+                    parent=self.initial_release,
+                    release_version='1.0.0',
+                    release_notes='',
+                )
+
+            ReleaseChange.objects.create(
+                parent_release=self.initial_release,
+                change_type=ReleaseChangeType.CREATE,
+                model_type='function',
+                syntax_json={'function_name': f'Function {i}'},
+            )
+
+        results = run_concurrently(write)
+
+        accepted = len([x for x in results[1:] if x is None])
+        self.assertIsInstance(results[0], Release)
+        self.assertTrue(all(x is None or isinstance(x, StaleReleaseError) for x in results[1:]))
+        self.assertEqual(accepted, ReleaseSyntax.objects.filter(release=results[0]).count())
+        self.assertEqual(0, ReleaseChange.objects.count())
@@ -0,0 +1,73 @@
+import uuid
+
+from django.test import TestCase
+
+from ..diff import DiffType, diff_release_changes, diff_releases, syntax_hash
+from ..models import Release, ReleaseChange, ReleaseChangeType, ReleaseSyntax
+
+
+def create_syntax(release, model_type, **syntax_json):
+    syntax_json.setdefault('id', str(uuid.uuid4()))
+
+    return ReleaseSyntax.objects.create(
+        release=release, model_type=model_type, syntax_json=syntax_json
+    ).syntax_json
+
+
+class SyntaxHashTest(TestCase):
+    def test_key_order_independent(self):
+        self.assertEqual(syntax_hash({'a': 1, 'b': [1, 2]}), syntax_hash({'b': [1, 2], 'a': 1}))
+        self.assertNotEqual(syntax_hash({'a': 1}), syntax_hash({'a': 2}))
+
+
+class DiffTest(TestCase):
+    def setUp(self):
+        self.base = Release.objects.create(release_version='0', release_notes='')
+        self.target = Release.objects.create(release_version='1', release_notes='')
+
+    def test_diff_releases(self):
+        unchanged = create_syntax(self.base, 'function', function_name='Unchanged')
+        create_syntax(self.target, 'function', **unchanged)
+
+        changed = create_syntax(self.base, 'function', function_name='Before')
+        create_syntax(self.target, 'function', id=changed['id'], function_name='After')
+
+        removed = create_syntax(self.base, 'function', function_name='Removed')
+        added = create_syntax(self.target, 'function', function_name='Added')
+
+        diff = {x['id']: x for x in diff_releases(self.base, self.target)}
+
+        self.assertEqual(3, len(diff))
+        self.assertEqual(DiffType.ADDED, diff[added['id']]['diff_type'])
+        self.assertEqual(added, diff[added['id']]['syntax_json'])
+        self.assertEqual(DiffType.CHANGED, diff[changed['id']]['diff_type'])
+        self.assertEqual('After', diff[changed['id']]['syntax_json']['function_name'])
+        self.assertEqual(DiffType.REMOVED, diff[removed['id']]['diff_type'])
+        self.assertNotIn('syntax_json', diff[removed['id']])
+
+    def test_diff_release_changes(self):
+        changed = create_syntax(self.target, 'function', function_name='Before')
+        unchanged = create_syntax(self.target, 'function', function_name='Unchanged')
+        removed = create_syntax(self.target, 'function', function_name='Removed')
+
+        for change_type, syntax_json, object_id in [
+            (ReleaseChangeType.CREATE, {'function_name': 'Added'}, None),
+            (ReleaseChangeType.UPDATE, {'function_name': 'After'}, changed['id']),
+            (ReleaseChangeType.UPDATE, {'function_name': 'Unchanged'}, unchanged['id']),
+            (ReleaseChangeType.DELETE, {}, removed['id']),
+        ]:
+            ReleaseChange(
+                parent_release=self.target,
+                change_type=change_type,
+                model_type='function',
+                syntax_json=syntax_json,
+            ).save(object_id=object_id)
+
+        diff = list(diff_release_changes(self.target))
+
+        self.assertListEqual(
+            [DiffType.ADDED, DiffType.CHANGED, DiffType.REMOVED], [x['diff_type'] for x in diff]
+        )
+        self.assertEqual('Added', diff[0]['syntax_json']['function_name'])
+        self.assertEqual(changed['id'], diff[1]['id'])
+        self.assertEqual(removed['id'], diff[2]['id'])
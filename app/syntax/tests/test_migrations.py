@@ -0,0 +1,69 @@
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+
+class MigrationTestCase(TransactionTestCase):
+    """
+    Migrates from migrate_from to migrate_to with the rows created by setUpBeforeMigration. Each
+    migration commits, as it does outside the tests.
+    """
+
+    migrate_from = None
+    migrate_to = None
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        leaf = executor.loader.graph.leaf_nodes()
+
+        executor.migrate([self.migrate_from])
+        self.setUpBeforeMigration(executor.loader.project_state(self.migrate_from).apps)
+
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate([self.migrate_to])
+        self.apps = executor.loader.project_state(self.migrate_to).apps
+
+        self.addCleanup(self.migrate_to_leaf, leaf)
+
+    def migrate_to_leaf(self, leaf):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(leaf)
+
+    def setUpBeforeMigration(self, apps):
+        pass
+
+
+class SyntaxBlobMigrationTest(MigrationTestCase):
+    migrate_from = ('syntax', '0003_release_unique_current_release')
+    migrate_to = ('syntax', '0006_remove_releasesyntax_syntax_json')
+
+    def setUpBeforeMigration(self, apps):
+        Release = apps.get_model('syntax', 'Release')
+        ReleaseSyntax = apps.get_model('syntax', 'ReleaseSyntax')
+
+        release = Release.objects.create(
+            release_version='0', release_notes='', lft=1, rght=2, tree_id=1, level=0
+        )
+        ReleaseSyntax.objects.bulk_create(
+            [
+                ReleaseSyntax(release=release, model_type='page', syntax_json={'id': '1'}),
+                ReleaseSyntax(release=release, model_type='page', syntax_json={'id': '2'}),
+                ReleaseSyntax(release=release, model_type='page', syntax_json={'id': '1'}),
+            ]
+        )
+
+    def test_syntax_moved_to_blobs(self):
+        ReleaseSyntax = self.apps.get_model('syntax', 'ReleaseSyntax')
+        SyntaxBlob = self.apps.get_model('syntax', 'SyntaxBlob')
+
+        self.assertEqual(2, SyntaxBlob.objects.count())
+        self.assertListEqual(
+            [('1', {'id': '1'}), ('1', {'id': '1'}), ('2', {'id': '2'})],
+            list(
+                ReleaseSyntax.objects.order_by('object_id').values_list(
+                    'object_id', 'blob__syntax_json'
+                )
+            ),
+        )
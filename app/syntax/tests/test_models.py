@@ -1,8 +1,11 @@
 import uuid
 
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
-from ..models import Release, ReleaseChange, ReleaseChangeType, ReleaseSyntax
+from ..exceptions import ComponentNotFoundError
+from ..models import Release, ReleaseChange, ReleaseChangeType, ReleaseSyntax, SyntaxBlob
 
 
 def create_initial_release():
@@ -44,6 +47,113 @@ class ReleaseTest(TestCase):
         # self.assertEqual(0, ReleaseSyntax.objects.count())
 
 
+class SyntaxBlobTest(TestCase):
+    def test_identical_syntax_stored_once(self):
+        release = create_initial_release()
+        syntax_json = {'id': str(uuid.uuid4()), 'function_name': 'Send Email'}
+
+        first = ReleaseSyntax.objects.create(
+            release=release, model_type='function', syntax_json=syntax_json
+        )
+        second = ReleaseSyntax.objects.create(
+            release=release, model_type='function', syntax_json=dict(reversed(syntax_json.items()))
+        )
+
+        self.assertEqual(1, SyntaxBlob.objects.count())
+        self.assertEqual(first.blob_id, second.blob_id)
+        self.assertEqual(syntax_json['id'], second.object_id)
+
+    def test_release_copies_pointers(self):
+        release = create_initial_release()
+
+        for function_name in ['Send Email', 'Export as CSV']:
+            ReleaseChange.objects.create(
+                parent_release=release,
+                change_type=ReleaseChangeType.CREATE,
+                model_type='function',
+                syntax_json={'function_name': function_name},
+            )
+
+        release = Release.objects.create(parent=release, release_version='1', release_notes='')
+        ReleaseChange.objects.create(
+            parent_release=release,
+            change_type=ReleaseChangeType.CREATE,
+            model_type='function',
+            syntax_json={'function_name': 'Archive'},
+        )
+        second_release = Release.objects.create(
+            parent=release, release_version='2', release_notes=''
+        )
+
+        self.assertEqual(3, SyntaxBlob.objects.count())
+        self.assertEqual(3, second_release.syntax.count())
+        self.assertSetEqual(
+            set(release.syntax.values_list('blob_id', flat=True)),
+            set(second_release.syntax.values_list('blob_id', flat=True))
+            - {second_release.syntax.get(blob__syntax_json__function_name='Archive').blob_id},
+        )
+
+    def test_page_component_index(self):
+        release = create_initial_release()
+        layout = [
+            {'id': 'header', 'component': 'header', 'config': {}},
+            {
+                'id': 'column',
+                'component': 'column',
+                'config': {'components': [{'id': 'form', 'component': 'form', 'config': {}}]},
+            },
+        ]
+
+        page = ReleaseSyntax.objects.create(
+            release=release,
+            model_type='page',
+            syntax_json={'id': str(uuid.uuid4()), 'page_name': 'edit', 'layout': layout},
+        )
+        function = ReleaseSyntax.objects.create(
+            release=release,
+            model_type='function',
+            syntax_json={'id': str(uuid.uuid4()), 'function_name': 'Send Email'},
+        )
+
+        page = ReleaseSyntax.objects.select_related('blob').get(id=page.id)
+        self.assertListEqual([1, 'config', 'components', 0], page.blob.component_index['form'])
+        self.assertEqual('form', page.get_component('form')['component'])
+        self.assertIsNone(page.get_component('missing'))
+        self.assertIsNone(SyntaxBlob.objects.get(hash=function.blob_id).component_index)
+
+    def test_patch_page_component(self):
+        release = create_initial_release()
+        page_id = str(uuid.uuid4())
+        layout = [
+            {
+                'id': 'column',
+                'component': 'column',
+                'config': {'components': [{'id': 'form', 'component': 'form', 'config': {}}]},
+            },
+        ]
+        ReleaseSyntax.objects.create(
+            release=release,
+            model_type='page',
+            syntax_json={'id': page_id, 'page_name': 'edit', 'layout': layout},
+        )
+
+        component = release.patch_page_component(page_id, 'form', {'title': 'Edit'})
+
+        self.assertDictEqual({'title': 'Edit'}, component['config'])
+        self.assertEqual(1, release.release_changes.filter(model_type='page').count())
+
+        with self.assertRaises(ComponentNotFoundError):
+            release.patch_page_component(page_id, 'missing', {'title': 'Edit'})
+
+        with self.assertRaises(ComponentNotFoundError):
+            release.patch_page_component(str(uuid.uuid4()), 'form', {'title': 'Edit'})
+
+        release = Release.objects.create(parent=release, release_version='1', release_notes='')
+        page = release.syntax.select_related('blob').get(object_id=page_id)
+
+        self.assertEqual('Edit', page.get_component('form')['config']['title'])
+
+
 class ReleaseChangeTest(TestCase):
     def setUp(self):
         self.initial_release = create_initial_release()
@@ -140,6 +250,64 @@ class ReleaseChangeTest(TestCase):
             existing_release_syntax.syntax_json['id'],
         )
 
+    def assertQueryCount(self, count, context):
+        # Ignore the savepoints of the atomic blocks.
+        queries = [x['sql'] for x in context.captured_queries if 'SAVEPOINT' not in x['sql']]
+        self.assertEqual(count, len(queries), queries)
+
+    def test_save_query_count(self):
+        # Existing syntax and changes do not change the number of queries.
+        for i in range(20):
+            ReleaseSyntax.objects.create(
+                release=self.initial_release,
+                model_type='modelschema',
+                syntax_json={'id': str(uuid.uuid4()), 'model_name': f'Model {i}'},
+            )
+
+        # Lock the release, insert the change and bulk insert the default pages and permissions.
+        with CaptureQueriesContext(connection) as context:
+            release_change = ReleaseChange.objects.create(
+                parent_release=self.initial_release,
+                change_type=ReleaseChangeType.CREATE,
+                model_type='modelschema',
+                syntax_json={'model_name': 'Book', 'fields': []},
+            )
+
+        self.assertQueryCount(3, context)
+        self.assertEqual(8, ReleaseChange.objects.count())
+        self.assertEqual(release_change.syntax_json['id'], release_change.object_id)
+        self.assertEqual(
+            7,
+            ReleaseChange.objects.filter(
+                syntax_json__modelschema_id=release_change.object_id
+            ).count(),
+        )
+
+        # Lock the release, read the existing change and update it in place.
+        with CaptureQueriesContext(connection) as context:
+            ReleaseChange(
+                parent_release=self.initial_release,
+                change_type=ReleaseChangeType.UPDATE,
+                model_type='modelschema',
+                syntax_json={'model_name': 'Books', 'fields': []},
+            ).save(object_id=release_change.object_id)
+
+        self.assertQueryCount(3, context)
+        updated = ReleaseChange.objects.get(object_id=release_change.object_id)
+        self.assertEqual(release_change.pk, updated.pk)
+        self.assertEqual(ReleaseChangeType.CREATE, updated.change_type)
+        self.assertEqual('Books', updated.syntax_json['model_name'])
+
+        # Deleting an unpublished model removes its change and related changes.
+        ReleaseChange(
+            parent_release=self.initial_release,
+            change_type=ReleaseChangeType.DELETE,
+            model_type='modelschema',
+            syntax_json={},
+        ).save(object_id=release_change.object_id)
+
+        self.assertEqual(0, ReleaseChange.objects.count())
+
     def test_model_id_in_syntax_json(self):
         release_change = ReleaseChange(parent_release=self.initial_release, syntax_json={})
 
@@ -1,8 +1,10 @@
 import json
+from unittest import mock
 
 from django.test import TestCase
 
-from .._old.parser import SyntaxParser
+from .._old.parser import SyntaxParser, get_page_object_fields
+from ..constants import CREATE_PAGE_LAYOUT, EDIT_PAGE_LAYOUT
 
 
 class SyntaxParserTest(TestCase):
@@ -116,6 +118,41 @@ class SyntaxParserTest(TestCase):
         self.assertIsNotNone(parsed_layout['layout'][0]['config']['tools'][0]['id'])
         self.assertIsNotNone(parsed_layout['layout'][0]['config']['tools'][1]['id'])
 
+    def test_page_object_fields_all(self):
+        # Forms without a list of fields and components the parser does not know may use any field.
+        self.assertIsNone(get_page_object_fields(EDIT_PAGE_LAYOUT))
+        self.assertIsNone(get_page_object_fields(CREATE_PAGE_LAYOUT))
+        self.assertIsNone(get_page_object_fields([{'component': 'form', 'config': {}}]))
+        self.assertIsNone(
+            get_page_object_fields([{'component': 'form', 'config': {'fields': '__all__'}}])
+        )
+
+    def test_page_object_fields_nested(self):
+        layout = [
+            {
+                'component': 'tabs',
+                'config': {
+                    'tabs': [
+                        {
+                            'title': '{{ title }}',
+                            'children': [
+                                {
+                                    'component': 'form',
+                                    'config': {'fields': [{'field_name': 'name'}]},
+                                },
+                                {'component': 'table', 'config': {'model': 'book'}},
+                            ],
+                        }
+                    ]
+                },
+            }
+        ]
+
+        self.assertListEqual(['title', 'name'], get_page_object_fields(layout))
+
+        layout[0]['config']['tabs'][0]['children'].append({'component': 'core@Form'})
+        self.assertIsNone(get_page_object_fields(layout))
+
     # def test_parse_layout_form(self):
     #     """
     #     Component: form
@@ -130,3 +167,46 @@ class SyntaxParserTest(TestCase):
 
     #     self.assertEqual(parsed_layout['page_object_fields'], ['test_1', 'test_2'])
     #     self.assertIsNotNone(parsed_layout['layout'][0]['id'])
+
+
+class SyntaxParserBenchmarkTest(TestCase):
+    def test_parse_large_layout(self):
+        """
+        Parse a page of 5,000 components: 1,000 headers each with 4 buttons. Each component is
+        validated once, with the validators compiled at import, and its id is checked against a
+        set, so parsing is linear in the number of components.
+        """
+
+        def button(i):
+            return {
+                'component': 'button',
+                'config': {'text': f'{{{{ b{i} }}}}', 'uri': 'x:create'},
+            }
+
+        layout = [
+            {
+                'component': 'header',
+                'config': {'title': 'title', 'tools': [button(i * 4 + j) for j in range(4)]},
+            }
+            for i in range(1000)
+        ]
+
+        parser = SyntaxParser()
+
+        with mock.patch('syntax._old.parser._compile_attribute') as compile_attribute:
+            with mock.patch.object(
+                SyntaxParser,
+                'validate_component',
+                autospec=True,
+                side_effect=SyntaxParser.validate_component,
+            ) as validate_component:
+                parsed_layout = parser.parse_layout({'layout': layout})
+
+        component_ids = [x['id'] for x in layout] + [
+            y['id'] for x in layout for y in x['config']['tools']
+        ]
+        self.assertEqual(5000, len(set(component_ids)))
+        self.assertListEqual([f'b{i}' for i in range(4000)], parsed_layout['page_object_fields'])
+        self.assertEqual(5000, validate_component.call_count)
+        compile_attribute.assert_not_called()
+        self.assertIsInstance(parser.component_ids, set)
@@ -0,0 +1,118 @@
+from django.test import TestCase
+
+from db.models import ModelSchema
+from db.tests.utils import clear_dynamic_models
+from ..ddl import Operation
+from ..exceptions import PendingChangesError
+from ..models import Release, ReleaseChange, ReleaseChangeType
+
+
+def publish(parent, release_version):
+    return Release.objects.create(parent=parent, release_version=release_version, release_notes='')
+
+
+def text_field(field_name):
+    return {'field_name': field_name, 'field_type': 'text', 'required': True}
+
+
+class ReleaseRestoreTest(TestCase):
+    def setUp(self):
+        self.initial_release = Release.objects.create(release_version='0', release_notes='')
+
+        author = ReleaseChange(
+            parent_release=self.initial_release,
+            change_type=ReleaseChangeType.CREATE,
+            model_type='modelschema',
+            syntax_json={'model_name': 'Author', 'fields': [text_field('name')]},
+        )
+        author.save()
+        self.author_id = author.syntax_json['id']
+        self.first_release = publish(self.initial_release, '1')
+
+        ReleaseChange(
+            parent_release=self.first_release,
+            change_type=ReleaseChangeType.UPDATE,
+            model_type='modelschema',
+            syntax_json={
+                'model_name': 'Author',
+                'fields': [text_field('name'), text_field('bio')],
+            },
+        ).save(object_id=self.author_id)
+        ReleaseChange.objects.create(
+            parent_release=self.first_release,
+            change_type=ReleaseChangeType.CREATE,
+            model_type='modelschema',
+            syntax_json={'model_name': 'Book', 'fields': [text_field('title')]},
+        )
+        self.second_release = publish(self.first_release, '2')
+
+    def tearDown(self):
+        clear_dynamic_models()
+
+    def test_restore(self):
+        self.assertEqual(2, ModelSchema.objects.count())
+
+        plan = self.first_release.restore()
+
+        self.assertListEqual(
+            [Operation.REMOVE_FIELD, Operation.DELETE_MODEL], [x['operation'] for x in plan]
+        )
+        self.assertEqual(self.first_release, Release.get_current_release())
+        self.assertListEqual(['Author'], list(ModelSchema.objects.values_list('name', flat=True)))
+        self.assertListEqual(
+            ['name'],
+            list(ModelSchema.objects.get(name='Author').fields.values_list('name', flat=True)),
+        )
+
+        # Restoring forward re-applies only the difference.
+        plan = self.second_release.restore()
+
+        self.assertListEqual(
+            [Operation.CREATE_MODEL, Operation.ADD_FIELD, Operation.ADD_FIELD],
+            [x['operation'] for x in plan],
+        )
+        self.assertEqual(2, ModelSchema.objects.count())
+
+    def test_restore_removed_field(self):
+        # Publishing an update that removes a field keeps the field in the table.
+        ReleaseChange(
+            parent_release=self.second_release,
+            change_type=ReleaseChangeType.UPDATE,
+            model_type='modelschema',
+            syntax_json={'model_name': 'Author', 'fields': [text_field('name')]},
+        ).save(object_id=self.author_id)
+        publish(self.second_release, '3')
+
+        plan = self.second_release.restore()
+
+        # The bio field is still in the table, so it is altered rather than added again.
+        self.assertListEqual([Operation.ALTER_FIELD], [x['operation'] for x in plan])
+        self.assertEqual(self.second_release, Release.get_current_release())
+        self.assertCountEqual(
+            ['name', 'bio'],
+            ModelSchema.objects.get(name='Author').fields.values_list('name', flat=True),
+        )
+
+        plan = self.first_release.restore()
+
+        self.assertListEqual(
+            [Operation.REMOVE_FIELD, Operation.DELETE_MODEL], [x['operation'] for x in plan]
+        )
+
+    def test_restore_dry_run(self):
+        plan = self.first_release.restore(dry_run=True)
+
+        self.assertEqual(2, len(plan))
+        self.assertEqual(self.second_release, Release.get_current_release())
+        self.assertEqual(2, ModelSchema.objects.count())
+
+    def test_restore_with_pending_changes(self):
+        ReleaseChange.objects.create(
+            parent_release=self.second_release,
+            change_type=ReleaseChangeType.CREATE,
+            model_type='function',
+            syntax_json={'function_name': 'Send Email'},
+        )
+
+        with self.assertRaises(PendingChangesError):
+            self.first_release.restore()
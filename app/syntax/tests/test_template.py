@@ -0,0 +1,54 @@
+from django.test import SimpleTestCase
+
+from db.constants import MODEL_DEFAULT_PAGES
+from .._old.utils import replace_syntax
+from ..template import Template
+
+
+class TemplateTest(SimpleTestCase):
+    def test_render(self):
+        template = Template(
+            {
+                'title': 'Edit ${model}: ${id}',
+                'model': '${model}',
+                'fields': '__all__',
+                'help_text': 'Shows __all__ fields of ${models}',
+                'components': [{'uri': '${model}:create', 'count': 1}],
+            },
+            literals=['__all__'],
+        )
+        fields = [{'field_name': 'name'}]
+
+        self.assertEqual({'model', 'id', 'models', '__all__'}, template.placeholders)
+        self.assertDictEqual(
+            {
+                'title': 'Edit author: ${id}',
+                'model': 'author',
+                'fields': fields,
+                'help_text': 'Shows __all__ fields of ${models}',
+                'components': [{'uri': 'author:create', 'count': 1}],
+            },
+            template.render({'model': 'author', '__all__': fields}),
+        )
+
+    def test_render_returns_new_syntax(self):
+        syntax = {'layout': [{'config': {'model': '${model}'}}]}
+        template = Template(syntax)
+
+        first = template.render({'model': 'author'})
+        first['layout'][0]['config']['model'] = 'changed'
+
+        self.assertEqual(
+            'book', template.render({'model': 'book'})['layout'][0]['config']['model']
+        )
+        self.assertEqual('${model}', syntax['layout'][0]['config']['model'])
+
+    def test_replace_syntax(self):
+        self.assertEqual(
+            replace_syntax(MODEL_DEFAULT_PAGES, '${model}', 'author'),
+            Template(MODEL_DEFAULT_PAGES).render({'model': 'author'}),
+        )
+        self.assertDictEqual(
+            {'fields': [1, 2], 'text': '__all__ fields'},
+            replace_syntax({'fields': '__all__', 'text': '__all__ fields'}, '"__all__"', '[1, 2]'),
+        )
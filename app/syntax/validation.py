@@ -3,7 +3,9 @@ from django.core.exceptions import ValidationError
 from db.models import ModelSchema
 from layout.models import Page
 from packages.models import Package
+from workflows.engine import compile_steps, validate_events
 from workflows.models import Function, Workflow
+from .models import ReleaseChangeType
 
 
 def validate_str(value, max_length=None, regex=None):
@@ -34,18 +36,30 @@ MODELSCHEMA = [
 ]
 PAGE = [
     {'key': 'page_name', 'type': str},
+    {'key': 'layout', 'type': list},
 ]
 FUNCTION = [
     {'key': 'function_name', 'type': str},
 ]
+PERMISSION = [
+    {'key': 'permission_name', 'type': str},
+    {'key': 'groups', 'type': list},
+    {'key': 'users', 'type': list},
+]
+WORKFLOW = [
+    {'key': 'workflow_name', 'type': str},
+    {'key': 'events', 'type': list, 'validation': {'function': validate_events}},
+    {'key': 'steps', 'type': list, 'validation': {'function': compile_steps}},
+]
 
 
 validation_mappings = {
     ModelSchema._meta.model_name: MODELSCHEMA,
-    Page._meta.model_name: 'pages',
+    Page._meta.model_name: PAGE,
     # Package._meta.model_name: 'packages',
-    # Workflow._meta.model_name: 'workflows',
+    Workflow._meta.model_name: WORKFLOW,
     Function._meta.model_name: FUNCTION,
+    'permission': PERMISSION,
 }
 
 
@@ -55,6 +69,10 @@ def validate_release_change(release_change):
     if not model_validations:
         raise ValidationError('Invalid model_type')
 
+    if release_change.change_type == ReleaseChangeType.DELETE:
+        # Deletes only need the id of the object.
+        return
+
     syntax = release_change.syntax_json
 
     for validation in model_validations:
@@ -66,3 +84,11 @@ def validate_release_change(release_change):
         if validation.get('required', False):
             if not value:
                 raise ValidationError(f"{validation['key']} syntax key requires a valid value")
+
+        if 'type' in validation and not isinstance(value, validation['type']):
+            raise ValidationError(
+                f"{validation['key']} syntax key must be of type {validation['type'].__name__}"
+            )
+
+        if 'validation' in validation:
+            validation['validation']['function'](value, **validation['validation'].get('args', {}))
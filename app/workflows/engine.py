@@ -0,0 +1,254 @@
+"""
+Workflow engine.
+
+A workflow's syntax gives the events of its model that trigger it and a tree of steps, each
+running a function (see workflows.functions) with a config:
+
+    {
+        "workflow_name": "Notify customer",
+        "modelschema_id": "...",
+        "events": ["create", "update"],
+        "steps": [
+            {
+                "id": "notify",
+                "function": "Send Email",
+                "config": {"to": "${email}", "subject": "Rental ${id} ${event}d"},
+                "next": ["export"]
+            },
+            {"id": "export", "function": "Export as CSV", "config": {}}
+        ]
+    }
+
+Placeholders in the config are rendered from the record and the event (see syntax.template).
+
+Workflows are compiled into step graphs once per release. Writes to a model trigger its workflows
+once the transaction commits, and the steps run in batches of records as tasks on the workflows
+Celery queue (see workflows.tasks), so no workflow runs in the request. The records of every write
+in a transaction are batched together, so writes of one record each still run in batches.
+"""
+import json
+import logging
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from syntax.models import ReleaseSyntax
+from syntax.template import Template
+from .functions import get_function
+
+logger = logging.getLogger(__name__)
+
+
+class Event:
+    CREATE = 'create'
+    UPDATE = 'update'
+    DELETE = 'delete'
+
+
+EVENTS = [Event.CREATE, Event.UPDATE, Event.DELETE]
+
+
+def validate_events(events):
+    if unknown := set(events) - set(EVENTS):
+        raise ValidationError(f'Unknown events {sorted(unknown)}.')
+
+
+class Step:
+    def __init__(self, step_id, function, config, next_steps):
+        self.id = step_id
+        self.function = function
+        self.template = Template(config)
+        self.next = next_steps
+
+    def run(self, event, records):
+        configs = [self.template.render({**record, 'event': event}) for record in records]
+        return self.function(configs, records)
+
+
+def compile_steps(steps):
+    """
+    Compile the steps of a workflow into a dict of step id -> Step, raising a ValidationError if a
+    function is unknown or the steps do not form a tree.
+    """
+    if not isinstance(steps, list):
+        raise ValidationError('steps must be a list.')
+
+    compiled = {}
+
+    for step in steps:
+        if not isinstance(step, dict) or not step.get('id'):
+            raise ValidationError('Each step must be an object with an id.')
+
+        function = get_function(step.get('function'))
+
+        if function is None:
+            raise ValidationError(f'Unknown function {step.get("function")!r}.')
+
+        if step['id'] in compiled:
+            raise ValidationError(f'Duplicate step {step["id"]}.')
+
+        compiled[step['id']] = Step(
+            step['id'], function, step.get('config', {}), list(step.get('next', []))
+        )
+
+    # Each step runs once per batch, so a step may only follow a single step.
+    parents = {}
+
+    for step in compiled.values():
+        for next_id in step.next:
+            if next_id not in compiled:
+                raise ValidationError(f'Step {step.id} is followed by an unknown step {next_id}.')
+
+            if next_id in parents:
+                raise ValidationError(f'Step {next_id} follows more than one step.')
+
+            parents[next_id] = step.id
+
+    for step_id in compiled:
+        seen = {step_id}
+
+        while step_id in parents:
+            step_id = parents[step_id]
+
+            if step_id in seen:
+                raise ValidationError(f'The steps following step {step_id} form a cycle.')
+
+            seen.add(step_id)
+
+    return compiled
+
+
+class CompiledWorkflow:
+    def __init__(self, syntax_json):
+        self.id = syntax_json['id']
+        self.workflow_name = syntax_json.get('workflow_name')
+        self.modelschema_id = syntax_json.get('modelschema_id')
+        self.events = set(syntax_json.get('events', []))
+        self.steps = compile_steps(syntax_json.get('steps', []))
+
+        following = {x for step in self.steps.values() for x in step.next}
+        self.roots = [x for x in self.steps.values() if x.id not in following]
+
+
+class WorkflowRegistry:
+    """
+    The compiled workflows of the most recently used releases. Release syntax does not change
+    once published, so the workflows of a release are compiled once per process.
+    """
+
+    def __init__(self, max_releases=4):
+        self.max_releases = max_releases
+        self._releases = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_release_workflows(self, release_id):
+        """
+        Return a dict of workflow id -> CompiledWorkflow for a release. Workflows that fail to
+        compile are logged and skipped.
+        """
+        release_id = str(release_id)
+
+        with self._lock:
+            if release_id in self._releases:
+                self._releases.move_to_end(release_id)
+                return self._releases[release_id]
+
+        workflows = {}
+        syntaxes = ReleaseSyntax.objects.filter(
+            release_id=release_id, model_type='workflow'
+        ).values_list('blob__syntax_json', flat=True)
+
+        for syntax_json in syntaxes:
+            try:
+                workflows[syntax_json['id']] = CompiledWorkflow(syntax_json)
+            except ValidationError as err:
+                logger.error('Workflow %s is invalid: %s', syntax_json['id'], err.messages)
+
+        with self._lock:
+            self._releases[release_id] = workflows
+
+            while len(self._releases) > self.max_releases:
+                self._releases.popitem(last=False)
+
+        return workflows
+
+    def get(self, release_id, workflow_id):
+        return self.get_release_workflows(release_id)[workflow_id]
+
+    def for_event(self, release_id, modelschema_id, event):
+        return [
+            x
+            for x in self.get_release_workflows(release_id).values()
+            if x.modelschema_id == modelschema_id and event in x.events
+        ]
+
+    def clear(self):
+        with self._lock:
+            self._releases.clear()
+
+
+workflows = WorkflowRegistry()
+
+
+class PendingBatches:
+    """
+    The records of the workflows triggered in a transaction, queued in batches once it commits.
+    """
+
+    def __init__(self):
+        # (release id, workflow, event) -> records
+        self.records = OrderedDict()
+        self.queued = False
+
+    def add(self, release_id, workflow, event, records):
+        self.records.setdefault((release_id, workflow, event), []).extend(records)
+
+    def is_pending(self, connection):
+        # The callbacks of a transaction that is rolled back are discarded with it.
+        return not self.queued and any(x[1] == self.queue for x in connection.run_on_commit)
+
+    def queue(self):
+        from .tasks import run_step
+
+        self.queued = True
+        batch_size = settings.WORKFLOW_BATCH_SIZE
+
+        for (release_id, workflow, event), records in self.records.items():
+            for i in range(0, len(records), batch_size):
+                for step in workflow.roots:
+                    run_step.delay(
+                        release_id, workflow.id, step.id, event, records[i : i + batch_size]
+                    )
+
+
+_pending = threading.local()
+
+
+def trigger_workflows(release, modelschema_id, event, records):
+    """
+    Queue the workflows of a model triggered by an event on the given records (serialized rows).
+    The records of every call in a transaction are collected, and the root steps of each workflow
+    queued in batches once the transaction commits.
+    """
+    triggered = workflows.for_event(release.id, str(modelschema_id), event)
+
+    if not triggered:
+        return
+
+    # Rows are passed to the workers as JSON.
+    records = json.loads(json.dumps(records, cls=DjangoJSONEncoder))
+    batches = getattr(_pending, 'batches', None)
+    is_new = batches is None or not batches.is_pending(transaction.get_connection())
+
+    if is_new:
+        batches = _pending.batches = PendingBatches()
+
+    for workflow in triggered:
+        batches.add(str(release.id), workflow, event, records)
+
+    if is_new:
+        transaction.on_commit(batches.queue)
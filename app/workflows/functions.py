@@ -0,0 +1,89 @@
+"""
+The functions run by workflow steps, registered by their function_name.
+
+A function is called once per batch of records with the step config rendered for each record, so
+it can act on the whole batch at once (e.g. send every email over a single connection). A function
+that fails after acting on some of the records raises PartialBatchError, so a retry does not act on
+them again.
+"""
+import csv
+import io
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+FUNCTIONS = {}
+
+
+class PartialBatchError(Exception):
+    """
+    Raised by a function that failed after acting on some records of a batch. done holds the
+    indexes of the records that were acted on and error the cause of the failure.
+    """
+
+    def __init__(self, done, error):
+        super().__init__(str(error))
+        self.done = done
+        self.error = error
+
+
+def register_function(function_name):
+    def decorator(function):
+        FUNCTIONS[function_name] = function
+        return function
+
+    return decorator
+
+
+def get_function(function_name):
+    return FUNCTIONS.get(function_name)
+
+
+@register_function('Send Email')
+def send_email(configs, records):
+    """
+    Send an email for each record. The config holds the to (an address or list of addresses),
+    subject and body. The emails are sent one at a time, so the records already sent are known if
+    sending fails.
+    """
+    messages = []
+
+    for config in configs:
+        to = config.get('to', [])
+
+        messages.append(
+            EmailMessage(
+                subject=str(config.get('subject', '')),
+                body=str(config.get('body', '')),
+                to=[to] if isinstance(to, str) else to,
+            )
+        )
+
+    with get_connection() as connection:
+        for i, message in enumerate(messages):
+            try:
+                connection.send_messages([message])
+            except Exception as err:
+                raise PartialBatchError(list(range(i)), err) from err
+
+
+@register_function('Export as CSV')
+def export_csv(configs, records):
+    """
+    Write the records to a CSV file in the default storage. The config of the first record may
+    give the fields to export and the file_name.
+    """
+    config = configs[0]
+    fields = config.get('fields') or list(records[0])
+
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=fields, extrasaction='ignore')
+    writer.writeheader()
+    writer.writerows(records)
+
+    timestamp = timezone.now().strftime('%Y%m%d%H%M%S')
+    file_name = f'exports/{config.get("file_name", "export")}-{timestamp}.csv'
+
+    return default_storage.save(file_name, ContentFile(output.getvalue().encode()))
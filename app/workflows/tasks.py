@@ -0,0 +1,48 @@
+from smtplib import SMTPException
+
+from django.conf import settings
+from django.db import InterfaceError, OperationalError
+
+from celery import shared_task
+from celery.utils.time import get_exponential_backoff_interval
+
+from .engine import workflows
+from .functions import PartialBatchError
+
+# Errors that a retry may not run into again, e.g. a lost connection to the database or the mail
+# server. Other errors, such as an unknown workflow or step, fail the step at once.
+TRANSIENT_ERRORS = (OperationalError, InterfaceError, ConnectionError, TimeoutError, SMTPException)
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=TRANSIENT_ERRORS,
+    retry_backoff=True,
+    retry_jitter=True,
+    max_retries=settings.WORKFLOW_MAX_RETRIES,
+    acks_late=True,
+)
+def run_step(self, release_id, workflow_id, step_id, event, records, done=()):
+    """
+    Run a workflow step for a batch of records, then queue the steps that follow it. A failed
+    step is retried on its own, so the steps before it are not run again, and only for the
+    records it had not acted on (done holds the indexes of the records it had), so e.g. no email
+    is sent twice. The steps that follow get the whole batch.
+    """
+    step = workflows.get(release_id, workflow_id).steps[step_id]
+    pending = [i for i in range(len(records)) if i not in done]
+
+    try:
+        step.run(event, [records[i] for i in pending])
+    except PartialBatchError as err:
+        if not isinstance(err.error, TRANSIENT_ERRORS):
+            raise err.error
+
+        done = sorted({*done, *[pending[i] for i in err.done]})
+        countdown = get_exponential_backoff_interval(
+            factor=1, retries=self.request.retries, maximum=600, full_jitter=True
+        )
+        raise self.retry(kwargs={'done': done}, exc=err.error, countdown=countdown)
+
+    for next_id in step.next:
+        run_step.delay(release_id, workflow_id, next_id, event, records)
@@ -0,0 +1,189 @@
+import tempfile
+import uuid
+from smtplib import SMTPException
+from unittest import mock
+
+from django.core import mail
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from celery.exceptions import Retry
+from config.celery import app
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from db.models import ModelSchema
+from db.tests.utils import clear_dynamic_models
+from syntax.models import Release, ReleaseChange, ReleaseChangeType
+from ..engine import Event, compile_steps, trigger_workflows, workflows
+from ..tasks import run_step
+
+
+def step(step_id, function='Send Email', **kwargs):
+    return {'id': step_id, 'function': function, 'config': {}, **kwargs}
+
+
+class CompileStepsTest(SimpleTestCase):
+    def test_compile(self):
+        steps = compile_steps([step('notify', next=['export']), step('export', 'Export as CSV')])
+
+        self.assertListEqual(['export'], steps['notify'].next)
+
+    def test_invalid(self):
+        invalid_steps = [
+            ([step('notify', 'Unknown')], 'Unknown function'),
+            ([step('notify'), step('notify')], 'Duplicate step'),
+            ([step('notify', next=['export'])], 'unknown step'),
+            ([step('a', next=['c']), step('b', next=['c']), step('c')], 'more than one step'),
+            ([step('a', next=['b']), step('b', next=['a'])], 'cycle'),
+        ]
+
+        for steps, message in invalid_steps:
+            with self.subTest(message), self.assertRaisesMessage(ValidationError, message):
+                compile_steps(steps)
+
+
+@override_settings(MEDIA_ROOT=tempfile.gettempdir(), WORKFLOW_BATCH_SIZE=2)
+class WorkflowTest(TestCase):
+    def setUp(self):
+        app.conf.task_always_eager = True
+        self.addCleanup(setattr, app.conf, 'task_always_eager', False)
+
+        release = Release.objects.create(release_version='0', release_notes='')
+        author = ReleaseChange.objects.create(
+            parent_release=release,
+            change_type=ReleaseChangeType.CREATE,
+            model_type='modelschema',
+            syntax_json={
+                'model_name': 'Author',
+                'fields': [{'field_name': 'name', 'field_type': 'text', 'required': True}],
+            },
+        )
+        ReleaseChange.objects.create(
+            parent_release=release,
+            change_type=ReleaseChangeType.CREATE,
+            model_type='workflow',
+            syntax_json={
+                'workflow_name': 'Welcome',
+                'modelschema_id': author.object_id,
+                'events': [Event.CREATE],
+                'steps': [
+                    {
+                        'id': 'welcome',
+                        'function': 'Send Email',
+                        'config': {'to': 'team@example.com', 'subject': '${name} ${event}d'},
+                        'next': ['export'],
+                    },
+                    step('export', 'Export as CSV', config={'fields': ['name']}),
+                ],
+            },
+        )
+        self.release = Release.objects.create(
+            parent=release, release_version='1', release_notes=''
+        )
+        self.model_schema = ModelSchema.objects.get(name='Author')
+
+    def tearDown(self):
+        clear_dynamic_models()
+        workflows.clear()
+
+    def test_trigger_on_create(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_superuser('admin@example.com', 'password'))
+
+        with mock.patch('workflows.functions.default_storage') as storage:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = client.post(
+                    '/internal-api/application/data/author/', {'name': 'Jane'}, format='json'
+                )
+
+                # Workflows only run once the transaction commits.
+                self.assertEqual(0, len(mail.outbox))
+
+        self.assertEqual(201, response.status_code)
+        self.assertListEqual(['Jane created'], [x.subject for x in mail.outbox])
+        self.assertEqual(1, storage.save.call_count)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            client.put(
+                f'/internal-api/application/data/author/{response.data["id"]}/',
+                {'name': 'Janet'},
+                format='json',
+            )
+
+        self.assertEqual(1, len(mail.outbox))
+
+    def test_batches(self):
+        records = [{'id': str(uuid.uuid4()), 'name': f'Author {i}'} for i in range(5)]
+
+        with mock.patch('workflows.tasks.run_step.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                trigger_workflows(self.release, self.model_schema.id, Event.CREATE, records)
+
+        self.assertListEqual([2, 2, 1], [len(x.args[4]) for x in delay.call_args_list])
+        self.assertSetEqual({'welcome'}, {x.args[2] for x in delay.call_args_list})
+
+    def test_batches_per_transaction(self):
+        with mock.patch('workflows.tasks.run_step.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                # The records of a rolled back transaction are not queued.
+                with self.assertRaises(ValueError), transaction.atomic():
+                    trigger_workflows(self.release, self.model_schema.id, Event.CREATE, [{}])
+                    raise ValueError()
+
+                for i in range(3):
+                    trigger_workflows(
+                        self.release, self.model_schema.id, Event.CREATE, [{'name': str(i)}]
+                    )
+
+        self.assertListEqual(
+            [['0', '1'], ['2']], [[y['name'] for y in x.args[4]] for x in delay.call_args_list]
+        )
+
+    def test_retry_unsent_emails(self):
+        workflow = self.release.get_syntax_definitions('workflow')[0]
+        args = (
+            self.release.id,
+            workflow['id'],
+            'welcome',
+            Event.CREATE,
+            [{'name': 'Jane'}, {'name': 'John'}],
+        )
+        send_messages = mock.Mock(side_effect=[1, SMTPException()])
+
+        with mock.patch.object(run_step, 'retry', side_effect=Retry()) as retry:
+            with mock.patch(
+                'django.core.mail.backends.locmem.EmailBackend.send_messages', send_messages
+            ):
+                run_step.apply(args)
+
+        self.assertDictEqual({'done': [0]}, retry.call_args.kwargs['kwargs'])
+
+        # The retry only sends the emails not sent, and the next step gets the whole batch.
+        with mock.patch('workflows.functions.default_storage') as storage:
+            run_step.apply(args, {'done': [0]})
+
+        self.assertListEqual(['John created'], [x.subject for x in mail.outbox])
+        self.assertEqual(
+            'name\r\nJane\r\nJohn\r\n', storage.save.call_args.args[1].read().decode()
+        )
+
+    def test_retry(self):
+        workflow = self.release.get_syntax_definitions('workflow')[0]
+        args = (self.release.id, workflow['id'], 'welcome', Event.CREATE, [{'name': 'Jane'}])
+
+        with mock.patch.object(run_step, 'retry', side_effect=Retry()) as retry:
+            with mock.patch('workflows.functions.get_connection', side_effect=ConnectionError):
+                run_step.apply(args)
+
+            self.assertEqual(1, retry.call_count)
+
+            # Unknown workflows and steps fail without retries.
+            for unknown_args in [
+                (self.release.id, str(uuid.uuid4()), *args[2:]),
+                (*args[:2], 'x', *args[3:]),
+            ]:
+                self.assertIsInstance(run_step.apply(unknown_args).result, KeyError)
+
+            self.assertEqual(1, retry.call_count)